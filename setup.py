@@ -21,7 +21,9 @@ def extras_require():
             'pytest-cov>=1.8.1',
             'pytest-pep8>=1.0.6',
             'click>=6.0',
+            'numpy>=1.9',
         ],
+        'numpy': ['numpy>=1.9'],
     }
 
 
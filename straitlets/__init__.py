@@ -1,10 +1,13 @@
 from .serializable import Serializable, StrictSerializable, MultipleTraitErrors
 from .traits import (
     Bool,
+    Bytes,
     Dict,
     Enum,
     Float,
+    FloatArray,
     Instance,
+    IntArray,
     Integer,
     LengthBoundedUnicode,
     List,
@@ -18,10 +21,13 @@ __version__ = '0.3.3'
 
 __all__ = (
     'Bool',
+    'Bytes',
     'Dict',
     'Enum',
     'Float',
+    'FloatArray',
     'Instance',
+    'IntArray',
     'Integer',
     'LengthBoundedUnicode',
     'List',
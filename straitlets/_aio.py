@@ -0,0 +1,103 @@
+"""
+Implementation of ``straitlets.aio``.
+
+This module uses Python 3.5+ syntax, so it must only be imported through
+``straitlets.aio``, which checks the Python version first.
+"""
+import asyncio
+from functools import partial
+
+_default_executor = None
+
+
+def set_default_executor(executor):
+    """
+    Set the executor used by straitlets coroutines when no ``executor`` is
+    passed explicitly.
+
+    Parameters
+    ----------
+    executor : concurrent.futures.Executor or None
+        The executor to use.  ``None`` restores the event loop's default
+        executor.
+    """
+    global _default_executor
+    _default_executor = executor
+
+
+def get_default_executor():
+    """
+    Get the executor set by ``set_default_executor``.
+    """
+    return _default_executor
+
+
+def run_in_executor(func, *args, **kwargs):
+    """
+    Schedule ``func(*args, **kwargs)`` in an executor on the running event
+    loop.
+
+    This must be called from a coroutine or callback running in an event
+    loop.  The call is scheduled immediately, whether or not the result is
+    awaited.
+
+    Parameters
+    ----------
+    func : callable
+        The blocking function to run.
+    *args, **kwargs
+        Forwarded to ``func``.
+    executor : concurrent.futures.Executor, optional
+        Executor in which to run ``func``.  Defaults to the executor set by
+        ``set_default_executor``.
+
+    Returns
+    -------
+    future : asyncio.Future
+        An awaitable resolving to the return value of ``func``.
+    """
+    executor = kwargs.pop('executor', None)
+    if executor is None:
+        executor = _default_executor
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+
+async def load_many(loader, paths, limit=8, executor=None):
+    """
+    Load many files concurrently, with at most ``limit`` loads in flight.
+
+    Parameters
+    ----------
+    loader : callable
+        Blocking function taking a path, e.g. ``MyConfig.from_yaml_file``.
+    paths : iterable
+        Paths to load.
+    limit : int, optional
+        Maximum number of concurrent loads.  Default is 8.
+    executor : concurrent.futures.Executor, optional
+        Executor in which to run ``loader``.
+
+    Returns
+    -------
+    results : list
+        The loaded objects, in the same order as ``paths``.
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1, got %d." % limit)
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def load_one(path):
+        async with semaphore:
+            return await run_in_executor(loader, path, executor=executor)
+
+    return list(await asyncio.gather(*map(load_one, paths)))
+
+
+__all__ = [
+    'get_default_executor',
+    'load_many',
+    'run_in_executor',
+    'set_default_executor',
+]
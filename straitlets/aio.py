@@ -0,0 +1,32 @@
+"""
+asyncio helpers for loading and writing Serializables without blocking the
+event loop.
+
+File I/O, parsing, and validation are run in an executor.  By default this is
+the event loop's default executor; use ``set_default_executor`` to route all
+straitlets work to a dedicated pool, or pass ``executor=`` per call.
+
+Requires Python 3.7.
+"""
+import sys
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # raise a more explicit error message if this is imported on an older
+    # Python, which couldn't compile the implementation module.
+    raise ImportError('%s requires Python 3.7' % __name__)
+
+# noqa on the import because it is not at the top of the module. We cannot
+# import the implementation until we know that it will compile.
+from ._aio import (  # noqa
+    get_default_executor,
+    load_many,
+    run_in_executor,
+    set_default_executor,
+)
+
+__all__ = [
+    'get_default_executor',
+    'load_many',
+    'run_in_executor',
+    'set_default_executor',
+]
@@ -0,0 +1,111 @@
+"""
+Benchmarks for construction, validation, and serialization of Serializables.
+
+Run with ``python -m straitlets.bench``.  Results are written as JSON so that
+runs against different releases can be compared mechanically.
+"""
+from fnmatch import fnmatch
+import platform
+import timeit
+
+from .schemas import default_schemas
+
+
+def _operations(cls, kwargs):
+    """
+    Build a dict from operation name to a zero-argument callable exercising
+    that operation on ``cls``.
+    """
+    from ..to_primitive import to_primitive
+
+    instance = cls(**kwargs)
+    as_dict = instance.to_dict()
+    as_json = instance.to_json()
+    as_yaml = instance.to_yaml()
+    as_base64 = instance.to_base64()
+
+    return {
+        'construct': lambda: cls(**kwargs),
+        'validate_all_attributes': lambda: cls(
+            **kwargs
+        ).validate_all_attributes(),
+        'to_dict': instance.to_dict,
+        'from_dict': lambda: cls.from_dict(as_dict),
+        'to_json': instance.to_json,
+        'from_json': lambda: cls.from_json(as_json),
+        'to_yaml': instance.to_yaml,
+        'from_yaml': lambda: cls.from_yaml(as_yaml),
+        'to_base64': instance.to_base64,
+        'from_base64': lambda: cls.from_base64(as_base64),
+        'to_primitive': lambda: to_primitive(instance),
+    }
+
+
+def environment():
+    """
+    Describe the environment in which benchmarks were run.
+    """
+    import traitlets
+    import yaml
+    from .. import __version__
+
+    return {
+        'straitlets': __version__,
+        'traitlets': traitlets.__version__,
+        'pyyaml': yaml.__version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+    }
+
+
+def run_benchmarks(schemas=None, select='*', number=100, repeat=5):
+    """
+    Run benchmarks.
+
+    Parameters
+    ----------
+    schemas : dict, optional
+        Dict from case name to ``(cls, kwargs)``.  Defaults to
+        ``straitlets.bench.schemas.default_schemas()``.
+    select : str, optional
+        Glob matched against ``'<case>.<operation>'``.  Only matching
+        benchmarks are run.
+    number : int, optional
+        Number of calls per timing sample.
+    repeat : int, optional
+        Number of timing samples per benchmark.
+
+    Returns
+    -------
+    results : list[dict]
+        One entry per benchmark, with per-call timings in seconds.
+    """
+    if schemas is None:
+        schemas = default_schemas()
+
+    results = []
+    for case in sorted(schemas):
+        cls, kwargs = schemas[case]
+        operations = _operations(cls, kwargs)
+        for operation in sorted(operations):
+            if not fnmatch('%s.%s' % (case, operation), select):
+                continue
+            samples = timeit.Timer(operations[operation]).repeat(
+                repeat=repeat,
+                number=number,
+            )
+            per_call = sorted(sample / number for sample in samples)
+            results.append({
+                'case': case,
+                'operation': operation,
+                'number': number,
+                'repeat': repeat,
+                'best': per_call[0],
+                'median': per_call[len(per_call) // 2],
+                'mean': sum(per_call) / len(per_call),
+            })
+    return results
+
+
+__all__ = ['environment', 'run_benchmarks']
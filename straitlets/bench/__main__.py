@@ -0,0 +1,58 @@
+"""
+Command line entry point for ``python -m straitlets.bench``.
+"""
+import argparse
+import json
+import sys
+
+from . import environment, run_benchmarks
+
+
+def main(argv=None, stdout=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m straitlets.bench',
+        description='Benchmark straitlets serialization paths.',
+    )
+    parser.add_argument(
+        '-k', '--select',
+        default='*',
+        help="Glob matched against '<case>.<operation>'.",
+    )
+    parser.add_argument(
+        '-n', '--number',
+        type=int,
+        default=100,
+        help='Calls per timing sample.',
+    )
+    parser.add_argument(
+        '-r', '--repeat',
+        type=int,
+        default=5,
+        help='Timing samples per benchmark.',
+    )
+    parser.add_argument(
+        '-o', '--output',
+        type=argparse.FileType('w'),
+        default=None,
+        help='File to write JSON results to.  Defaults to stdout.',
+    )
+    args = parser.parse_args(argv)
+
+    report = {
+        'environment': environment(),
+        'results': run_benchmarks(
+            select=args.select,
+            number=args.number,
+            repeat=args.repeat,
+        ),
+    }
+
+    out = args.output or stdout or sys.stdout
+    json.dump(report, out, indent=2, sort_keys=True)
+    out.write('\n')
+    if args.output is not None:
+        args.output.close()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
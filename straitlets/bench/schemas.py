@@ -0,0 +1,124 @@
+"""
+Synthetic Serializable schemas used by the benchmarks.
+"""
+from ..builtin_models import MongoConfig, PostgresConfig
+from ..serializable import Serializable
+from ..traits import Bool, Dict, Float, Instance, Integer, List, Unicode
+
+
+def _field_traits(width):
+    """
+    Build ``width`` scalar traits, cycling through the primitive trait types.
+    """
+    kinds = (
+        (Integer, lambda i: i),
+        (Float, lambda i: i + 0.5),
+        (Unicode, lambda i: u'value-%d' % i),
+        (Bool, lambda i: bool(i % 2)),
+    )
+    traits = {}
+    values = {}
+    for i in range(width):
+        trait_type, make_value = kinds[i % len(kinds)]
+        name = 'field_%03d' % i
+        traits[name] = trait_type()
+        values[name] = make_value(i)
+    return traits, values
+
+
+def flat_schema(width):
+    """
+    A Serializable with ``width`` scalar traits.
+
+    Returns
+    -------
+    cls : type
+        The generated Serializable subclass.
+    kwargs : dict
+        Keyword arguments that construct a valid instance of ``cls``.
+    """
+    traits, values = _field_traits(width)
+    cls = type('Flat%d' % width, (Serializable,), traits)
+    return cls, values
+
+
+def nested_schema(depth, width):
+    """
+    A chain of ``depth`` Serializables, each with ``width`` scalar traits and
+    an ``Instance`` trait holding the next link.
+    """
+    traits, values = _field_traits(width)
+    cls = type('Nested%dx%d_0' % (depth, width), (Serializable,), traits)
+    kwargs = dict(values)
+    for level in range(1, depth):
+        traits, values = _field_traits(width)
+        traits['child'] = Instance(cls)
+        values['child'] = cls(**kwargs)
+        cls = type(
+            'Nested%dx%d_%d' % (depth, width, level),
+            (Serializable,),
+            traits,
+        )
+        kwargs = values
+    return cls, kwargs
+
+
+def container_schema(size):
+    """
+    A Serializable with large ``List`` and ``Dict`` traits.
+    """
+    cls = type(
+        'Containers%d' % size,
+        (Serializable,),
+        {
+            'ints': List(trait=Integer()),
+            'floats': List(trait=Float()),
+            'mapping': Dict(),
+        },
+    )
+    kwargs = {
+        'ints': list(range(size)),
+        'floats': [i * 0.25 for i in range(size)],
+        'mapping': {u'key-%d' % i: [i, u'%d' % i] for i in range(size)},
+    }
+    return cls, kwargs
+
+
+def postgres_schema():
+    return PostgresConfig, {
+        'username': u'user',
+        'password': u'password',
+        'hostname': u'localhost',
+        'port': 5432,
+        'database': u'db',
+        'query_params': {u'sslmode': u'require'},
+    }
+
+
+def mongo_schema():
+    return MongoConfig, {
+        'username': u'user',
+        'password': u'password',
+        'hosts': [u'web:27017', u'scale:27018'],
+        'database': u'webscale',
+        'replicaset': u'rs0',
+        'ssl': True,
+        'ssl_ca_certs': u'/path/to/ca.pem',
+    }
+
+
+def default_schemas():
+    """
+    The schemas benchmarked by default, as a dict from case name to
+    ``(cls, kwargs)``.
+    """
+    schemas = {
+        'postgres': postgres_schema(),
+        'mongo': mongo_schema(),
+        'container_1000': container_schema(1000),
+    }
+    for width in (4, 32, 128):
+        schemas['flat_%d' % width] = flat_schema(width)
+    for depth in (2, 8):
+        schemas['nested_%dx8' % depth] = nested_schema(depth, 8)
+    return schemas
@@ -0,0 +1,74 @@
+import json
+
+from six import StringIO
+
+from straitlets.bench import run_benchmarks
+from straitlets.bench.__main__ import main
+from straitlets.bench.schemas import (
+    container_schema,
+    default_schemas,
+    flat_schema,
+    nested_schema,
+)
+from straitlets.test_utils import assert_serializables_equal
+
+
+def test_schemas_roundtrip():
+    for cls, kwargs in default_schemas().values():
+        instance = cls(**kwargs)
+        instance.validate_all_attributes()
+        assert_serializables_equal(
+            instance,
+            cls.from_json(instance.to_json()),
+        )
+
+
+def test_nested_schema_depth():
+    cls, kwargs = nested_schema(depth=3, width=2)
+    instance = cls(**kwargs)
+    assert instance.child.child.field_000 == 0
+    assert not hasattr(instance.child.child, 'child')
+
+
+def test_run_benchmarks():
+    schemas = {
+        'flat': flat_schema(3),
+        'containers': container_schema(5),
+    }
+    results = run_benchmarks(schemas, select='flat.*', number=1, repeat=2)
+    assert {r['case'] for r in results} == {'flat'}
+    assert {r['operation'] for r in results} == {
+        'construct',
+        'validate_all_attributes',
+        'to_dict',
+        'from_dict',
+        'to_json',
+        'from_json',
+        'to_yaml',
+        'from_yaml',
+        'to_base64',
+        'from_base64',
+        'to_primitive',
+    }
+    for result in results:
+        assert result['repeat'] == 2
+        assert 0 <= result['best'] <= result['median']
+
+
+def test_main(tmpdir):
+    out = StringIO()
+    main(['-k', 'postgres.to_*', '-n', '1', '-r', '1'], stdout=out)
+    report = json.loads(out.getvalue())
+    assert set(report['environment']) >= {'straitlets', 'python'}
+    assert {r['operation'] for r in report['results']} == {
+        'to_dict',
+        'to_json',
+        'to_yaml',
+        'to_base64',
+        'to_primitive',
+    }
+
+    path = tmpdir.join('results.json')
+    main(['-k', 'mongo.from_json', '-n', '1', '-r', '1', '-o', path.strpath])
+    report = json.loads(path.read())
+    assert [r['case'] for r in report['results']] == ['mongo']
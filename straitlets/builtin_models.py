@@ -1,12 +1,23 @@
 """
 Built-In Serializables
 """
-from six.moves.urllib.parse import urlencode, urlparse
+from six.moves.urllib.parse import (
+    parse_qsl,
+    quote,
+    unquote,
+    urlencode,
+    urlparse,
+)
 from traitlets import TraitError, validate
 
-from .serializable import StrictSerializable
+from .compat import lru_cache
+from .serializable import StrictSerializable, _cached_property
 from .traits import Bool, Integer, List, Unicode, Dict
 
+#: Number of distinct URLs for which parsed configs are cached by
+#: ``from_url``.
+URL_CACHE_SIZE = 256
+
 
 def join_filter_empty(sep, *elems):
     """
@@ -22,6 +33,11 @@ def join_filter_empty(sep, *elems):
     return sep.join(map(str, filter(None, elems)))
 
 
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def _cached_from_url(cls, url):
+    return cls._from_url(url)
+
+
 class PostgresConfig(StrictSerializable):
     """
     Configuration for a PostgreSQL connection.
@@ -52,7 +68,7 @@ class PostgresConfig(StrictSerializable):
 
     database = Unicode(help="Database name")
 
-    @property
+    @_cached_property('username', 'password', 'hostname', 'port')
     def netloc(self):
         user_pass = join_filter_empty(':', self.username, self.password)
         host_port = join_filter_empty(':', self.hostname, self.port)
@@ -63,7 +79,9 @@ class PostgresConfig(StrictSerializable):
         help="Connection parameters",
     )
 
-    @property
+    @_cached_property(
+        'username', 'password', 'hostname', 'port', 'database', 'query_params',
+    )
     def url(self):
         return join_filter_empty(
             '?',
@@ -78,7 +96,14 @@ class PostgresConfig(StrictSerializable):
     def from_url(cls, url):
         """
         Construct a PostgresConfig from a URL.
+
+        Parsed configs are cached by URL, and a copy of the cached config is
+        returned.
         """
+        return _cached_from_url(cls, url).clone()
+
+    @classmethod
+    def _from_url(cls, url):
         parsed = urlparse(url)
         return cls(
             username=parsed.username,
@@ -93,6 +118,22 @@ class PostgresConfig(StrictSerializable):
         )
 
 
+# (slave_ok, prefer_secondary) <-> MongoDB readPreference.
+_READ_PREFERENCES = {
+    (True, True): 'secondaryPreferred',
+    (True, False): 'primaryPreferred',
+    (False, True): 'primary',
+    (False, False): 'primary',
+}
+_READ_PREFERENCE_FLAGS = {
+    'secondaryPreferred': (True, True),
+    'secondary': (True, True),
+    'primaryPreferred': (True, False),
+    'nearest': (True, False),
+    'primary': (False, False),
+}
+
+
 class MongoConfig(StrictSerializable):
     """
     Configuration for a MongoDB connection.
@@ -154,3 +195,84 @@ class MongoConfig(StrictSerializable):
         default_value=None,
         help="Path to concatenated CA certificates.",
     )
+
+    @_cached_property(
+        'username', 'password', 'hosts', 'database', 'replicaset', 'slave_ok',
+        'prefer_secondary', 'ssl', 'ssl_ca_certs',
+    )
+    def url(self):
+        """
+        A ``mongodb://`` connection string for this config.
+
+        ``slave_ok`` and ``prefer_secondary`` are expressed as a
+        ``readPreference``.  A config with ``slave_ok=False`` always reads
+        from the primary, so ``prefer_secondary`` is not preserved by
+        ``from_url`` in that case.
+        """
+        userinfo = ''
+        if self.username:
+            userinfo = '%s:%s@' % (
+                quote(self.username, safe=''),
+                quote(self.password, safe=''),
+            )
+        params = []
+        if self.replicaset is not None:
+            params.append(('replicaSet', self.replicaset))
+        params.append((
+            'readPreference',
+            _READ_PREFERENCES[self.slave_ok, self.prefer_secondary],
+        ))
+        if self.ssl:
+            params.append(('ssl', 'true'))
+        if self.ssl_ca_certs is not None:
+            params.append(('ssl_ca_certs', self.ssl_ca_certs))
+        return 'mongodb://{userinfo}{hosts}/{db}?{params}'.format(
+            userinfo=userinfo,
+            hosts=','.join(self.hosts),
+            db=quote(self.database, safe=''),
+            params=urlencode(params),
+        )
+
+    @classmethod
+    def from_url(cls, url):
+        """
+        Construct a MongoConfig from a ``mongodb://`` connection string.
+
+        Parsed configs are cached by URL, and a copy of the cached config is
+        returned.
+        """
+        return _cached_from_url(cls, url).clone()
+
+    @classmethod
+    def _from_url(cls, url):
+        parsed = urlparse(url)
+        if parsed.scheme != 'mongodb':
+            raise ValueError("Expected a mongodb:// URL, got %r." % url)
+
+        userinfo, _, hosts = parsed.netloc.rpartition('@')
+        username = password = None
+        if userinfo:
+            username, _, password = userinfo.partition(':')
+            username, password = unquote(username), unquote(password)
+
+        params = dict(parse_qsl(parsed.query))
+        read_preference = params.get('readPreference', 'primary')
+        try:
+            slave_ok, prefer_secondary = _READ_PREFERENCE_FLAGS[
+                read_preference
+            ]
+        except KeyError:
+            raise ValueError(
+                "Unknown readPreference %r in %r." % (read_preference, url)
+            )
+        return cls(
+            username=username,
+            password=password,
+            hosts=hosts.split(','),
+            database=unquote(parsed.path.lstrip('/')),
+            replicaset=params.get('replicaSet'),
+            slave_ok=slave_ok,
+            prefer_secondary=prefer_secondary,
+            ssl=params.get('ssl', 'false').lower() == 'true',
+            ssl_ca_certs=params.get('ssl_ca_certs'),
+        )
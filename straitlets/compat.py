@@ -1,6 +1,9 @@
+from functools import wraps
+
 from six import PY3
 
 if PY3:  # pragma: no cover
+    from functools import lru_cache  # noqa
     from inspect import getfullargspec as argspec  # noqa
     long = int
     unicode = str
@@ -9,6 +12,32 @@ else:    # pragma: no cover
     long = long
     unicode = unicode
 
+    def lru_cache(maxsize=128):
+        """
+        Minimal stand-in for functools.lru_cache on Python 2.
+
+        Only positional arguments are supported, and the whole cache is
+        discarded when it fills up rather than evicting the least recently
+        used entry.
+        """
+        def decorator(f):
+            cache = {}
+
+            @wraps(f)
+            def wrapper(*args):
+                try:
+                    return cache[args]
+                except KeyError:
+                    pass
+                if len(cache) >= maxsize:
+                    cache.clear()
+                result = cache[args] = f(*args)
+                return result
+
+            wrapper.cache_clear = cache.clear
+            return wrapper
+        return decorator
+
 
 def ensure_bytes(s, encoding='utf-8'):
     if isinstance(s, bytes):
@@ -26,9 +55,28 @@ def ensure_unicode(s, encoding='utf-8'):
     raise TypeError("Expected bytes or unicode, got %s." % type(s))
 
 
+def b64decode_strict(s):
+    """
+    Decode base64, raising ``binascii.Error`` on characters outside the
+    base64 alphabet or incorrect padding instead of discarding them.
+    """
+    import base64
+    s = ensure_bytes(s)
+    if PY3:  # pragma: no cover
+        return base64.b64decode(s, validate=True)
+    else:  # pragma: no cover
+        import binascii
+        import re
+        if len(s) % 4 or not re.match(b'^[A-Za-z0-9+/]*={0,2}$', s):
+            raise binascii.Error('Non-base64 digit found')
+        return base64.b64decode(s)
+
+
 __all__ = [
     'argspec',
+    'b64decode_strict',
     'ensure_bytes',
     'ensure_unicode',
     'long',
+    'lru_cache',
 ]
@@ -1,19 +1,83 @@
 from __future__ import absolute_import
 
+from functools import wraps
 from operator import itemgetter
+import os
 
 import click
+from six import string_types
 
-from straitlets import MultipleTraitErrors
-from traitlets import TraitError
+from straitlets import Bool, Enum, Instance, MultipleTraitErrors, Serializable
+from straitlets.compat import unicode
+from traitlets import TraitError, Undefined
 
 
 def _indent(msg):
     return '\n'.join('  ' + line for line in msg.splitlines())
 
 
+def _schema_error_message(e):
+    if isinstance(e, MultipleTraitErrors):
+        return 'Failed to validate the schema:\n\n' + '\n'.join(
+            '%s:\n%s' % (key, _indent(str(err)))
+            for key, err in sorted(e.errors.items(), key=itemgetter(0))
+        )
+    return 'Failed to validate the schema:\n%s' % _indent(str(e))
+
+
+class LazyConfig(object):
+    """A proxy for a config file that is read and validated on first
+    attribute access.
+
+    Returned by :class:`JsonConfigFile` and :class:`YamlConfigFile` when
+    constructed with ``lazy=True``.  Use :func:`unwrap` to get the underlying
+    :class:`~straitlets.Serializable`.
+    """
+    __slots__ = ('_param_type', '_path', '_param', '_ctx', '_value')
+
+    def __init__(self, param_type, path, param, ctx):
+        object.__setattr__(self, '_param_type', param_type)
+        object.__setattr__(self, '_path', path)
+        object.__setattr__(self, '_param', param)
+        object.__setattr__(self, '_ctx', ctx)
+        object.__setattr__(self, '_value', None)
+
+    def _load(self):
+        value = self._value
+        if value is None:
+            value = self._param_type.load(self._path, self._param, self._ctx)
+            object.__setattr__(self, '_value', value)
+        return value
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._load(), name, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        return '<lazy %s from %r>' % (
+            self._param_type.config.__name__,
+            self._path,
+        )
+
+
+def unwrap(config):
+    """Get the :class:`~straitlets.Serializable` behind a
+    :class:`LazyConfig`, reading the file if it hasn't been read yet.
+
+    Values that aren't lazy are returned unchanged.
+    """
+    if isinstance(config, LazyConfig):
+        return config._load()
+    return config
+
+
 class _ConfigFile(click.File):
-    def __init__(self, config_type, encoding=None):
+    def __init__(self, config_type, encoding=None, lazy=False):
         super(_ConfigFile, self).__init__(
             mode='r',
             encoding=None,
@@ -22,6 +86,9 @@ class _ConfigFile(click.File):
             atomic=False,
         )
         self.config = config_type
+        self.lazy = lazy
+        # Map from absolute path to ((mtime, size), config).
+        self._cache = {}
 
     def read(self, f):  # pragma: no cover
         raise NotImplementedError('read')
@@ -31,25 +98,69 @@ class _ConfigFile(click.File):
         raise NotImplementedError('name')
 
     def convert(self, value, param, ctx):
+        if isinstance(value, (self.config, LazyConfig)):
+            return value
+        if self.lazy and value != '-':
+            # Only check that the file exists; it's read on first use.
+            path = os.path.abspath(value)
+            self._stat(path, param, ctx)
+            return LazyConfig(self, path, param, ctx)
+
         f = super(_ConfigFile, self).convert(value, param, ctx)
+        return self._read_or_fail(f, param, ctx)
+
+    def _stat(self, path, param, ctx):
         try:
-            return self.read(f)
-        except MultipleTraitErrors as e:
+            st = os.stat(path)
+        except OSError as e:
             self.fail(
-                'Failed to validate the schema:\n\n' + '\n'.join(
-                    '%s:\n%s' % (key, _indent(str(err)))
-                    for key, err in sorted(e.errors.items(), key=itemgetter(0))
+                'Could not open file: %s: %s' % (
+                    click.format_filename(path),
+                    e.strerror,
                 ),
                 param,
                 ctx,
             )
+        return getattr(st, 'st_mtime_ns', st.st_mtime), st.st_size
+
+    def load(self, path, param=None, ctx=None):
+        """Read and validate the config at ``path``.
+
+        Results are cached by path, and reused until the file's modification
+        time or size changes.  Cached configs are shared between callers, so
+        they should not be mutated.
+        """
+        path = os.path.abspath(path)
+        key = self._stat(path, param, ctx)
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        with open(path, 'r') as f:
+            value = self._read_or_fail(f, param, ctx)
+        self._cache[path] = (key, value)
+        return value
+
+    def _read_or_fail(self, f, param, ctx):
+        try:
+            return self.read(f)
         except TraitError as e:
+            self.fail(_schema_error_message(e), param, ctx)
+        except (ValueError, TypeError) as e:
+            # Unparseable files, and documents that aren't mappings.
             self.fail(
-                'Failed to validate the schema:\n%s' % _indent(str(e)),
+                'Could not read %s: %s' % (click.format_filename(f.name), e),
                 param,
                 ctx,
             )
 
+    def read_dict(self, f):  # pragma: no cover
+        """Read the file's contents as a dict without validating them.
+
+        Raises ValueError if the file can't be parsed.
+        """
+        raise NotImplementedError('read_dict')
+
 
 class JsonConfigFile(_ConfigFile):
     """A click parameter type for reading a :class:`~straitlets.Serializable`
@@ -59,6 +170,11 @@ class JsonConfigFile(_ConfigFile):
     ----------
     config_type : type[Serializable]
         A subclass of :class:`~straitlets.Serializable`.
+    lazy : bool, optional
+        If True, only check that the file exists during argument processing,
+        and return a :class:`LazyConfig` that reads the file on first
+        attribute access.  Schema errors are reported as usage errors when
+        the file is read.  Reads are cached by path and modification time.
 
     Notes
     -----
@@ -71,6 +187,10 @@ class JsonConfigFile(_ConfigFile):
     def read(self, f):
         return self.config.from_json(f.read())
 
+    def read_dict(self, f):
+        import json
+        return json.load(f)
+
 
 class YamlConfigFile(_ConfigFile):
     """A click parameter type for reading a :class:`~straitlets.Serializable`
@@ -80,6 +200,11 @@ class YamlConfigFile(_ConfigFile):
     ----------
     config_type : type[Serializable]
         A subclass of :class:`~straitlets.Serializable`.
+    lazy : bool, optional
+        If True, only check that the file exists during argument processing,
+        and return a :class:`LazyConfig` that reads the file on first
+        attribute access.  Schema errors are reported as usage errors when
+        the file is read.  Reads are cached by path and modification time.
 
     Notes
     -----
@@ -90,4 +215,248 @@ class YamlConfigFile(_ConfigFile):
     name = 'YAML-FILE'
 
     def read(self, f):
-        return self.config.from_yaml(f)
+        import yaml
+        try:
+            return self.config.from_yaml(f)
+        except yaml.YAMLError as e:
+            raise ValueError(str(e))
+
+    def read_dict(self, f):
+        import yaml
+        try:
+            return yaml.safe_load(f)
+        except yaml.YAMLError as e:
+            raise ValueError(str(e))
+
+
+class _TraitParamType(click.ParamType):
+    """A click parameter type that converts strings with a trait's
+    ``from_string``.
+    """
+    def __init__(self, trait):
+        self.trait = trait
+        self.name = type(trait).__name__.lower()
+
+    def convert(self, value, param, ctx):
+        if not isinstance(value, string_types):
+            return value
+        try:
+            return self.trait.from_string(value)
+        except ValueError as e:
+            self.fail(str(e), param, ctx)
+
+
+class _EnumChoice(click.Choice):
+    def __init__(self, trait):
+        super(_EnumChoice, self).__init__([unicode(v) for v in trait.values])
+        self.trait = trait
+
+    def convert(self, value, param, ctx):
+        value = super(_EnumChoice, self).convert(value, param, ctx)
+        return self.trait.from_string(value)
+
+
+def _option_help(trait, default):
+    help_ = trait.help or ''
+    if default is not Undefined:
+        help_ = ('%s  [default: %s]' % (help_, default)).lstrip()
+    return help_
+
+
+def _local_option_specs(config_type):
+    """Get the option specs for the traits defined directly on
+    ``config_type``.
+
+    Returns a tuple of ``(name, nested, is_flag, attrs)``, where ``nested`` is
+    the Serializable class of an ``Instance`` trait whose fields get their own
+    options, or None.  The result is cached in the class's trait table.
+    Nested classes' specs are cached in their own tables, so changes to them
+    are picked up.
+    """
+    cache = config_type._trait_table.cache
+    try:
+        return cache['click_options']
+    except KeyError:
+        pass
+
+    table = config_type._trait_table
+    specs = []
+    for name, trait in table.items:
+        nested = None
+        if (isinstance(trait, Instance) and
+                issubclass(trait.klass, Serializable)):
+            nested = trait.klass
+
+        attrs = {
+            'default': None,
+            'help': _option_help(trait, table.defaults[name]),
+        }
+        is_flag = isinstance(trait, Bool)
+        if not is_flag:
+            if isinstance(trait, Enum):
+                attrs['type'] = _EnumChoice(trait)
+            else:
+                attrs['type'] = _TraitParamType(trait)
+        specs.append((name, nested, is_flag, attrs))
+
+    specs = cache['click_options'] = tuple(specs)
+    return specs
+
+
+def _iter_option_specs(config_type, path, seen):
+    for name, nested, is_flag, attrs in _local_option_specs(config_type):
+        subpath = path + (name,)
+        # Nested configs get an option per field, e.g. --db-port.  Recursive
+        # configs get a single option, read as JSON.
+        if nested is not None and nested not in seen:
+            for spec in _iter_option_specs(nested, subpath, seen | {nested}):
+                yield spec
+            continue
+
+        flag = '-'.join(subpath).replace('_', '-')
+        if is_flag:
+            decl = '--%s/--no-%s' % (flag, flag)
+        else:
+            decl = '--' + flag
+        yield subpath, decl, attrs
+
+
+def _option_specs(config_type, reserved=()):
+    """Get the ``(path, decl, attrs)`` option specs for ``config_type``.
+
+    Raises ValueError if two fields, or a field and one of the option names
+    in ``reserved``, would get the same option name.
+    """
+    specs = tuple(
+        _iter_option_specs(config_type, (), frozenset([config_type]))
+    )
+    owners = {opt: None for opt in reserved}
+    for path, decl, _ in specs:
+        for opt in decl.split('/'):
+            if opt in owners:
+                other = owners[opt]
+                raise ValueError(
+                    "Option %s for %s.%s conflicts with %s." % (
+                        opt,
+                        config_type.__name__,
+                        '.'.join(path),
+                        'the file option' if other is None else
+                        '%s.%s' % (config_type.__name__, '.'.join(other)),
+                    )
+                )
+            owners[opt] = path
+    return specs
+
+
+def _read_base(reader, path, file_option):
+    try:
+        with open(path, 'r') as fp:
+            base = reader.read_dict(fp)
+    except (IOError, OSError, ValueError) as e:
+        raise click.BadParameter(
+            'Could not read %s: %s' % (click.format_filename(path), e),
+            param_hint=file_option,
+        )
+    if base is not None and not isinstance(base, dict):
+        raise click.BadParameter(
+            'Expected a mapping in %s, got %s.' % (
+                click.format_filename(path),
+                type(base).__name__,
+            ),
+            param_hint=file_option,
+        )
+    return base
+
+
+def config_options(config_type,
+                   name='config',
+                   file_option=None,
+                   file_type=None):
+    """A decorator that adds a click option for each field of a
+    :class:`~straitlets.Serializable` and passes the constructed instance to
+    the command.
+
+    Options are named after the traits, with underscores replaced by dashes.
+    Fields of nested :class:`~straitlets.Serializable` instances get their
+    own options, e.g. ``--db-port`` for ``db.port``.  ``Bool`` traits become
+    ``--flag/--no-flag`` switches, ``Enum`` traits become choices, and other
+    values are converted with each trait's ``from_string``.  Option help is
+    taken from the trait's ``help``.
+
+    Parameters
+    ----------
+    config_type : type[Serializable]
+        A subclass of :class:`~straitlets.Serializable`.
+    name : str, optional
+        The name of the argument through which the instance is passed to the
+        command.  Default is ``'config'``.
+    file_option : str, optional
+        If passed, the name of an additional option (e.g. ``'--config'``)
+        that reads a config file.  Fields passed on the command line are
+        merged into the file's values with
+        :meth:`~straitlets.Serializable.from_layers`.
+    file_type : type, optional
+        The parameter type used to read ``file_option``.  Default is
+        :class:`YamlConfigFile`.
+
+    Raises
+    ------
+    ValueError
+        If two fields map to the same option name, e.g. a ``db_port`` field
+        and a ``port`` field of a nested ``db``.
+    """
+    specs = _option_specs(
+        config_type,
+        reserved=() if file_option is None else (file_option,),
+    )
+    prefix = name + '__'
+    file_dest = prefix + '_file'
+    if file_type is None:
+        file_type = YamlConfigFile
+    reader = file_type(config_type)
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            overrides = {}
+            for path, _, _ in specs:
+                value = kwargs.pop(prefix + '__'.join(path))
+                if value is None:
+                    continue
+                node = overrides
+                for part in path[:-1]:
+                    node = node.setdefault(part, {})
+                node[path[-1]] = value
+
+            base = None
+            if file_option is not None:
+                path = kwargs.pop(file_dest)
+                if path is not None:
+                    base = _read_base(reader, path, file_option)
+
+            try:
+                kwargs[name] = config_type.from_layers(base, overrides)
+            except TraitError as e:
+                raise click.UsageError(_schema_error_message(e))
+            except TypeError as e:
+                # Unexpected keys can only come from the file.
+                raise click.BadParameter(str(e), param_hint=file_option)
+            return f(*args, **kwargs)
+
+        for path, decl, attrs in reversed(specs):
+            wrapper = click.option(decl, prefix + '__'.join(path), **attrs)(
+                wrapper
+            )
+        if file_option is not None:
+            wrapper = click.option(
+                file_option,
+                file_dest,
+                type=click.Path(exists=True, dir_okay=False),
+                default=None,
+                help='A %s with defaults for %s.' % (
+                    reader.name.lower(),
+                    config_type.__name__,
+                ),
+            )(wrapper)
+        return wrapper
+    return decorator
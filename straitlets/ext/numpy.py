@@ -0,0 +1,144 @@
+"""
+NumPy support for straitlets.
+
+Importing this module registers a ``to_primitive`` handler for
+``numpy.ndarray`` and provides the ``Array`` trait.
+"""
+from __future__ import absolute_import
+
+import base64
+import binascii
+
+import numpy as np
+from traitlets import TraitError
+
+from straitlets.compat import b64decode_strict, ensure_unicode
+from straitlets.to_primitive import to_primitive
+from straitlets.traits import SerializableTrait
+
+
+@to_primitive.register(np.ndarray)
+def _ndarray_to_primitive(a):
+    # ascontiguousarray is a no-op for arrays that are already C-contiguous,
+    # and b64encode reads directly from the array's buffer.
+    a = np.ascontiguousarray(a)
+    return {
+        'dtype': a.dtype.str,
+        'shape': list(a.shape),
+        'data': ensure_unicode(base64.b64encode(a)),
+    }
+
+
+def _ndarray_from_primitive(d):
+    """
+    Decode a dict produced by ``_ndarray_to_primitive``.
+
+    Raises TraitError if ``d`` isn't a valid encoding of an array.
+    """
+    try:
+        # frombuffer wraps the decoded bytes without copying, so the result
+        # is read-only.
+        return np.frombuffer(
+            b64decode_strict(d['data']),
+            dtype=np.dtype(d['dtype']),
+        ).reshape(d['shape'])
+    except (KeyError, ValueError, TypeError, binascii.Error) as e:
+        raise TraitError(
+            "Invalid serialized array %r: %s: %s" % (
+                d,
+                type(e).__name__,
+                e,
+            )
+        )
+
+
+class Array(SerializableTrait):
+    """
+    A trait holding a ``numpy.ndarray``.
+
+    Arrays are serialized as a dict containing the array's dtype, shape, and
+    base64-encoded buffer.
+
+    Parameters
+    ----------
+    dtype : numpy.dtype-like, optional
+        If passed, arrays must have exactly this dtype.  Arrays are never
+        implicitly cast.  Other sequences are converted to this dtype only
+        if no values are lost.
+    shape : tuple[int or None], optional
+        If passed, arrays must have this shape.  ``None`` entries match any
+        length along that axis.
+
+    Notes
+    -----
+    Arrays decoded from their serialized form are read-only views over the
+    decoded buffer.
+    """
+    info_text = 'a numpy array'
+
+    def __init__(self, dtype=None, shape=None, **kwargs):
+        self.dtype = None if dtype is None else np.dtype(dtype)
+        self.shape = None if shape is None else tuple(shape)
+        if self.dtype is not None and self.dtype.hasobject:
+            raise TypeError("Can't serialize arrays of dtype %s." % self.dtype)
+        super(Array, self).__init__(**kwargs)
+
+    def validate(self, obj, value):
+        if isinstance(value, dict):
+            value = _ndarray_from_primitive(value)
+        elif not isinstance(value, np.ndarray):
+            try:
+                array = np.asarray(value)
+            except (TypeError, ValueError) as e:
+                raise TraitError(
+                    "Can't convert %r to an array: %s" % (value, e)
+                )
+            if self.dtype is not None and array.dtype != self.dtype:
+                array = self._cast(obj, value, array)
+            value = array
+
+        if value.dtype.hasobject:
+            raise TraitError(
+                "Can't serialize arrays of dtype %s." % value.dtype
+            )
+        if self.dtype is not None and value.dtype != self.dtype:
+            raise TraitError(
+                "Expected an array of dtype %s, got %s." % (
+                    self.dtype,
+                    value.dtype,
+                )
+            )
+        if self.shape is not None and not self._shape_matches(value.shape):
+            raise TraitError(
+                "Expected an array of shape %s, got %s." % (
+                    self.shape,
+                    value.shape,
+                )
+            )
+        return value
+
+    def _cast(self, obj, value, array):
+        # Only cast sequences without losing values: [1, 2] can be stored as
+        # floats or int32s, but [1.5] can't be stored as ints.
+        try:
+            cast = array.astype(self.dtype)
+        except (TypeError, ValueError):
+            self.error(obj, value)
+        if not (np.can_cast(array.dtype, self.dtype, 'safe') or
+                np.array_equal(cast, array)):
+            self.error(obj, value)
+        return cast
+
+    def _shape_matches(self, shape):
+        if len(shape) != len(self.shape):
+            return False
+        for actual, expected in zip(shape, self.shape):
+            if expected is not None and actual != expected:
+                return False
+        return True
+
+    def from_trusted_primitive(self, value):
+        return _ndarray_from_primitive(value)
+
+
+__all__ = ['Array']
@@ -9,12 +9,18 @@ from straitlets import (
     Serializable,
     StrictSerializable,
     Bool,
+    Enum,
+    Instance,
+    List,
     Unicode,
     Integer,
 )
 from straitlets.ext.click import (
     JsonConfigFile,
+    LazyConfig,
     YamlConfigFile,
+    config_options,
+    unwrap,
 )
 from straitlets.test_utils import assert_serializables_equal
 
@@ -211,3 +217,355 @@ def test_yaml_single_error(runner, missing_attr_instance):
         )
         assert result.exit_code
         assert single_error_output.search(result.output)
+
+
+@pytest.mark.parametrize('type_,ext', [
+    (JsonConfigFile, 'json'),
+    (YamlConfigFile, 'yml'),
+])
+def test_lazy_config_file(runner, expected_instance, type_, ext):
+    reads = []
+    instances = []
+
+    class RecordingConfig(Config):
+        @classmethod
+        def from_dict(cls, dict_):
+            reads.append(dict_)
+            return super(RecordingConfig, cls).from_dict(dict_)
+
+    param_type = type_(RecordingConfig, lazy=True)
+
+    @click.group()
+    @click.option('--config', type=param_type)
+    @click.pass_context
+    def main(ctx, config):
+        ctx.obj = config
+
+    @main.command()
+    def noop():
+        pass
+
+    @main.command()
+    @click.pass_obj
+    def use(config):
+        assert isinstance(config, LazyConfig)
+        assert config.int == 1
+        instances.append(unwrap(config))
+
+    serialize = getattr(expected_instance, 'to_' + ext.replace('yml', 'yaml'))
+    with runner.isolated_filesystem():
+        path = 'f.' + ext
+        with open(path, 'w') as f:
+            f.write(serialize())
+
+        for args in (['--help'], ['noop'], ['noop', '--help']):
+            result = runner.invoke(
+                main,
+                ['--config', path] + args,
+                catch_exceptions=False,
+            )
+            assert result.exit_code == 0
+        assert reads == []
+
+        for _ in range(2):
+            result = runner.invoke(
+                main,
+                ['--config', path, 'use'],
+                catch_exceptions=False,
+            )
+            assert result.exit_code == 0
+        assert len(reads) == 1
+        assert instances[0] is instances[1]
+        assert instances[0].to_dict() == expected_instance.to_dict()
+
+        # Changing the file invalidates the cache.
+        expected_instance.int = 12345
+        with open(path, 'w') as f:
+            f.write(serialize())
+        assert param_type.load(path).int == 12345
+        assert len(reads) == 2
+
+        result = runner.invoke(main, ['--config', 'missing.' + ext, 'noop'])
+        assert result.exit_code
+        assert 'Could not open file' in result.output
+
+
+def test_lazy_config_file_errors(runner, missing_attr_instance):
+    @click.command()
+    @click.option('--config', type=YamlConfigFile(StrictConfig, lazy=True))
+    def main(config):
+        config.int
+
+    with runner.isolated_filesystem():
+        with open('f.yml', 'w') as f:
+            f.write(missing_attr_instance.to_yaml())
+
+        result = runner.invoke(main, ['--config', 'f.yml'])
+        assert result.exit_code
+        assert single_error_output.search(result.output)
+
+        with open('f.yml', 'w') as f:
+            f.write('{}')
+
+        result = runner.invoke(main, ['--config', 'f.yml'])
+        assert result.exit_code
+        assert multi_error_output.search(result.output)
+
+
+@pytest.mark.parametrize('type_,ext', [
+    (JsonConfigFile, 'json'),
+    (YamlConfigFile, 'yml'),
+])
+@pytest.mark.parametrize('contents', ['{bad', '[1, 2]'])
+@pytest.mark.parametrize('lazy', [True, False])
+def test_config_file_unreadable(runner, type_, ext, contents, lazy):
+    @click.command()
+    @click.option('--config', type=type_(Config, lazy=lazy))
+    def main(config):
+        config.int
+
+    with runner.isolated_filesystem():
+        path = 'f.' + ext
+        with open(path, 'w') as f:
+            f.write(contents)
+
+        result = runner.invoke(main, ['--config', path])
+        assert result.exit_code == 2
+        assert 'Invalid value for' in result.output
+        assert 'Could not read' in result.output
+        assert path in result.output
+
+
+def test_lazy_config_proxy(tmpdir, expected_instance):
+    path = tmpdir.join('f.yml')
+    path.write(expected_instance.to_yaml())
+
+    param_type = YamlConfigFile(Config, lazy=True)
+    config = param_type.convert(path.strpath, None, None)
+    assert isinstance(config, LazyConfig)
+    assert repr(config) == '<lazy Config from %r>' % path.strpath
+
+    # Converting an already converted value is a no-op.
+    assert param_type.convert(config, None, None) is config
+    assert param_type.convert(expected_instance, None, None) is (
+        expected_instance
+    )
+
+    assert 'int' in dir(config)
+    config.int = 5
+    assert config.int == 5
+    assert unwrap(config).int == 5
+
+
+def test_config_file_reloads_on_mtime_change(tmpdir, expected_instance):
+    import os
+
+    path = tmpdir.join('f.yml')
+    path.write(expected_instance.to_yaml())
+    param_type = YamlConfigFile(Config, lazy=True)
+
+    first = param_type.load(path.strpath)
+    assert param_type.load(path.strpath) is first
+
+    # Same size, different contents and modification time.
+    stat = os.stat(path.strpath)
+    expected_instance.int = 2
+    path.write(expected_instance.to_yaml())
+    assert os.stat(path.strpath).st_size == stat.st_size
+    os.utime(path.strpath, (stat.st_atime, stat.st_mtime + 10))
+
+    second = param_type.load(path.strpath)
+    assert second is not first
+    assert second.int == 2
+    assert param_type.load(path.strpath) is second
+
+
+def test_unwrap(expected_instance):
+    assert unwrap(expected_instance) is expected_instance
+
+
+class DB(Serializable):
+    host = Unicode(help='The database host.')
+    port = Integer(default_value=5432)
+
+
+class App(StrictSerializable):
+    name = Unicode()
+    debug = Bool(default_value=False)
+    level = Enum(values=(1, 2, 3), default_value=1)
+    tags = List()
+    db = Instance(DB)
+
+
+def test_config_options(runner):
+    instances = []
+
+    @click.command()
+    @config_options(App, name='app')
+    @click.option('--other', default='x')
+    def main(app, other):
+        assert other == 'x'
+        instances.append(app)
+
+    result = runner.invoke(main, ['--help'], catch_exceptions=False)
+    assert result.exit_code == 0
+    for flag in ('--name', '--debug / --no-debug', '--level', '--tags',
+                 '--db-host', '--db-port', '--other'):
+        assert flag in result.output
+    assert 'The database host.' in result.output
+    assert '[1|2|3]' in result.output
+
+    result = runner.invoke(
+        main,
+        [
+            '--name', 'n',
+            '--debug',
+            '--level', '2',
+            '--tags', 'a,b',
+            '--db-host', 'localhost',
+        ],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0, result.output
+    assert instances[-1].to_dict() == {
+        'name': 'n',
+        'debug': True,
+        'level': 2,
+        'tags': ['a', 'b'],
+        'db': {'host': 'localhost', 'port': 5432},
+    }
+
+    result = runner.invoke(main, ['--db-port', 'x'])
+    assert result.exit_code
+    assert 'db-port' in result.output
+
+    # StrictSerializable errors are reported like config file errors.
+    result = runner.invoke(main, ['--name', 'n'])
+    assert result.exit_code
+    assert 'Failed to validate the schema' in result.output
+
+    assert 'click_options' in App._trait_table.cache
+
+    # Values that are already converted, e.g. from a default_map, are kept.
+    result = runner.invoke(
+        main,
+        ['--name', 'n', '--tags', 'a', '--db-host', 'h'],
+        default_map={'app__db__port': 6543},
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0, result.output
+    assert instances[-1].db.port == 6543
+
+
+@pytest.mark.parametrize('type_,ext', [
+    (JsonConfigFile, 'json'),
+    (YamlConfigFile, 'yml'),
+])
+def test_config_options_with_file(runner, type_, ext):
+    instances = []
+
+    @click.command()
+    @config_options(App, file_option='--config', file_type=type_)
+    def main(config):
+        instances.append(config)
+
+    base = App(
+        name='base',
+        tags=['a'],
+        db=DB(host='localhost', port=1),
+    )
+    serialize = getattr(base, 'to_' + ext.replace('yml', 'yaml'))
+    with runner.isolated_filesystem():
+        with open('f.' + ext, 'w') as f:
+            f.write(serialize())
+
+        result = runner.invoke(
+            main,
+            ['--config', 'f.' + ext, '--db-port', '2', '--no-debug'],
+            catch_exceptions=False,
+        )
+    assert result.exit_code == 0, result.output
+    assert instances[-1].to_dict() == {
+        'name': 'base',
+        'debug': False,
+        'level': 1,
+        'tags': ['a'],
+        'db': {'host': 'localhost', 'port': 2},
+    }
+
+
+@pytest.mark.parametrize('type_,ext,contents', [
+    (JsonConfigFile, 'json', '{"name": '),
+    (YamlConfigFile, 'yml', 'name: [unclosed'),
+    (YamlConfigFile, 'yml', '- not a mapping'),
+    (YamlConfigFile, 'yml', 'bogus_field: 1'),
+])
+def test_config_options_bad_file(runner, type_, ext, contents):
+    @click.command()
+    @config_options(App, file_option='--config', file_type=type_)
+    def main(config):  # pragma: no cover
+        raise AssertionError('main should not be called')
+
+    with runner.isolated_filesystem():
+        with open('f.' + ext, 'w') as f:
+            f.write(contents)
+
+        result = runner.invoke(
+            main,
+            ['--config', 'f.' + ext],
+            catch_exceptions=False,
+        )
+    assert result.exit_code == 2, result.output
+    # The quoting of the option name depends on the click version.
+    assert re.search(r'Invalid value for .?--config', result.output)
+
+
+def test_config_options_collisions():
+    class Inner(Serializable):
+        port = Integer()
+
+    class Colliding(Serializable):
+        db_port = Integer()
+        db = Instance(Inner)
+
+    with pytest.raises(ValueError) as e:
+        config_options(Colliding)
+    assert str(e.value) == (
+        'Option --db-port for Colliding.db_port conflicts with '
+        'Colliding.db.port.'
+    )
+
+    class Negated(Serializable):
+        debug = Bool()
+        no_debug = Bool()
+
+    with pytest.raises(ValueError):
+        config_options(Negated)
+
+    class Config(Serializable):
+        config = Unicode()
+
+    with pytest.raises(ValueError) as e:
+        config_options(Config, file_option='--config')
+    assert 'conflicts with the file option' in str(e.value)
+
+
+def test_config_options_nested_changes(runner):
+    class Inner(Serializable):
+        port = Integer()
+
+    class Outer(Serializable):
+        inner = Instance(Inner)
+
+    config_options(Outer)
+
+    # Adding a trait to the nested class is picked up by later decorators.
+    Inner.host = Unicode()
+
+    @click.command()
+    @config_options(Outer)
+    def main(config):  # pragma: no cover
+        pass
+
+    result = runner.invoke(main, ['--help'], catch_exceptions=False)
+    assert '--inner-host' in result.output
@@ -0,0 +1,145 @@
+import pytest
+
+from straitlets import Serializable, Unicode
+from straitlets.test_utils import multifixture
+from traitlets import TraitError
+
+np = pytest.importorskip('numpy')
+
+from straitlets.ext.numpy import Array  # noqa
+
+
+class Weights(Serializable):
+    name = Unicode()
+    weights = Array(dtype='float64', shape=(None,))
+    matrix = Array(dtype='int32', shape=(2, None))
+    anything = Array()
+
+
+@pytest.fixture
+def weights():
+    return Weights(
+        name=u'w',
+        weights=np.linspace(0, 1, 11),
+        matrix=np.arange(6, dtype='int32').reshape(2, 3),
+        anything=np.array([[True, False]]),
+    )
+
+
+@multifixture
+def roundtrip():
+    yield lambda w: Weights.from_dict(w.to_dict())
+    yield lambda w: Weights.from_json(w.to_json())
+    yield lambda w: Weights.from_yaml(w.to_yaml())
+    yield lambda w: Weights.from_base64(w.to_base64())
+    yield lambda w: Weights.from_trusted_dict(
+        w.to_dict(),
+        token=w.trust_token(b'key'),
+        key=b'key',
+    )
+
+
+def _assert_weights_equal(left, right):
+    assert left.name == right.name
+    for name in ('weights', 'matrix', 'anything'):
+        left_array = getattr(left, name)
+        right_array = getattr(right, name)
+        assert left_array.dtype == right_array.dtype
+        np.testing.assert_array_equal(left_array, right_array)
+
+
+def test_roundtrip(weights, roundtrip):
+    _assert_weights_equal(roundtrip(weights), weights)
+
+
+def test_primitive_form(weights):
+    primitive = weights.to_dict()['matrix']
+    assert primitive['shape'] == [2, 3]
+    assert primitive['dtype'] == np.dtype('int32').str
+    assert isinstance(primitive['data'], type(u''))
+
+    # Non-contiguous arrays are serialized in C order.
+    transposed = Weights(
+        name=u't',
+        weights=np.zeros(0),
+        matrix=np.arange(6, dtype='int32').reshape(3, 2).T,
+        anything=np.zeros(0),
+    )
+    np.testing.assert_array_equal(
+        Weights.from_json(transposed.to_json()).matrix,
+        transposed.matrix,
+    )
+
+
+def test_no_copy():
+    array = np.arange(5.0)
+    assert Weights(weights=array).weights is array
+
+
+def test_lists_are_converted():
+    w = Weights(weights=[1.0, 2.0], anything=[1, 2])
+    assert w.weights.dtype == np.float64
+    np.testing.assert_array_equal(w.anything, [1, 2])
+
+
+def test_lossy_casts_are_rejected():
+    w = Weights(weights=[1, 2], matrix=[[1, 2, 3], [4, 5, 6]])
+    assert w.weights.dtype == np.float64
+    assert w.matrix.dtype == np.int32
+    np.testing.assert_array_equal(w.matrix, [[1, 2, 3], [4, 5, 6]])
+    assert Weights(matrix=[[1.0], [2.0]]).matrix.dtype == np.int32
+    assert Weights(weights=[]).weights.dtype == np.float64
+
+    for matrix in ([[1.5], [2.0]], [[2 ** 40], [1]], [[u'a'], [u'b']]):
+        with pytest.raises(TraitError):
+            Weights(matrix=matrix)
+
+    # Ragged sequences can't be converted at all.
+    with pytest.raises(TraitError):
+        Weights(anything=[[1], [1, 2]])
+
+
+def test_dtype_constraint():
+    with pytest.raises(TraitError):
+        Weights(weights=np.arange(3, dtype='float32'))
+
+    with pytest.raises(TraitError):
+        Weights(weights=['a', 'b'])
+
+    with pytest.raises(TraitError):
+        Weights(anything=np.array([object()]))
+
+    with pytest.raises(TypeError):
+        Array(dtype=object)
+
+
+def test_shape_constraint():
+    Weights(matrix=np.zeros((2, 7), dtype='int32'))
+
+    with pytest.raises(TraitError):
+        Weights(matrix=np.zeros((3, 2), dtype='int32'))
+
+    with pytest.raises(TraitError):
+        Weights(weights=np.zeros((2, 2)))
+
+
+def test_malformed_payloads(weights):
+    good = weights.to_dict()['weights']
+    bad_payloads = [
+        {'dtype': good['dtype'], 'shape': good['shape']},
+        {'shape': good['shape'], 'data': good['data']},
+        dict(good, shape=[3, 5]),
+        dict(good, shape='bogus'),
+        dict(good, dtype='not a dtype'),
+        dict(good, dtype='|O'),
+        dict(good, data=good['data'][:-4]),
+        dict(good, data=u'not base64!'),
+        dict(good, data=None),
+    ]
+    for payload in bad_payloads:
+        with pytest.raises(TraitError):
+            Weights(weights=payload)
+
+    with pytest.raises(TraitError) as e:
+        Weights(weights=bad_payloads[0])
+    assert "KeyError: 'data'" in str(e.value)
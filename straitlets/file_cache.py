@@ -0,0 +1,256 @@
+"""
+Persistent cache of parsed and validated config files.
+
+``Serializable.from_yaml_file(path, cache_dir=...)`` stores the loaded
+instance in ``cache_dir`` as a pickle, and later loads of an unchanged file
+read the pickle instead of parsing and validating the file again.
+
+Cache entries are keyed by:
+
+- the contents of the source file,
+- the straitlets version,
+- the Python major version and pickle protocol, and
+- a fingerprint of the class's schema (see ``schema_fingerprint``).
+
+Each source path has at most one entry per class: writing a new entry
+removes entries for older contents of the same file.
+
+The schema fingerprint covers trait names, types, and parameters, but not
+the code of ``@validate`` methods.  Clear the cache directory when changing
+validation logic without changing the schema.
+
+Cache entries are pickles, so ``cache_dir`` must only be writable by trusted
+users.
+"""
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+
+from six import iteritems, string_types
+from traitlets import TraitType
+
+from .serializable import Serializable
+
+_replace = getattr(os, 'replace', os.rename)
+
+
+def _qualified_name(type_):
+    return '%s.%s' % (
+        type_.__module__,
+        getattr(type_, '__qualname__', type_.__name__),
+    )
+
+
+def _describe(value, refs):
+    """
+    Build a JSON-serializable description of a schema element.
+
+    Nested Serializable classes are described by name and added to ``refs``.
+    Objects that can't be described by value (e.g. functions) are described
+    by their type, so that descriptions don't include memory addresses.
+    """
+    if value is None or isinstance(value, (bool, float) + string_types):
+        return value
+    elif isinstance(value, bytes):
+        return repr(value)
+    elif isinstance(value, int):
+        return value
+    elif isinstance(value, TraitType):
+        return [
+            _qualified_name(type(value)),
+            {
+                k: _describe(v, refs)
+                for k, v in iteritems(value.__dict__)
+                # this_class is the class that defined the trait, which may
+                # be a subclass being described; name is the key already.
+                if k not in ('this_class', 'name')
+            },
+        ]
+    elif isinstance(value, type):
+        if issubclass(value, Serializable):
+            refs.add(value)
+        return _qualified_name(value)
+    elif isinstance(value, (list, tuple)):
+        return [_describe(v, refs) for v in value]
+    elif isinstance(value, (set, frozenset)):
+        return sorted(
+            (_describe(v, refs) for v in value),
+            key=lambda d: json.dumps(d, sort_keys=True),
+        )
+    elif isinstance(value, dict):
+        return sorted(
+            ([_describe(k, refs), _describe(v, refs)]
+             for k, v in iteritems(value)),
+            key=lambda d: json.dumps(d, sort_keys=True),
+        )
+    return _qualified_name(type(value))
+
+
+def _class_schema(cls):
+    """
+    Get the JSON description of the traits of ``cls``, and the Serializable
+    classes it references.
+
+    The result is cached in the class's trait table.
+    """
+    cache = cls._trait_table.cache
+    try:
+        return cache['schema']
+    except KeyError:
+        refs = set()
+        description = json.dumps(
+            [
+                _qualified_name(cls),
+                {
+                    name: _describe(trait, refs)
+                    for name, trait in cls._trait_table.items
+                },
+            ],
+            sort_keys=True,
+        )
+        schema = cache['schema'] = (description, frozenset(refs))
+        return schema
+
+
+def schema_fingerprint(cls):
+    """
+    Compute a digest of the traits of ``cls``, including the traits of
+    nested Serializable classes.
+    """
+    # Each class's description is cached in its own trait table, so that
+    # changes to a nested class are picked up.
+    descriptions = {}
+    pending = [cls]
+    while pending:
+        klass = pending.pop()
+        if klass in descriptions:
+            continue
+        description, refs = _class_schema(klass)
+        descriptions[klass] = description
+        pending.extend(refs)
+
+    digest = hashlib.sha256(_qualified_name(cls).encode('utf-8'))
+    for description in sorted(descriptions.values()):
+        digest.update(description.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _entry_prefix(cls, path):
+    """
+    Get the file name prefix shared by all entries for ``cls`` loaded from
+    ``path``.
+    """
+    path_digest = hashlib.sha256(
+        os.path.abspath(path).encode('utf-8'),
+    ).hexdigest()[:16]
+    return '%s.%s-%s-' % (cls.__module__, cls.__name__, path_digest)
+
+
+def _cache_path(cls, cache_dir, path, data):
+    from . import __version__
+    digest = hashlib.sha256()
+    for part in (__version__,
+                 str(sys.version_info[0]),
+                 str(pickle.HIGHEST_PROTOCOL),
+                 schema_fingerprint(cls)):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    digest.update(data)
+    return os.path.join(
+        cache_dir,
+        '%s%s.pickle' % (_entry_prefix(cls, path), digest.hexdigest()),
+    )
+
+
+# Errors from missing or unreadable entries, truncated or corrupted pickles,
+# and pickles referring to classes that have since been moved or removed.
+_CACHE_READ_ERRORS = (
+    IOError,
+    OSError,
+    EOFError,
+    pickle.UnpicklingError,
+    AttributeError,
+    ImportError,
+)
+
+
+def _read_cache(cls, path):
+    try:
+        with open(path, 'rb') as f:
+            value = pickle.load(f)
+    except _CACHE_READ_ERRORS:
+        return None
+    return value if type(value) is cls else None
+
+
+def _prune_cache(entry):
+    """
+    Remove entries for the same class and source path as ``entry``.
+    """
+    cache_dir, name = os.path.split(entry)
+    prefix = name[:name.rindex('-') + 1]
+    for other in os.listdir(cache_dir):
+        if (other != name and
+                other.startswith(prefix) and
+                other.endswith('.pickle')):
+            try:
+                os.unlink(os.path.join(cache_dir, other))
+            except OSError:
+                # Already removed by a concurrent writer.
+                pass
+
+
+def _write_cache(path, value):
+    cache_dir = os.path.dirname(path)
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+    # Write to a temporary file and rename it into place, so that concurrent
+    # readers never see a partially written entry.
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        _replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load_cached(cls, path, cache_dir, parse):
+    """
+    Load an instance of ``cls`` from the file at ``path``, using
+    ``cache_dir`` as a persistent cache.
+
+    Parameters
+    ----------
+    cls : type
+        Serializable subclass to construct.
+    path : str
+        Path of the source file.
+    cache_dir : str
+        Directory in which cache entries are stored.  Created if it doesn't
+        exist.
+    parse : callable
+        Called as ``parse(data)`` with the contents of the file, as bytes,
+        on a cache miss.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    entry = _cache_path(cls, cache_dir, path, data)
+    value = _read_cache(cls, entry)
+    if value is None:
+        value = parse(data)
+        _write_cache(entry, value)
+        _prune_cache(entry)
+    return value
+
+
+__all__ = [
+    'load_cached',
+    'schema_fingerprint',
+]
@@ -0,0 +1,323 @@
+"""
+Opt-in instrumentation for Serializable serialization and validation.
+
+Instrumentation is disabled by default.  While disabled, the methods of
+``Serializable`` are left untouched, so there is no overhead.  ``enable()``
+replaces the instrumented methods with wrappers that record call counts,
+error counts, cumulative time, and payload sizes per ``Serializable``
+subclass, and ``disable()`` restores the originals.
+
+Overrides of instrumented methods are instrumented in every subclass that
+exists when ``enable()`` is called.  Subclasses defined later inherit the
+instrumented base methods, but their own overrides are not measured until
+instrumentation is disabled and enabled again.  When an override calls the
+base method through ``super()``, only the outermost call is recorded.
+
+Example
+-------
+>>> from straitlets import instrumentation
+>>> with instrumentation.instrumented() as stats:  # doctest: +SKIP
+...     config = MyConfig.from_yaml_file('config.yml')
+>>> stats.snapshot()[MyConfig]['from_dict']  # doctest: +SKIP
+OperationStats(calls=1, total_time=0.0012, total_size=4, errors=0)
+
+Nested calls are recorded individually, so e.g. ``to_json`` records both a
+``to_json`` and a ``to_dict`` call, and the time spent in ``to_dict`` is
+included in the time for ``to_json``.
+"""
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock, local
+import time
+
+from six import iteritems
+
+from .compat import argspec
+from .serializable import Serializable
+
+_clock = getattr(time, 'perf_counter', time.time)
+
+#: Names of the methods that are instrumented, on Serializable and on any
+#: subclass that defines them.
+INSTRUMENTED_METHODS = (
+    'to_dict',
+    'from_dict',
+    'to_json',
+    'from_json',
+    'to_yaml',
+    'from_yaml',
+    'to_base64',
+    'from_base64',
+    'from_url',
+    'update',
+    'validate_all_attributes',
+)
+
+
+class OperationStats(namedtuple('OperationStats', [
+        'calls',
+        'total_time',
+        'total_size',
+        'errors'])):
+    """
+    Aggregate statistics for a single operation on a single class.
+
+    Attributes
+    ----------
+    calls : int
+        Number of recorded calls.
+    total_time : float
+        Cumulative wall-clock time in seconds.
+    total_size : int
+        Cumulative payload size.  For string and bytes payloads this is the
+        length of the payload; for dicts it is the number of keys.  Payloads
+        of unknown size (e.g. file-like streams) are not counted.
+    errors : int
+        Number of recorded calls that raised an exception.  These are also
+        counted in ``calls`` and ``total_time``.
+    """
+    __slots__ = ()
+
+    def __add__(self, other):
+        return OperationStats(*(a + b for a, b in zip(self, other)))
+
+
+_EMPTY = OperationStats(0, 0.0, 0, 0)
+
+
+def _payload_size(payload):
+    try:
+        return len(payload)
+    except TypeError:
+        return None
+
+
+class Stats(object):
+    """
+    Thread-safe accumulator for instrumentation data.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._data = {}
+
+    def record(self, cls, operation, elapsed, size, error=False):
+        """
+        Record a single call of ``operation`` on ``cls``.
+        """
+        entry = OperationStats(1, elapsed, size or 0, int(error))
+        key = (cls, operation)
+        with self._lock:
+            self._data[key] = self._data.get(key, _EMPTY) + entry
+
+    def snapshot(self):
+        """
+        Return a copy of the current statistics.
+
+        Returns
+        -------
+        snapshot : dict[type, dict[str, OperationStats]]
+            Mapping from Serializable subclass to a mapping from operation
+            name to statistics for that operation.
+        """
+        with self._lock:
+            data = dict(self._data)
+        out = {}
+        for (cls, operation), stats in iteritems(data):
+            out.setdefault(cls, {})[operation] = stats
+        return out
+
+    def reset(self):
+        """
+        Discard all recorded statistics.
+        """
+        with self._lock:
+            self._data.clear()
+
+
+#: The global Stats object populated while instrumentation is enabled.
+stats = Stats()
+
+_hooks = []
+# Map from (class, name) to the original attribute.
+_originals = {}
+_state_lock = Lock()
+# Per-thread map from (id of self or class, operation) to the function
+# currently being recorded, used to skip super() calls.
+_active = local()
+
+
+def add_hook(callback):
+    """
+    Register a callback to be invoked after every instrumented call.
+
+    Parameters
+    ----------
+    callback : callable
+        Called as ``callback(cls, operation, elapsed, size)``.  ``size`` is
+        None when the payload size is unknown, including when a ``to_*``
+        call raises.
+    """
+    _hooks.append(callback)
+
+
+def remove_hook(callback):
+    """
+    Unregister a callback registered with ``add_hook``.
+    """
+    _hooks.remove(callback)
+
+
+def _record(cls, operation, elapsed, payload, error):
+    size = _payload_size(payload)
+    stats.record(cls, operation, elapsed, size, error)
+    for hook in list(_hooks):
+        hook(cls, operation, elapsed, size)
+
+
+# Marker for operations whose payload is their return value.
+_RESULT = object()
+
+
+def _call(func, target, cls, operation, args, kwargs, payload):
+    active = getattr(_active, 'calls', None)
+    if active is None:
+        active = _active.calls = {}
+    key = (id(target), operation)
+    outer = active.get(key)
+    if outer is not None and outer is not func:
+        # An override calling the base method with super().
+        return func(target, *args, **kwargs)
+
+    active[key] = func
+    result = None
+    error = True
+    start = _clock()
+    try:
+        result = func(target, *args, **kwargs)
+        error = False
+        return result
+    finally:
+        elapsed = _clock() - start
+        if outer is None:
+            del active[key]
+        _record(
+            cls,
+            operation,
+            elapsed,
+            result if payload is _RESULT else payload,
+            error,
+        )
+
+
+def _instrument_method(operation, original):
+    # Classmethods are the from_* constructors, whose payload is the first
+    # argument.  For instance methods it's the return value, which is None
+    # for update and validate_all_attributes.
+    if isinstance(original, classmethod):
+        func = original.__func__
+        params = argspec(func).args
+        payload_name = params[1] if len(params) > 1 else None
+
+        @wraps(func)
+        def wrapper(cls, *args, **kwargs):
+            if args:
+                payload = args[0]
+            else:
+                payload = kwargs.get(payload_name)
+            return _call(func, cls, cls, operation, args, kwargs, payload)
+        return classmethod(wrapper)
+
+    @wraps(original)
+    def wrapper(self, *args, **kwargs):
+        return _call(
+            original, self, type(self), operation, args, kwargs, _RESULT,
+        )
+    return wrapper
+
+
+def _serializable_classes():
+    seen = set()
+    pending = [Serializable]
+    while pending:
+        cls = pending.pop()
+        if cls not in seen:
+            seen.add(cls)
+            pending.extend(type.__subclasses__(cls))
+    return seen
+
+
+def is_enabled():
+    """
+    Check whether instrumentation is currently enabled.
+    """
+    return bool(_originals)
+
+
+def enable():
+    """
+    Start recording instrumentation data.
+    """
+    with _state_lock:
+        if _originals:
+            return
+        for cls in _serializable_classes():
+            for name in INSTRUMENTED_METHODS:
+                original = cls.__dict__.get(name)
+                if original is None:
+                    continue
+                _originals[cls, name] = original
+                setattr(cls, name, _instrument_method(name, original))
+
+
+def disable():
+    """
+    Stop recording instrumentation data and restore the uninstrumented
+    methods.
+    """
+    with _state_lock:
+        for (cls, name), original in iteritems(_originals):
+            setattr(cls, name, original)
+        _originals.clear()
+
+
+@contextmanager
+def instrumented(reset=True):
+    """
+    Context manager that enables instrumentation for the duration of a block.
+
+    Parameters
+    ----------
+    reset : bool, optional
+        Whether to discard previously recorded statistics on entry.  Default
+        is True.
+
+    Yields
+    ------
+    stats : Stats
+        The global Stats object.
+    """
+    was_enabled = is_enabled()
+    if reset:
+        stats.reset()
+    enable()
+    try:
+        yield stats
+    finally:
+        if not was_enabled:
+            disable()
+
+
+__all__ = [
+    'INSTRUMENTED_METHODS',
+    'OperationStats',
+    'Stats',
+    'add_hook',
+    'disable',
+    'enable',
+    'instrumented',
+    'is_enabled',
+    'remove_hook',
+    'stats',
+]
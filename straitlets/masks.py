@@ -0,0 +1,149 @@
+"""
+Dotted path masks selecting parts of serialized Serializables.
+
+Paths name a trait, optionally followed by keys of nested Serializables and
+dicts, or indices of lists, e.g. ``'db.password'``.  A ``*`` component
+matches any key or index, e.g. ``'replicas.*.ssl_ca_certs'``.
+
+Masks are compiled into a trie once and cached, so applying a mask costs a
+dict lookup per serialized key.
+"""
+from six import iteritems, string_types
+
+from .compat import lru_cache
+
+WILDCARD = '*'
+
+# Number of compiled masks kept by ``compile_mask``.
+MASK_CACHE_SIZE = 256
+
+
+class MaskNode(object):
+    """
+    A node of a compiled mask.
+
+    Attributes
+    ----------
+    terminal : bool
+        Whether a path ends at this node.
+    children : dict[str, MaskNode]
+        Nodes for the next path component, including ``'*'``.
+    """
+    __slots__ = ('terminal', 'children', '_merged')
+
+    def __init__(self):
+        self.terminal = False
+        self.children = {}
+        self._merged = {}
+
+    def child(self, key):
+        """
+        Get the node matching ``key``, or None if no path continues through
+        ``key``.
+        """
+        exact = self.children.get(key)
+        wildcard = self.children.get(WILDCARD)
+        if exact is None:
+            return wildcard
+        elif wildcard is None:
+            return exact
+        try:
+            return self._merged[key]
+        except KeyError:
+            merged = self._merged[key] = _merge_nodes(exact, wildcard)
+            return merged
+
+
+def _merge_nodes(a, b):
+    node = MaskNode()
+    node.terminal = a.terminal or b.terminal
+    for key in set(a.children) | set(b.children):
+        x, y = a.children.get(key), b.children.get(key)
+        if x is None:
+            node.children[key] = y
+        elif y is None:
+            node.children[key] = x
+        else:
+            node.children[key] = _merge_nodes(x, y)
+    return node
+
+
+@lru_cache(maxsize=MASK_CACHE_SIZE)
+def compile_mask(paths):
+    """
+    Compile a tuple of dotted paths into a trie of ``MaskNode``.
+    """
+    root = MaskNode()
+    for path in paths:
+        node = root
+        for part in path.split('.'):
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = MaskNode()
+            node = child
+        node.terminal = True
+    return root
+
+
+def descend(include, exclude, key):
+    """
+    Apply the masks ``include`` and ``exclude`` to ``key``.
+
+    ``None`` for ``include`` means that everything is included, and
+    ``None`` for ``exclude`` means that nothing is excluded.
+
+    Returns
+    -------
+    keep : bool
+        Whether the value at ``key`` is kept.
+    include, exclude : MaskNode or None
+        The masks to apply to the value at ``key``.
+    """
+    if exclude is not None:
+        exclude = exclude.child(key)
+        if exclude is not None and exclude.terminal:
+            return False, None, None
+    if include is not None:
+        include = include.child(key)
+        if include is None:
+            return False, None, None
+        elif include.terminal:
+            include = None
+    return True, include, exclude
+
+
+def _key_string(key):
+    return key if isinstance(key, string_types) else str(key)
+
+
+def prune(obj, include, exclude):
+    """
+    Apply masks to a tree of primitives produced by ``to_primitive``.
+
+    Returns a new tree.  ``obj`` is not modified.
+    """
+    if include is None and exclude is None:
+        return obj
+    elif isinstance(obj, dict):
+        out = {}
+        for key, value in iteritems(obj):
+            keep, inc, exc = descend(include, exclude, _key_string(key))
+            if keep:
+                out[key] = prune(value, inc, exc)
+        return out
+    elif isinstance(obj, list):
+        out = []
+        for i, value in enumerate(obj):
+            keep, inc, exc = descend(include, exclude, str(i))
+            if keep:
+                out.append(prune(value, inc, exc))
+        return out
+    return obj
+
+
+__all__ = [
+    'MaskNode',
+    'compile_mask',
+    'descend',
+    'prune',
+]
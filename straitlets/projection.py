@@ -0,0 +1,113 @@
+"""
+YAML loading that skips unwanted top-level keys at the event level.
+
+Used by ``Serializable.from_yaml(stream, only=...)``.  Values for keys that
+aren't requested are consumed as parser events without building nodes or
+Python objects for them.
+"""
+import yaml
+from yaml.events import (
+    CollectionEndEvent,
+    CollectionStartEvent,
+    MappingEndEvent,
+    MappingStartEvent,
+    NodeEvent,
+)
+from yaml.nodes import MappingNode, ScalarNode
+
+# YAML merge keys splice other mappings into the root, so they're always
+# kept.
+_MERGE_KEY = u'<<'
+
+
+class ProjectingLoader(yaml.SafeLoader):
+    """
+    A SafeLoader that only builds the values of top-level mapping keys in
+    ``only``.
+
+    Documents whose root isn't a mapping are loaded in full.
+    """
+
+    def __init__(self, stream, only):
+        super(ProjectingLoader, self).__init__(stream)
+        self.only = frozenset(only)
+
+    def compose_document(self):
+        # Drop the DOCUMENT-START event.
+        self.get_event()
+        if self.check_event(MappingStartEvent):
+            node = self._compose_root_mapping()
+        else:
+            node = self.compose_node(None, None)
+        # Drop the DOCUMENT-END event.
+        self.get_event()
+        self.anchors = {}
+        return node
+
+    def _compose_root_mapping(self):
+        start_event = self.get_event()
+        tag = start_event.tag
+        if tag is None or tag == u'!':
+            tag = self.resolve(MappingNode, None, start_event.implicit)
+        node = MappingNode(
+            tag,
+            [],
+            start_event.start_mark,
+            None,
+            flow_style=start_event.flow_style,
+        )
+        if start_event.anchor is not None:
+            self.anchors[start_event.anchor] = node
+
+        while not self.check_event(MappingEndEvent):
+            key_node = self.compose_node(node, None)
+            if (isinstance(key_node, ScalarNode) and
+                    (key_node.value in self.only or
+                     key_node.value == _MERGE_KEY)):
+                value_node = self.compose_node(node, key_node)
+                node.value.append((key_node, value_node))
+            else:
+                self._skip_node()
+
+        node.end_mark = self.get_event().end_mark
+        return node
+
+    def _skip_node(self):
+        """
+        Consume the events of the next node without composing it.
+
+        Anchored subtrees are composed anyway, since wanted values may refer
+        to them with aliases.
+        """
+        depth = 0
+        while True:
+            event = self.peek_event()
+            if (isinstance(event, NodeEvent) and
+                    getattr(event, 'anchor', None) is not None and
+                    not isinstance(event, yaml.AliasEvent)):
+                self.compose_node(None, None)
+            else:
+                event = self.get_event()
+                if isinstance(event, CollectionStartEvent):
+                    depth += 1
+                elif isinstance(event, CollectionEndEvent):
+                    depth -= 1
+            if depth == 0:
+                return
+
+
+def load_projection(stream, only):
+    """
+    Load a YAML document, building only the top-level keys in ``only``.
+    """
+    loader = ProjectingLoader(stream, only)
+    try:
+        return loader.get_single_data()
+    finally:
+        loader.dispose()
+
+
+__all__ = [
+    'ProjectingLoader',
+    'load_projection',
+]
@@ -1,5 +1,8 @@
 import sys
 
+from traitlets import TraitError
+
+from .compat import unicode
 from .to_primitive import to_primitive
 from .traits import SerializableTrait
 
@@ -9,7 +12,10 @@ if sys.version_info.major < 3:
 
 # noqa on the import because it is not at the top of the module. We cannot
 # import this module until we know that we are in Python 3.
+from datetime import date, datetime, timedelta, timezone  # noqa
+from functools import lru_cache  # noqa
 import pathlib  # noqa
+import re  # noqa
 
 
 @to_primitive.register(pathlib.Path)
@@ -21,3 +27,220 @@ class Path(SerializableTrait):
     def validate(self, obj, value):
         # ``pathlib.Path`` is a nop when called on a ``pathlib.Path`` object
         return pathlib.Path(value)
+
+    def from_trusted_primitive(self, value):
+        return pathlib.Path(value)
+
+
+@to_primitive.register(datetime)
+def _datetime_to_primitive(dt):
+    return dt.isoformat()
+
+
+@to_primitive.register(date)
+def _date_to_primitive(d):
+    return d.isoformat()
+
+
+@to_primitive.register(timedelta)
+def _timedelta_to_primitive(td):
+    return td.total_seconds()
+
+
+#: Maximum number of distinct strings cached by ``parse_datetime`` and
+#: ``parse_date``.
+PARSE_CACHE_SIZE = 4096
+
+# The formats accepted by datetime.fromisoformat on Python 3.7-3.10.
+_ISO_DATE = r'(\d{4})-(\d{2})-(\d{2})'
+_ISO_TIME = (
+    r'(\d{2})(?::(\d{2})(?::(\d{2})(?:\.(\d{3}|\d{6}))?)?)?'
+    r'(?:([+-])(\d{2}):(\d{2})(?::(\d{2})(?:\.(\d{6}))?)?)?'
+)
+_ISO_DATE_RE = re.compile(_ISO_DATE)
+_ISO_DATETIME_RE = re.compile(_ISO_DATE + r'(?:.' + _ISO_TIME + r')?')
+
+
+def _parse_date_fallback(s):
+    """
+    Fallback for ``date.fromisoformat``, which requires Python 3.7.
+    """
+    match = _ISO_DATE_RE.fullmatch(s)
+    if match is None:
+        raise ValueError('Invalid isoformat string: %r' % s)
+    return date(*map(int, match.groups()))
+
+
+def _parse_datetime_fallback(s):
+    """
+    Fallback for ``datetime.fromisoformat``, which requires Python 3.7.
+    """
+    match = _ISO_DATETIME_RE.fullmatch(s)
+    if match is None:
+        raise ValueError('Invalid isoformat string: %r' % s)
+    (year, month, day, hour, minute, second, fraction,
+     sign, tz_hour, tz_minute, tz_second, tz_fraction) = match.groups()
+
+    tzinfo = None
+    if sign is not None:
+        offset = timedelta(
+            hours=int(tz_hour),
+            minutes=int(tz_minute),
+            seconds=int(tz_second or 0),
+            microseconds=int(tz_fraction or 0),
+        )
+        tzinfo = timezone(-offset if sign == '-' else offset)
+    return datetime(
+        int(year),
+        int(month),
+        int(day),
+        int(hour or 0),
+        int(minute or 0),
+        int(second or 0),
+        int((fraction or '0').ljust(6, '0')),
+        tzinfo=tzinfo,
+    )
+
+
+_date_fromisoformat = getattr(date, 'fromisoformat', _parse_date_fallback)
+_datetime_fromisoformat = getattr(
+    datetime,
+    'fromisoformat',
+    _parse_datetime_fallback,
+)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_datetime(s):
+    """
+    Parse an ISO-8601 datetime string.
+
+    Results are cached, since configs often repeat the same timestamps and
+    datetimes are immutable.
+    """
+    # fromisoformat doesn't accept a trailing 'Z' before Python 3.11.
+    if s.endswith('Z'):
+        s = s[:-1] + '+00:00'
+    return _datetime_fromisoformat(s)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_date(s):
+    """
+    Parse an ISO-8601 date string.
+
+    Results are cached, since configs often repeat the same dates and dates
+    are immutable.
+    """
+    return _date_fromisoformat(s)
+
+
+class _ISOTrait(SerializableTrait):
+    """
+    Base class for traits holding values that serialize as ISO-8601 strings.
+
+    Subclasses must define ``value_type`` and a ``parse(s)`` method that
+    converts a string to a ``value_type``, raising ValueError if the string
+    is invalid.
+    """
+    def validate(self, obj, value):
+        if isinstance(value, unicode):
+            try:
+                value = self.parse(value)
+            except ValueError as e:
+                raise TraitError(
+                    "Invalid %s for %s trait %r: %s" % (
+                        self.info_text,
+                        type(self).__name__,
+                        self.name,
+                        e,
+                    )
+                )
+        if not isinstance(value, self.value_type):
+            self.error(obj, value)
+        return value
+
+    def from_trusted_primitive(self, value):
+        return self.parse(value)
+
+
+class Datetime(_ISOTrait):
+    """
+    A trait holding a ``datetime.datetime``.
+
+    Serialized as an ISO-8601 string.  Strings assigned to this trait are
+    parsed with ``parse_datetime``.
+
+    Parameters
+    ----------
+    tz_aware : bool, optional
+        If True, require timezone-aware datetimes.  If False, require naive
+        datetimes.  By default, both are allowed.
+    """
+    info_text = 'an ISO-8601 datetime'
+    value_type = datetime
+
+    def __init__(self, tz_aware=None, **kwargs):
+        self.tz_aware = tz_aware
+        super(Datetime, self).__init__(**kwargs)
+
+    def parse(self, s):
+        return parse_datetime(s)
+
+    def validate(self, obj, value):
+        value = super(Datetime, self).validate(obj, value)
+        if self.tz_aware is not None:
+            is_aware = value.utcoffset() is not None
+            if is_aware != self.tz_aware:
+                raise TraitError(
+                    "%s trait %r requires a %s datetime, got %r." % (
+                        type(self).__name__,
+                        self.name,
+                        'timezone-aware' if self.tz_aware else 'naive',
+                        value,
+                    )
+                )
+        return value
+
+
+class Date(_ISOTrait):
+    """
+    A trait holding a ``datetime.date``.
+
+    Serialized as an ISO-8601 string.  Strings assigned to this trait are
+    parsed with ``parse_date``.  ``datetime.datetime`` values are rejected.
+    """
+    info_text = 'an ISO-8601 date'
+    value_type = date
+
+    def parse(self, s):
+        return parse_date(s)
+
+    def validate(self, obj, value):
+        value = super(Date, self).validate(obj, value)
+        if isinstance(value, datetime):
+            self.error(obj, value)
+        return value
+
+
+class Timedelta(SerializableTrait):
+    """
+    A trait holding a ``datetime.timedelta``.
+
+    Serialized as a number of seconds.  Numbers assigned to this trait are
+    interpreted as seconds.
+    """
+    info_text = 'a timedelta or a number of seconds'
+
+    def validate(self, obj, value):
+        if isinstance(value, timedelta):
+            return value
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return timedelta(seconds=value)
+        self.error(obj, value)
+
+    def from_trusted_primitive(self, value):
+        return timedelta(seconds=value)
+
+    def from_string(self, s):
+        return float(s)
@@ -0,0 +1,197 @@
+"""
+A registry of shared resources (e.g. database clients) keyed by config.
+
+Components that each receive an equal ``PostgresConfig`` or ``MongoConfig``
+can acquire resources from a shared ``ResourceRegistry`` instead of each
+building their own.  Configs are compared by value, so separately loaded
+configs with the same contents share a resource.
+
+Example
+-------
+>>> import sqlite3
+>>> registry = ResourceRegistry(  # doctest: +SKIP
+...     lambda config: sqlite3.connect(config.database),
+... )
+>>> with registry.resource(config) as conn:  # doctest: +SKIP
+...     conn.execute('SELECT 1')
+"""
+from contextlib import contextmanager
+from threading import RLock
+import time
+
+from six import itervalues
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+def config_key(config):
+    """
+    Compute the key under which resources for ``config`` are registered.
+
+    Configs of the same class with equal ``to_dict()`` output have equal
+    keys.
+    """
+    return type(config), config.fingerprint()
+
+
+def _default_close(resource):
+    close = getattr(resource, 'close', None)
+    if close is not None:
+        close()
+
+
+class _Entry(object):
+    __slots__ = ('resource', 'refcount', 'idle_since')
+
+    def __init__(self, resource):
+        self.resource = resource
+        self.refcount = 0
+        self.idle_since = None
+
+
+class ResourceRegistry(object):
+    """
+    Lazily create and share one resource per distinct config.
+
+    Parameters
+    ----------
+    factory : callable
+        Called as ``factory(config)`` to create a resource the first time a
+        config is acquired.
+    close : callable, optional
+        Called as ``close(resource)`` when a resource is evicted.  Defaults to
+        calling ``resource.close()`` if it exists.
+    idle_timeout : float, optional
+        Seconds that a resource with no references is kept before it is
+        evicted.  ``0`` closes resources as soon as their last reference is
+        released.  ``None`` (the default) keeps resources until ``clear`` is
+        called.
+    clock : callable, optional
+        Function returning the current time in seconds.
+
+    Notes
+    -----
+    The factory is called while holding the registry's lock, so concurrent
+    acquires of the same config never create duplicate resources.
+    """
+
+    def __init__(self, factory, close=None, idle_timeout=None, clock=None):
+        self._factory = factory
+        self._close = _default_close if close is None else close
+        self._idle_timeout = idle_timeout
+        self._clock = _clock if clock is None else clock
+        self._entries = {}
+        self._lock = RLock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, config):
+        key = config_key(config)
+        with self._lock:
+            return key in self._entries
+
+    def acquire(self, config):
+        """
+        Get the resource for ``config``, creating it if necessary.
+
+        Each call must be paired with a call to ``release``.
+        """
+        key = config_key(config)
+        with self._lock:
+            evicted = self._pop_idle()
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(self._factory(config))
+            entry.refcount += 1
+            entry.idle_since = None
+            resource = entry.resource
+        self._close_all(evicted)
+        return resource
+
+    def release(self, config):
+        """
+        Release a reference acquired with ``acquire``.
+        """
+        key = config_key(config)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.refcount:
+                raise ValueError(
+                    "Released a %s that wasn't acquired." % (
+                        type(config).__name__,
+                    )
+                )
+            entry.refcount -= 1
+            if not entry.refcount:
+                entry.idle_since = self._clock()
+            evicted = self._pop_idle()
+        self._close_all(evicted)
+
+    @contextmanager
+    def resource(self, config):
+        """
+        Context manager that acquires the resource for ``config`` and releases
+        it on exit.
+        """
+        resource = self.acquire(config)
+        try:
+            yield resource
+        finally:
+            self.release(config)
+
+    def refcount(self, config):
+        """
+        Get the number of outstanding references to the resource for
+        ``config``.
+        """
+        with self._lock:
+            entry = self._entries.get(config_key(config))
+            return 0 if entry is None else entry.refcount
+
+    def evict_idle(self):
+        """
+        Close resources that have been unreferenced for longer than
+        ``idle_timeout``.
+
+        This also happens on every ``acquire`` and ``release``.
+
+        Returns
+        -------
+        count : int
+            The number of resources closed.
+        """
+        with self._lock:
+            evicted = self._pop_idle()
+        self._close_all(evicted)
+        return len(evicted)
+
+    def clear(self):
+        """
+        Close all resources, whether or not they are referenced.
+        """
+        with self._lock:
+            evicted = [entry.resource for entry in itervalues(self._entries)]
+            self._entries.clear()
+        self._close_all(evicted)
+
+    def _pop_idle(self):
+        if self._idle_timeout is None:
+            return []
+        deadline = self._clock() - self._idle_timeout
+        expired = [
+            key for key, entry in self._entries.items()
+            if entry.idle_since is not None and entry.idle_since <= deadline
+        ]
+        return [self._entries.pop(key).resource for key in expired]
+
+    def _close_all(self, resources):
+        for resource in resources:
+            self._close(resource)
+
+
+__all__ = [
+    'ResourceRegistry',
+    'config_key',
+]
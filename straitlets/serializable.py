@@ -1,51 +1,285 @@
 """
 Defines a Serializable subclass for extended traitlets.
+
+Codec modules (json, yaml, base64) are imported on first use rather than at
+module import time to keep ``import straitlets`` cheap for short-lived
+processes.
 """
-import base64
-import json
+import array
+from collections import namedtuple
+from contextlib import contextmanager
+from copy import copy
+import datetime
+from functools import wraps
 from operator import itemgetter
-from textwrap import dedent
-import yaml
+import threading
 
 from traitlets import (
+    All,
     HasTraits,
     MetaHasTraits,
     TraitError,
     TraitType,
     Undefined,
+    observe,
+)
+from six import (
+    binary_type,
+    integer_types,
+    iteritems,
+    itervalues,
+    text_type,
+    viewkeys,
+    with_metaclass,
 )
-from six import with_metaclass, iteritems, viewkeys
 
 from .compat import ensure_bytes, ensure_unicode
-from .traits import SerializableTrait
+from .masks import _key_string, compile_mask, descend, prune
+from .traits import (
+    Dict,
+    Instance,
+    SerializableTrait,
+    Tuple,
+    _ContainerMixin,
+    _element_to_primitive,
+)
 from .to_primitive import to_primitive
 
 
+# Values copied by ``Serializable.clone``.  Everything else is shared.
+_MUTABLE_CONTAINER_TYPES = (list, dict, set, bytearray, array.array)
+
+
+# Types of trait values that can't be mutated in place.  Fingerprints are
+# only cached for instances whose trait values are all of these types.
+_IMMUTABLE_VALUE_TYPES = (
+    text_type,
+    binary_type,
+    float,
+    type(None),
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+) + integer_types
+
+
+def _snapshot(value):
+    """
+    Copy a trait value into nested tuples, so that later in-place mutation of
+    containers in ``value`` doesn't change the copy.
+    """
+    if isinstance(value, dict):
+        return tuple((k, _snapshot(v)) for k, v in iteritems(value))
+    elif isinstance(value, (list, tuple, set)):
+        return tuple(_snapshot(v) for v in value)
+    return value
+
+
+def _cached_property(*inputs):
+    """
+    A property of a Serializable whose value is computed from the traits
+    named in ``inputs``.
+
+    The value is cached along with a snapshot of its inputs, and recomputed
+    when the snapshot changes, including by in-place mutation of containers.
+    """
+    def decorator(f):
+        name = f.__name__
+
+        @wraps(f)
+        def getter(self):
+            key = tuple(_snapshot(getattr(self, n)) for n in inputs)
+            cache = self.__dict__.setdefault('_cached_properties', {})
+            try:
+                cached_key, value = cache[name]
+            except KeyError:
+                pass
+            else:
+                if cached_key == key:
+                    return value
+            value = f(self)
+            cache[name] = (key, value)
+            return value
+
+        return property(getter)
+
+    return decorator
+
+
+def _canonicalize(obj):
+    """
+    Normalize a tree of primitives for canonical encoding: replace -0.0 with
+    0.0 and convert dict keys to strings, so that keys of mixed types can be
+    sorted.
+    """
+    if isinstance(obj, float):
+        return 0.0 if obj == 0.0 else obj
+    elif isinstance(obj, dict):
+        return {_key_string(k): _canonicalize(v) for k, v in iteritems(obj)}
+    elif isinstance(obj, list):
+        return [_canonicalize(v) for v in obj]
+    return obj
+
+
+def _canonical_json(dict_):
+    """
+    Encode a dict produced by ``to_dict`` as canonical JSON: sorted keys, no
+    whitespace, and normalized floats.
+
+    Sets are always sorted by ``to_primitive``, so equal values produce equal
+    output in every process.
+    """
+    import json
+    return json.dumps(
+        _canonicalize(dict_),
+        sort_keys=True,
+        separators=(',', ':'),
+    )
+
+
+def _check_serializable_trait(name, value):
+    if isinstance(value, TraitType):
+        if not isinstance(value, SerializableTrait):
+            raise TypeError(
+                "Got non-serializable trait {name}={type}".format(
+                    name=name,
+                    type=type(value).__name__,
+                )
+            )
+
+
+class TraitTable(namedtuple('TraitTable', [
+        'names',
+        'name_set',
+        'traits',
+        'items',
+        'defaults',
+        'examples',
+        'containers',
+        'instances',
+        'primitives',
+        'cache'])):
+    """
+    Per-class table of trait metadata, computed once by ``SerializableMeta``.
+
+    Attributes
+    ----------
+    names : tuple[str]
+        Trait names, sorted (the same order as ``trait_names()``).
+    name_set : frozenset[str]
+        Trait names, as a set.
+    traits : dict[str, SerializableTrait]
+        Map from name to trait.
+    items : tuple[(str, SerializableTrait)]
+        ``(name, trait)`` pairs, in the order of ``names``.
+    defaults : dict[str, object]
+        Map from name to static default value, or Undefined if the trait has
+        no static default.
+    examples : dict[str, object]
+        Map from name to the value tagged with ``.example()`` (falling back to
+        the static default), or Undefined.
+    containers : frozenset[str]
+        Names of List/Set/Dict/Tuple traits.
+    instances : frozenset[str]
+        Names of Instance traits.
+    primitives : frozenset[str]
+        Names of all other traits.
+    cache : dict
+        Storage for data derived from the table.  Discarded along with the
+        table when the class's traits change.
+
+    Notes
+    -----
+    Tables must not be mutated (other than ``cache``).  They are replaced
+    wholesale when traits are added to or removed from a class.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_class(cls, klass):
+        traits = klass.class_traits()
+        names = tuple(sorted(traits))
+        defaults = {}
+        examples = {}
+        containers = set()
+        instances = set()
+        for name in names:
+            trait = traits[name]
+            if isinstance(trait, _ContainerMixin):
+                containers.add(name)
+                # traitlets containers store their defaults as arguments to
+                # a factory rather than in default_value.
+                default = trait.make_dynamic_default()
+                defaults[name] = Undefined if default is None else default
+            else:
+                if isinstance(trait, Instance):
+                    instances.add(name)
+                defaults[name] = trait.default_value
+            examples[name] = trait._static_example_value()
+
+        name_set = frozenset(names)
+        return cls(
+            names=names,
+            name_set=name_set,
+            traits=traits,
+            items=tuple((name, traits[name]) for name in names),
+            defaults=defaults,
+            examples=examples,
+            containers=frozenset(containers),
+            instances=frozenset(instances),
+            primitives=name_set - containers - instances,
+            cache={},
+        )
+
+
 class SerializableMeta(MetaHasTraits):
 
     def __new__(mcls, name, bases, classdict):
         # Check that all TraitType instances are all.
         for maybe_trait_name, maybe_trait_instance in iteritems(classdict):
-            if isinstance(maybe_trait_instance, TraitType):
-                if not isinstance(maybe_trait_instance, SerializableTrait):
-                    raise TypeError(
-                        "Got non-serializable trait {name}={type}".format(
-                            name=maybe_trait_name,
-                            type=type(maybe_trait_instance).__name__,
-                        )
-                    )
+            _check_serializable_trait(maybe_trait_name, maybe_trait_instance)
 
         return super(SerializableMeta, mcls).__new__(
             mcls, name, bases, classdict
         )
 
+    def __init__(cls, name, bases, classdict):
+        super(SerializableMeta, cls).__init__(name, bases, classdict)
+        cls._trait_table = TraitTable.from_class(cls)
 
-_DID_YOU_MEAN_INSTANCE_TEMPLATE = dedent(
-    """
-    {type}.__init__() got unexpected keyword argument {name!r}.
-    {type} (or a parent) has a class attribute with the same name.
-    Did you mean to write `{name} = Instance({instance_type})`?
-    """
+    def __setattr__(cls, name, value):
+        # Support adding traits to an existing class, e.g. ``Cls.x =
+        # Integer()``.  Initialize the trait the same way MetaHasTraits would
+        # have if it were in the class body, then rebuild the trait tables of
+        # ``cls`` and its subclasses.
+        _check_serializable_trait(name, value)
+        was_trait = isinstance(cls.__dict__.get(name), TraitType)
+        super(SerializableMeta, cls).__setattr__(name, value)
+        if isinstance(value, TraitType):
+            value.class_init(cls, name)
+            cls._invalidate_trait_tables()
+        elif was_trait:
+            cls._invalidate_trait_tables()
+
+    def __delattr__(cls, name):
+        was_trait = isinstance(cls.__dict__.get(name), TraitType)
+        super(SerializableMeta, cls).__delattr__(name)
+        if was_trait:
+            cls._invalidate_trait_tables()
+
+    def _invalidate_trait_tables(cls):
+        cls._trait_table = TraitTable.from_class(cls)
+        for subclass in cls.__subclasses__():
+            subclass._invalidate_trait_tables()
+
+
+# Spelled out rather than built with textwrap.dedent to avoid importing
+# textwrap at startup.
+_DID_YOU_MEAN_INSTANCE_TEMPLATE = (
+    "\n"
+    "{type}.__init__() got unexpected keyword argument {name!r}.\n"
+    "{type} (or a parent) has a class attribute with the same name.\n"
+    "Did you mean to write `{name} = Instance({instance_type})`?\n"
 )
 
 
@@ -76,12 +310,31 @@ class Serializable(with_metaclass(SerializableMeta, HasTraits)):
     """
 
     def __init__(self, **metadata):
-        unexpected = viewkeys(metadata) - self.trait_names()
+        unexpected = viewkeys(metadata) - self._trait_table.name_set
         if unexpected:
             raise TypeError(self._unexpected_kwarg_msg(unexpected))
         super(Serializable, self).__init__(**metadata)
 
-    def validate_all_attributes(self):
+    @observe(All)
+    def _clear_cached_properties(self, change):
+        # Values cached by _cached_property and fingerprint() depend on the
+        # values of our traits.
+        self.__dict__.pop('_cached_properties', None)
+
+    def __reduce_ex__(self, protocol):
+        # Pickle only the class and a tuple of trait values, in the order of
+        # the class's trait table.  The default pickle of a HasTraits
+        # includes notifiers, validators, and other bookkeeping that is
+        # rebuilt on construction anyway.
+        trait_values = self._trait_values
+        values = tuple(
+            _pickle_value(trait_values.get(name, _UNSET), protocol)
+            for name in self._trait_table.names
+        )
+        cls = type(self)
+        return (_unpickle_serializable, (cls, _pickle_schema(cls), values))
+
+    def validate_all_attributes(self, names=None, fail_fast=False):
         """
         Force validation of all traits.
 
@@ -92,12 +345,39 @@ class Serializable(with_metaclass(SerializableMeta, HasTraits)):
         Consider using ``StrictSerializable`` for classes where you always want
         this called on construction.
 
+        Parameters
+        ----------
+        names : iterable[str], optional
+            Names of the traits to validate, in the order in which they should
+            be validated.  Defaults to all traits, in sorted order.
+        fail_fast : bool, optional
+            If True, raise the first TraitError encountered instead of
+            collecting errors for every trait into ``MultipleTraitErrors``.
+
         See Also
         --------
         StrictSerializable
         """
+        if names is None:
+            names = self._trait_table.names
+        else:
+            names = tuple(names)
+            unknown = set(names) - self._trait_table.name_set
+            if unknown:
+                raise TypeError(
+                    "{type} has no traits named {unknown}.".format(
+                        type=type(self).__name__,
+                        unknown=tuple(sorted(unknown)),
+                    )
+                )
+
+        if fail_fast:
+            for name in names:
+                getattr(self, name)
+            return
+
         errors = {}
-        for name in self.trait_names():
+        for name in names:
             try:
                 getattr(self, name)
             except TraitError as e:
@@ -105,6 +385,96 @@ class Serializable(with_metaclass(SerializableMeta, HasTraits)):
         if errors:
             raise MultipleTraitErrors(errors)
 
+    def update(self, **changes):
+        """
+        Set multiple traits at once.
+
+        Values are validated as they are set.  Cross-validators run once all
+        values have been set, and if any validation fails, all of the changes
+        are rolled back.
+        """
+        unexpected = viewkeys(changes) - self._trait_table.name_set
+        if unexpected:
+            raise TypeError(
+                "{type}.update() got unexpected"
+                " keyword arguments {unexpected}.".format(
+                    type=type(self).__name__,
+                    unexpected=tuple(sorted(unexpected)),
+                )
+            )
+        with self.hold_trait_notifications():
+            for name, value in iteritems(changes):
+                setattr(self, name, value)
+
+    def clone(self):
+        """
+        Make a copy of ``self`` without revalidating.
+
+        Nested ``Serializable`` values and immutable values are shared with
+        ``self``.  Mutable containers (lists, dicts, sets, and byte arrays)
+        are copied, but their elements are shared.  Traits that haven't been
+        set on ``self`` are left unset on the copy.
+
+        Observers registered on ``self`` with ``observe()`` are not copied.
+        """
+        # Like _from_trusted_dict, skip __init__: these values have already
+        # been validated.
+        new = type(self).__new__(type(self))
+        trait_values = new._trait_values
+        for name, value in iteritems(self._trait_values):
+            if isinstance(value, _MUTABLE_CONTAINER_TYPES):
+                value = copy(value)
+            trait_values[name] = value
+        return new
+
+    def evolve(self, **changes):
+        """
+        Make a copy of ``self`` with some traits changed.
+
+        Only the changed traits are validated.  Cross-validators (see
+        ``traitlets.validate``) run for the changed traits and for any other
+        traits that have cross-validators, since those may depend on the
+        changed values.  Unchanged values are shared with ``self`` as in
+        ``clone``.
+
+        Parameters
+        ----------
+        **changes
+            New values for traits.
+
+        Returns
+        -------
+        evolved : type(self)
+            The new instance.  ``self`` is not modified.
+        """
+        unexpected = viewkeys(changes) - self._trait_table.name_set
+        if unexpected:
+            raise TypeError(
+                "{type}.evolve() got unexpected"
+                " keyword arguments {unexpected}.".format(
+                    type=type(self).__name__,
+                    unexpected=tuple(sorted(unexpected)),
+                )
+            )
+        new = self.clone()
+        if not changes:
+            return new
+
+        with new.hold_trait_notifications():
+            for name, value in iteritems(changes):
+                setattr(new, name, value)
+
+        trait_values = new._trait_values
+        traits = self._trait_table.traits
+        for name in new._trait_validators:
+            if name in changes or name not in trait_values:
+                continue
+            trait_values[name] = traits[name]._cross_validate(
+                new,
+                trait_values[name],
+            )
+        return new
+
     @classmethod
     def _unexpected_kwarg_msg(cls, unexpected):
         # Provide a more useful error is the user did:
@@ -142,11 +512,14 @@ class Serializable(with_metaclass(SerializableMeta, HasTraits)):
 
         Traits with names in ``skip`` will not have example values set.
         """
+        table = cls._trait_table
         kwargs = {}
-        for name, trait in iteritems(cls.class_traits()):
+        for name, value in iteritems(table.examples):
             if name in skip:
                 continue
-            value = trait.example_value
+            if value is Undefined and name in table.instances:
+                # Instance traits can fall back to an example of their class.
+                value = table.traits[name].example_value
             if value is Undefined:
                 continue
             kwargs[name] = value
@@ -174,52 +547,556 @@ class Serializable(with_metaclass(SerializableMeta, HasTraits)):
         with open(dest, 'w') as f:
             inst.to_yaml(stream=f, skip=skip)
 
-    def to_dict(self, skip=()):
+    def to_dict(self, skip=(), include=None):
+        """
+        Convert self to a dict of primitives.
+
+        Parameters
+        ----------
+        skip : iterable[str], optional
+            Paths of values to omit.  Paths are trait names, optionally
+            followed by dotted keys or list indices into the trait's value,
+            e.g. ``'db.password'``.  A ``*`` component matches any key or
+            index, e.g. ``'replicas.*.ssl_ca_certs'``.
+        include : iterable[str], optional
+            If passed, paths of the only values to keep.  Values matched by
+            ``skip`` are omitted even if they are included.
+        """
+        if include is None and not skip:
+            out_dict = {}
+            for key, trait in self._trait_table.items:
+                value = getattr(self, key)
+                if value is None:
+                    out_dict[key] = None
+                else:
+                    out_dict[key] = trait.to_primitive(value)
+            return out_dict
+
+        return self._masked_to_dict(
+            None if include is None else compile_mask(tuple(include)),
+            compile_mask(tuple(skip)) if skip else None,
+        )
+
+    def _masked_to_dict(self, include, exclude):
         out_dict = {}
-        for key in self.trait_names():
-            if key in skip:
+        for key, trait in self._trait_table.items:
+            keep, inc, exc = descend(include, exclude, key)
+            if not keep:
                 continue
-            out_dict[key] = to_primitive(getattr(self, key))
+            value = getattr(self, key)
+            if value is None:
+                out_dict[key] = None
+            elif inc is None and exc is None:
+                out_dict[key] = trait.to_primitive(value)
+            else:
+                out_dict[key] = _masked_to_primitive(trait, value, inc, exc)
         return out_dict
 
     @classmethod
     def from_dict(cls, dict_):
         return cls(**dict_)
 
-    def to_json(self, skip=()):
-        return json.dumps(self.to_dict(skip=skip))
+    @classmethod
+    def from_layers(cls, *sources):
+        """
+        Construct from a sequence of partial configs, deep-merged in order.
+
+        Later sources take precedence over earlier ones.  Values for
+        ``Instance`` traits of Serializable classes are merged recursively.
+        Values for other traits replace earlier values, except for
+        List/Set/Tuple/Dict traits tagged with ``.tag(merge='extend')``,
+        whose values are concatenated (or, for Dict, updated).  An explicit
+        ``None`` discards values from earlier sources.
+
+        The merged dict is validated once, with ``from_dict``.
+
+        Parameters
+        ----------
+        *sources : dict, Serializable, or None
+            Dicts (e.g. from ``yaml.safe_load``), instances of ``cls``, or
+            None, which is ignored.
+
+        Examples
+        --------
+        >>> config = AppConfig.from_layers(  # doctest: +SKIP
+        ...     base,
+        ...     yaml.safe_load(env_overlay),
+        ...     {'db': {'port': 5433}},
+        ... )
+        """
+        if not sources:
+            raise ValueError(
+                "Must provide at least one source to from_layers()."
+            )
+        return cls.from_dict(cls._merge_layers(sources))
 
     @classmethod
-    def from_json(cls, s):
+    def _merge_plan(cls):
+        """
+        Map from trait name to the function used to merge its values.
+        """
+        cache = cls._trait_table.cache
+        try:
+            return cache['merge_plan']
+        except KeyError:
+            pass
+
+        plan = {}
+        for name, trait in cls._trait_table.items:
+            strategy = trait.metadata.get('merge', 'replace')
+            if strategy not in ('replace', 'extend'):
+                raise ValueError(
+                    "Unknown merge strategy {strategy!r} for {type}.{name}."
+                    " Expected 'replace' or 'extend'.".format(
+                        strategy=strategy,
+                        type=cls.__name__,
+                        name=name,
+                    )
+                )
+            if isinstance(trait, Instance):
+                if issubclass(trait.klass, Serializable):
+                    plan[name] = trait.klass._merge_layers
+            elif strategy == 'extend':
+                if name not in cls._trait_table.containers:
+                    raise ValueError(
+                        "Can't extend non-container trait"
+                        " {type}.{name}.".format(type=cls.__name__, name=name)
+                    )
+                if isinstance(trait, Dict):
+                    plan[name] = _merge_extend_dict
+                else:
+                    plan[name] = _merge_extend_sequence
+
+        cache['merge_plan'] = plan
+        return plan
+
+    @classmethod
+    def _merge_layers(cls, sources):
+        values = {}
+        for source in sources:
+            if source is None:
+                continue
+            if isinstance(source, Serializable):
+                source = source.to_dict()
+            elif not isinstance(source, dict):
+                raise TypeError(
+                    "Can't merge {got} into {type}.".format(
+                        got=type(source).__name__,
+                        type=cls.__name__,
+                    )
+                )
+            for name, value in iteritems(source):
+                values.setdefault(name, []).append(value)
+
+        plan = cls._merge_plan()
+        out = {}
+        for name, layers in iteritems(values):
+            merge = plan.get(name)
+            if merge is None:
+                out[name] = layers[-1]
+                continue
+            # None resets the value, discarding earlier layers.
+            layers = _after_last_none(layers)
+            out[name] = merge(layers) if layers else None
+        return out
+
+    @classmethod
+    def from_dict_only(cls, dict_, only):
+        """
+        Construct a partial instance from the entries of ``dict_`` named in
+        ``only``.
+
+        Only the selected traits are validated.  Other entries of ``dict_``
+        are ignored, and the corresponding traits are left unset, so
+        accessing them returns their default or raises if they have none.
+        This is true even for ``StrictSerializable`` subclasses.
+
+        Parameters
+        ----------
+        dict_ : dict
+            Dict produced by ``to_dict`` on an instance of ``cls``.
+        only : iterable[str]
+            Names of the traits to set.
+        """
+        if not isinstance(dict_, dict):
+            raise TypeError(
+                "Expected a dict to construct {type}, got {got}.".format(
+                    type=cls.__name__,
+                    got=type(dict_).__name__,
+                )
+            )
+        only = tuple(only)
+        unknown = set(only) - cls._trait_table.name_set
+        if unknown:
+            raise TypeError(
+                "{type} has no traits named {unknown}.".format(
+                    type=cls.__name__,
+                    unknown=tuple(sorted(unknown)),
+                )
+            )
+        # Skip __init__, which would validate every trait of a
+        # StrictSerializable.
+        self = cls.__new__(cls)
+        with self.hold_trait_notifications():
+            for name in only:
+                if name in dict_:
+                    setattr(self, name, dict_[name])
+        return self
+
+    @classmethod
+    def _canonical_message(cls, dict_):
+        # The class is part of the message so that a token or fingerprint for
+        # one class can't be confused with another with compatible fields.
+        return ensure_bytes(
+            '%s.%s\n%s' % (
+                cls.__module__,
+                cls.__name__,
+                _canonical_json(dict_),
+            ),
+            encoding='utf-8',
+        )
+
+    @classmethod
+    def _compute_trust_token(cls, dict_, key):
+        import hashlib
+        import hmac
+        return hmac.new(
+            ensure_bytes(key),
+            cls._canonical_message(dict_),
+            hashlib.sha256,
+        ).hexdigest()
+
+    def fingerprint(self):
+        """
+        Compute a SHA-256 digest of the class and canonical JSON encoding of
+        self.
+
+        Instances of the same class with equal values have equal fingerprints
+        in every process, so fingerprints can be used as cache or
+        deduplication keys.
+
+        The result is cached until a trait of ``self`` is set, unless
+        ``self`` holds containers or nested Serializables, which can change
+        without setting a trait of ``self``.
+
+        Returns
+        -------
+        fingerprint : str
+            Hex-encoded SHA-256 digest.
+        """
+        cache = self.__dict__.setdefault('_cached_properties', {})
+        try:
+            return cache['fingerprint']
+        except KeyError:
+            pass
+        fingerprint = _compute_fingerprint(self)
+        # _compute_fingerprint fills in defaults, so every trait is checked.
+        if all(isinstance(value, _IMMUTABLE_VALUE_TYPES)
+               for value in itervalues(self._trait_values)):
+            cache['fingerprint'] = fingerprint
+        return fingerprint
+
+    def trust_token(self, key, skip=()):
+        """
+        Compute an HMAC-SHA256 token for ``self.to_dict(skip=skip)``.
+
+        Pass the dict and token to ``from_trusted_dict`` to reconstruct
+        ``self`` in another process without revalidating.
+
+        Parameters
+        ----------
+        key : bytes or unicode
+            Secret key shared between the producer and consumer.
+
+        Returns
+        -------
+        token : str
+            Hex-encoded HMAC of the canonical JSON encoding of the dict.
+        """
+        return self._compute_trust_token(self.to_dict(skip=skip), key)
+
+    @classmethod
+    def from_trusted_dict(cls, dict_, token=None, key=None):
+        """
+        Construct from a dict produced by ``to_dict``, skipping validation if
+        ``token`` authenticates ``dict_``.
+
+        If ``token`` is a valid HMAC of ``dict_`` under ``key`` (see
+        ``trust_token``), values are stored without running trait validation
+        or ``@validate`` cross-validators.  Otherwise, this is equivalent to
+        ``from_dict``.
+
+        Parameters
+        ----------
+        dict_ : dict
+            Dict produced by ``to_dict`` on an instance of ``cls``.
+        token : str, optional
+            Token produced by ``trust_token``.
+        key : bytes or unicode, optional
+            Secret key shared between the producer and consumer.
+        """
+        if token is not None and key is not None:
+            import hmac
+            expected = cls._compute_trust_token(dict_, key)
+            if hmac.compare_digest(
+                    ensure_bytes(expected),
+                    ensure_bytes(token)):
+                return cls._from_trusted_dict(dict_)
+        return cls.from_dict(dict_)
+
+    @classmethod
+    def _from_trusted_dict(cls, dict_):
+        """
+        Construct from a dict without validation.
+
+        Only call this with data that is known to be valid.
+        """
+        table = cls._trait_table
+        unexpected = viewkeys(dict_) - table.name_set
+        if unexpected:
+            raise TypeError(cls._unexpected_kwarg_msg(unexpected))
+
+        # __new__ sets up trait defaults and event handlers, but doesn't run
+        # __init__, which would validate the values we're about to store.
+        self = cls.__new__(cls)
+        trait_values = self._trait_values
+        traits = table.traits
+        for name, value in iteritems(dict_):
+            if value is None:
+                trait_values[name] = None
+            else:
+                trait_values[name] = traits[name].from_trusted_primitive(value)
+        return self
+
+    def to_json(self, skip=(), canonical=False, include=None):
+        """
+        Serialize self as JSON.
+
+        Parameters
+        ----------
+        skip : iterable[str], optional
+            Paths of values to omit.  See ``to_dict``.
+        canonical : bool, optional
+            If True, produce a deterministic encoding, with sorted keys, no
+            whitespace, and -0.0 normalized to 0.0.
+        include : iterable[str], optional
+            Paths of the only values to keep.  See ``to_dict``.
+        """
+        dict_ = self.to_dict(skip=skip, include=include)
+        if canonical:
+            return _canonical_json(dict_)
+        import json
+        return json.dumps(dict_)
+
+    @classmethod
+    def from_json(cls, s, only=None):
+        """
+        Construct from json.
+
+        Parameters
+        ----------
+        s : str
+            The json to load.
+        only : iterable[str], optional
+            If passed, return a partial instance with only these traits set
+            and validated.  See ``from_dict_only``.
+        """
+        import json
+        if only is not None:
+            return cls.from_dict_only(json.loads(s), only)
         return cls.from_dict(json.loads(s))
 
-    def to_yaml(self, stream=None, skip=()):
+    def to_yaml(self, stream=None, skip=(), anchors=None, include=None):
+        """
+        Serialize self as yaml.
+
+        Parameters
+        ----------
+        stream : file-like, optional
+            If passed, write to ``stream`` instead of returning a string.
+        skip : iterable[str], optional
+            Paths of values to omit.  See ``to_dict``.
+        anchors : {None, 'identity', 'structural'}, optional
+            If passed, nested Serializables that occur more than once are
+            written once with a YAML anchor and referenced elsewhere with an
+            alias.  With ``'identity'``, only repeated references to the same
+            object are shared.  With ``'structural'``, all nested
+            Serializables of the same class with equal contents are shared.
+            Masked subtrees are never shared.
+        include : iterable[str], optional
+            Paths of the only values to keep.  See ``to_dict``.
+        """
+        import yaml
+        if anchors is None:
+            dict_ = self.to_dict(skip=skip, include=include)
+        else:
+            with _shared_subtrees_memo(anchors):
+                dict_ = self.to_dict(skip=skip, include=include)
         return yaml.safe_dump(
-            self.to_dict(skip=skip),
+            dict_,
             stream=stream,
             default_flow_style=False,
         )
 
     @classmethod
-    def from_yaml(cls, stream):
-        return cls.from_dict(yaml.safe_load(stream))
+    def from_yaml(cls, stream, only=None):
+        """
+        Construct from yaml.
+
+        Subtrees that are referenced more than once with YAML aliases are
+        constructed once, and the resulting Serializable is shared.
+
+        Parameters
+        ----------
+        stream : str or file-like
+            The yaml to load.
+        only : iterable[str], optional
+            If passed, return a partial instance with only these traits set
+            and validated.  Values of other top-level keys are skipped by the
+            parser without being built.  See ``from_dict_only``.
+        """
+        if only is not None:
+            from .projection import load_projection
+            dict_ = load_projection(stream, only)
+            with _shared_instances_memo():
+                return cls.from_dict_only(dict_, only)
+
+        import yaml
+        dict_ = yaml.safe_load(stream)
+        with _shared_instances_memo():
+            return cls.from_dict(dict_)
 
     @classmethod
-    def from_yaml_file(cls, path):
+    def from_yaml_file(cls, path, cache_dir=None):
+        """
+        Construct from the yaml file at ``path``.
+
+        Parameters
+        ----------
+        path : str
+            The file to read.
+        cache_dir : str, optional
+            If passed, a directory in which to cache the loaded instance.
+            Later loads of the same file contents with the same schema read
+            the cached instance instead of parsing and validating the file.
+            See ``straitlets.file_cache`` for details.
+        """
+        if cache_dir is not None:
+            from .file_cache import load_cached
+            return load_cached(cls, path, cache_dir, cls.from_yaml)
         with open(path, 'r') as f:
             return cls.from_yaml(f)
 
+    @classmethod
+    def from_json_file(cls, path, cache_dir=None):
+        """
+        Construct from the json file at ``path``.
+
+        See Also
+        --------
+        Serializable.from_yaml_file
+        """
+        if cache_dir is not None:
+            from .file_cache import load_cached
+            return load_cached(
+                cls,
+                path,
+                cache_dir,
+                lambda data: cls.from_json(data.decode('utf-8')),
+            )
+        with open(path, 'r') as f:
+            return cls.from_json(f.read())
+
+    def to_yaml_file(self, path, skip=()):
+        """
+        Write self as yaml to the file at ``path``.
+        """
+        with open(path, 'w') as f:
+            self.to_yaml(stream=f, skip=skip)
+
+    @classmethod
+    def afrom_yaml_file(cls, path, executor=None):
+        """
+        Asynchronous version of ``from_yaml_file``.
+
+        Reading, parsing, and validation run in ``executor`` (see
+        ``straitlets.aio.set_default_executor``).  Requires Python 3.7.
+
+        This is a regular method returning a future, not a coroutine
+        function, so that it can be defined in code that also runs on Python
+        2.  It must be called from code running in an event loop, and the load
+        is scheduled as soon as it is called, whether or not the future is
+        awaited.
+
+        Returns
+        -------
+        future : asyncio.Future
+            An awaitable resolving to an instance of ``cls``.
+        """
+        from .aio import run_in_executor
+        return run_in_executor(cls.from_yaml_file, path, executor=executor)
+
+    @classmethod
+    def afrom_json_file(cls, path, executor=None):
+        """
+        Asynchronous version of ``from_json_file``.
+
+        See Also
+        --------
+        Serializable.afrom_yaml_file
+        """
+        from .aio import run_in_executor
+        return run_in_executor(cls.from_json_file, path, executor=executor)
+
+    def ato_yaml_file(self, path, skip=(), executor=None):
+        """
+        Asynchronous version of ``to_yaml_file``.
+
+        Like ``afrom_yaml_file``, this returns a future rather than a
+        coroutine.
+
+        Returns
+        -------
+        future : asyncio.Future
+            An awaitable resolving to None once the file has been written.
+        """
+        from .aio import run_in_executor
+        return run_in_executor(
+            self.to_yaml_file, path, skip=skip, executor=executor,
+        )
+
+    @classmethod
+    def awrite_example_yaml(cls, dest, skip=(), executor=None):
+        """
+        Asynchronous version of ``write_example_yaml``.
+
+        Returns
+        -------
+        future : asyncio.Future
+            An awaitable resolving to None once the file has been written.
+
+        See Also
+        --------
+        Serializable.afrom_yaml_file
+        """
+        from .aio import run_in_executor
+        return run_in_executor(
+            cls.write_example_yaml, dest, skip=skip, executor=executor,
+        )
+
     @classmethod
     def from_base64(cls, s):
         """
         Construct from base64-encoded JSON.
         """
+        import base64
         return cls.from_json(ensure_unicode(base64.b64decode(s)))
 
     def to_base64(self, skip=()):
         """
         Construct from base64-encoded JSON.
         """
+        import base64
         return base64.b64encode(
             ensure_bytes(
                 self.to_json(skip=skip),
@@ -253,10 +1130,415 @@ class Serializable(with_metaclass(SerializableMeta, HasTraits)):
             ensure_unicode(self.to_base64(skip=skip))
         )
 
+    @classmethod
+    def from_environ_fields(cls, environ, prefix='APP', base=None):
+        """
+        Construct from per-field environment variables.
+
+        Variables named ``{prefix}__{NAME}`` set the trait ``name``.  Nested
+        Serializable traits are addressed with further ``__``-separated
+        names, e.g. ``APP__DB__PORT=5433`` sets ``db.port``.  Names are
+        matched case-insensitively.
+
+        Values are converted from strings by each trait's ``from_string``:
+        numbers and booleans are parsed, and containers accept either JSON
+        or a comma-separated list.
+
+        Parameters
+        ----------
+        environ : dict-like
+            Dict-like object (e.g. os.environ) from which to read fields.
+        prefix : str, optional
+            Prefix of the variables to read.  Default is ``'APP'``.  Every
+            variable with this prefix must name a trait.
+        base : dict or Serializable, optional
+            Values to use for fields that aren't set in ``environ``.  Fields
+            are merged into ``base`` as with ``from_layers``.
+        """
+        return cls.from_layers(base, cls._environ_overrides(environ, prefix))
+
+    @classmethod
+    def _environ_overrides(cls, environ, prefix):
+        marker = prefix.upper() + '__'
+        # A single pass over the environment, keeping only our variables.
+        # Sorting ensures that e.g. APP__DB is applied before APP__DB__PORT.
+        index = sorted(
+            (key, value) for key, value in iteritems(environ)
+            if key.upper().startswith(marker)
+        )
+        out = {}
+        for key, value in index:
+            path = key[len(marker):].split('__')
+            klass, node = cls, out
+            for i, part in enumerate(path):
+                name = klass._environ_names().get(part.lower())
+                if name is None:
+                    raise TypeError(
+                        "{type} has no trait matching environment variable"
+                        " {key}.".format(type=klass.__name__, key=key)
+                    )
+                trait = klass._trait_table.traits[name]
+                if i == len(path) - 1:
+                    try:
+                        node[name] = trait.from_string(value)
+                    except ValueError as e:
+                        raise TraitError(
+                            "Invalid value for {key}: {e}".format(
+                                key=key,
+                                e=e,
+                            )
+                        )
+                    break
+
+                if not (isinstance(trait, Instance) and
+                        issubclass(trait.klass, Serializable)):
+                    raise TypeError(
+                        "Environment variable {key} addresses a field of"
+                        " {type}.{name}, which is not a Serializable.".format(
+                            key=key,
+                            type=klass.__name__,
+                            name=name,
+                        )
+                    )
+                child = node.get(name)
+                if not isinstance(child, dict):
+                    child = node[name] = {}
+                klass, node = trait.klass, child
+        return out
+
+    @classmethod
+    def _environ_names(cls):
+        """
+        Map from lowercased trait name to trait name.
+        """
+        cache = cls._trait_table.cache
+        try:
+            return cache['environ_names']
+        except KeyError:
+            names = cache['environ_names'] = {
+                name.lower(): name for name in cls._trait_table.names
+            }
+            return names
+
+    def to_shared_memory(self, name=None, key=None, skip=()):
+        """
+        Write self to a new shared memory segment.
+
+        Requires Python 3.8.  See ``straitlets.shared_memory`` for details.
+
+        Parameters
+        ----------
+        name : str, optional
+            Name of the segment to create.  If not passed, a unique name is
+            generated.
+        key : bytes or unicode, optional
+            If passed, readers with the same key skip revalidation.
+
+        Returns
+        -------
+        shm : multiprocessing.shared_memory.SharedMemory
+            The created segment.  The caller is responsible for calling
+            ``shm.close()`` and ``shm.unlink()``.
+        """
+        from .shared_memory import write_shared_memory
+        return write_shared_memory(self, name=name, key=key, skip=skip)
+
+    @classmethod
+    def from_shared_memory(cls, name, key=None):
+        """
+        Read an instance written with ``to_shared_memory``.
+
+        Parameters
+        ----------
+        name : str
+            Name of the shared memory segment.
+        key : bytes or unicode, optional
+            Key passed to ``to_shared_memory``.
+        """
+        from .shared_memory import read_shared_memory
+        return read_shared_memory(cls, name, key=key)
+
+
+def _compute_fingerprint(s):
+    import hashlib
+    return hashlib.sha256(s._canonical_message(s.to_dict())).hexdigest()
+
+
+# Per-thread state for sharing subtrees in to_yaml and from_yaml.
+_memos = threading.local()
+
+
+@contextmanager
+def _shared_subtrees_memo(mode):
+    if mode not in ('identity', 'structural'):
+        raise ValueError(
+            "anchors must be None, 'identity', or 'structural', got %r." % (
+                mode,
+            )
+        )
+    if getattr(_memos, 'primitives', None) is not None:
+        # Already sharing subtrees in an enclosing call.
+        yield
+        return
+    _memos.primitives = (mode, {})
+    try:
+        yield
+    finally:
+        _memos.primitives = None
+
+
+@contextmanager
+def _shared_instances_memo():
+    if getattr(_memos, 'instances', None) is not None:
+        yield
+        return
+    _memos.instances = {}
+    try:
+        yield
+    finally:
+        _memos.instances = None
+
+
+def _memoized_from_dict(klass, dict_):
+    """
+    Construct ``klass`` from ``dict_``, reusing the instance constructed from
+    the same dict object in an enclosing ``_shared_instances_memo``.
+    """
+    memo = getattr(_memos, 'instances', None)
+    if memo is None:
+        return klass.from_dict(dict_)
+    key = (klass, id(dict_))
+    try:
+        # The memo holds a reference to dict_, so its id can't be reused.
+        return memo[key][1]
+    except KeyError:
+        instance = klass.from_dict(dict_)
+        memo[key] = (dict_, instance)
+        return instance
+
 
 @to_primitive.register(Serializable)
 def _serializable_to_primitive(s):
-    return s.to_dict()
+    state = getattr(_memos, 'primitives', None)
+    if state is None:
+        return s.to_dict()
+
+    mode, memo = state
+    if mode == 'identity':
+        try:
+            # The memo holds a reference to s, so its id can't be reused.
+            return memo[id(s)][1]
+        except KeyError:
+            dict_ = s.to_dict()
+            memo[id(s)] = (s, dict_)
+            return dict_
+
+    dict_ = s.to_dict()
+    return memo.setdefault((type(s), _structural_key(dict_)), dict_)
+
+
+def _structural_key(obj):
+    """
+    Build a hashable key for a tree of primitives.  Trees have equal keys
+    only if they are equal and have the same types throughout, including the
+    types of dict keys.
+    """
+    if isinstance(obj, dict):
+        return dict, frozenset(
+            (type(k), k, _structural_key(v)) for k, v in iteritems(obj)
+        )
+    elif isinstance(obj, list):
+        return list, tuple(_structural_key(v) for v in obj)
+    elif isinstance(obj, float):
+        # Keep -0.0 and 0.0 apart.
+        return float, repr(obj)
+    return type(obj), obj
+
+
+def _element_trait(trait, key):
+    if isinstance(trait, Dict):
+        value_trait, per_key_traits = trait._value_traits()
+        return per_key_traits.get(key, value_trait)
+    elif isinstance(trait, Tuple):
+        traits = getattr(trait, '_traits', None) or ()
+        return traits[key] if key < len(traits) else None
+    return getattr(trait, '_trait', None)
+
+
+def _masked_element_to_primitive(trait, value, include, exclude):
+    if value is None:
+        return None
+    elif include is None and exclude is None:
+        return _element_to_primitive(trait, value)
+    return _masked_to_primitive(trait, value, include, exclude)
+
+
+def _masked_to_primitive(trait, value, include, exclude):
+    """
+    Convert ``value`` to a primitive, applying masks.
+
+    Nested Serializables in lists, tuples, and dicts are converted with the
+    masks applied, so omitted subtrees are never converted.  Other values are
+    converted in full and then pruned.
+    """
+    if isinstance(value, Serializable):
+        return value._masked_to_dict(include, exclude)
+    elif isinstance(value, (list, tuple)):
+        out = []
+        for i, element in enumerate(value):
+            keep, inc, exc = descend(include, exclude, str(i))
+            if keep:
+                out.append(_masked_element_to_primitive(
+                    _element_trait(trait, i), element, inc, exc,
+                ))
+        return out
+    elif isinstance(value, dict):
+        out = {}
+        for key, element in iteritems(value):
+            keep, inc, exc = descend(include, exclude, _key_string(key))
+            if keep:
+                out[to_primitive(key)] = _masked_element_to_primitive(
+                    _element_trait(trait, key), element, inc, exc,
+                )
+        return out
+
+    if isinstance(trait, SerializableTrait):
+        primitive = trait.to_primitive(value)
+    else:
+        primitive = to_primitive(value)
+    return prune(primitive, include, exclude)
+
+
+def _after_last_none(layers):
+    for i in range(len(layers) - 1, -1, -1):
+        if layers[i] is None:
+            return layers[i + 1:]
+    return layers
+
+
+def _merge_extend_sequence(layers):
+    out = []
+    for layer in layers:
+        out.extend(layer)
+    return out
+
+
+def _merge_extend_dict(layers):
+    out = {}
+    for layer in layers:
+        out.update(layer)
+    return out
+
+
+class _Unset(object):
+    """
+    Placeholder for traits without a value in pickled Serializables.
+    """
+    def __reduce__(self):
+        # Pickle by reference, so that unpickling yields the singleton.
+        return '_UNSET'
+
+    def __repr__(self):
+        return '<unset>'
+
+
+_UNSET = _Unset()
+
+
+def _pickle_buffer_type():
+    # Imported lazily: pickle is always loaded by the time we're pickling or
+    # unpickling, but we don't want to import it on startup.
+    import pickle
+    return getattr(pickle, 'PickleBuffer', None)  # Python >= 3.8
+
+
+def _pickle_schema(cls):
+    """
+    Get a digest of the traits of ``cls``, used to reject pickles of
+    instances of an older version of ``cls``.
+
+    Nested Serializables are pickled with digests of their own classes.  The
+    digest is cached in the class's trait table.
+    """
+    cache = cls._trait_table.cache
+    try:
+        return cache['pickle_schema']
+    except KeyError:
+        import hashlib
+        from .file_cache import _class_schema
+        description, _ = _class_schema(cls)
+        digest = cache['pickle_schema'] = hashlib.sha256(
+            description.encode('utf-8'),
+        ).hexdigest()[:16]
+        return digest
+
+
+def _unpickle_serializable(cls, schema, values):
+    """
+    Reconstruct a Serializable pickled by ``Serializable.__reduce_ex__``.
+    """
+    if schema != _pickle_schema(cls):
+        raise TypeError(
+            "Can't unpickle {type}: its traits have changed since it was "
+            "pickled.".format(type=cls.__name__)
+        )
+    # Like _from_trusted_dict, skip __init__ and validation: these values
+    # came from an existing instance.
+    self = cls.__new__(cls)
+    trait_values = self._trait_values
+    for name, value in zip(cls._trait_table.names, values):
+        if value is not _UNSET:
+            trait_values[name] = value
+    return self
+
+
+class _OutOfBandValue(object):
+    """
+    Wrapper for a binary trait value that is pickled as an out-of-band
+    buffer, recording its type so that unpickling can rebuild it.
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __reduce_ex__(self, protocol):
+        value = self.value
+        return (
+            _unpickle_out_of_band_value,
+            (type(value), _pickle_buffer_type()(value)),
+        )
+
+
+def _unpickle_out_of_band_value(type_, buffer):
+    # Out-of-band buffers are handed back as whatever the caller passed to
+    # pickle.loads, which may be a PickleBuffer or a view of another type.
+    if type(buffer) is type_:
+        return buffer
+    return type_(memoryview(buffer))
+
+
+#: Minimum size, in bytes, of binary trait values that are offered as
+#: out-of-band buffers when pickling with protocol 5.  Smaller values are
+#: pickled in-band, where wrapping them would only add overhead.
+PICKLE_BUFFER_MIN_SIZE = 1024
+
+
+def _pickle_value(value, protocol):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        if protocol >= 5:
+            if isinstance(value, memoryview):
+                size = value.nbytes
+            else:
+                size = len(value)
+            if (size >= PICKLE_BUFFER_MIN_SIZE and
+                    _pickle_buffer_type() is not None):
+                # Allow large binary values to be sent out-of-band.
+                return _OutOfBandValue(value)
+        if isinstance(value, memoryview):
+            # memoryviews can't be pickled directly.
+            return value.tobytes()
+    return value
 
 
 class StrictSerializable(Serializable):
@@ -271,3 +1553,27 @@ class StrictSerializable(Serializable):
     def __init__(self, **metadata):
         super(StrictSerializable, self).__init__(**metadata)
         self.validate_all_attributes()
+
+    def update(self, **changes):
+        """
+        Set multiple traits at once.
+
+        As with ``Serializable.update``, new values are validated as they are
+        set, and cross-validators of the changed traits run once all values
+        have been set.  Cross-validators registered for unchanged traits are
+        rerun as well, since they may check constraints against the changed
+        traits.  Unchanged values are not otherwise revalidated, since they
+        were validated on construction.  If any validation fails, all of the
+        changes are rolled back.
+        """
+        with self.hold_trait_notifications():
+            super(StrictSerializable, self).update(**changes)
+            trait_values = self._trait_values
+            traits = self._trait_table.traits
+            for name in self._trait_validators:
+                if name in changes or name not in trait_values:
+                    continue
+                old = trait_values[name]
+                new = traits[name]._cross_validate(self, old)
+                if new is not old:
+                    self.set_trait(name, new)
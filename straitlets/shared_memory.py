@@ -0,0 +1,219 @@
+"""
+Distribution of Serializables to worker processes through shared memory.
+
+A parent process serializes a config once with ``to_shared_memory``, and any
+number of workers read it with ``from_shared_memory`` by name, without the
+parent encoding a copy for each worker.
+
+If a ``key`` is passed when writing, an HMAC-SHA256 of the class name and
+the stored payload bytes is stored alongside the payload.  Readers passing
+the same key check the HMAC against the raw bytes in the segment before
+parsing, and then construct the config without revalidation or
+re-encoding.
+
+Segment lifetime is managed by the creator: call ``unlink_shared_memory``
+(or use the ``shared_config`` context manager) once workers have read the
+config.
+"""
+import sys
+
+if sys.version_info < (3, 8):  # pragma: no cover
+    # raise a more explicit error message if this is imported without
+    # multiprocessing.shared_memory.
+    raise ImportError('%s requires Python 3.8' % __name__)
+
+# noqa on the imports because they are not at the top of the module. We
+# cannot import these until we know that multiprocessing.shared_memory
+# exists.
+from contextlib import contextmanager  # noqa
+import hashlib  # noqa
+import hmac  # noqa
+import json  # noqa
+from multiprocessing.shared_memory import SharedMemory  # noqa
+import struct  # noqa
+
+from .compat import ensure_bytes  # noqa
+
+_MAGIC = b'STRL'
+_FORMAT_VERSION = 2
+# magic, format version, token length, payload length
+_HEADER = struct.Struct('<4sBII')
+
+# Before Python 3.13, attaching to a segment registers it with the
+# resource tracker, which unlinks it when the tracker exits.  Processes
+# started by multiprocessing share their parent's tracker, so this only
+# matters for unrelated processes, which should unregister the segment
+# themselves.
+_ATTACH_KWARGS = {'track': False} if sys.version_info >= (3, 13) else {}
+
+
+def _payload_mac(cls, key):
+    # The class name is authenticated along with the payload so that a
+    # segment written for one class can't be trusted by another with
+    # compatible fields.
+    return hmac.new(
+        ensure_bytes(key),
+        ensure_bytes('%s.%s\n' % (cls.__module__, cls.__name__)),
+        hashlib.sha256,
+    )
+
+
+def _encode(instance, key, skip):
+    dict_ = instance.to_dict(skip=skip)
+    payload = json.dumps(dict_, separators=(',', ':')).encode('utf-8')
+    if key is None:
+        token = b''
+    else:
+        mac = _payload_mac(type(instance), key)
+        mac.update(payload)
+        token = mac.digest()
+    return (
+        _HEADER.pack(_MAGIC, _FORMAT_VERSION, len(token), len(payload)) +
+        token +
+        payload
+    )
+
+
+def write_shared_memory(instance, name=None, key=None, skip=()):
+    """
+    Write ``instance`` to a new shared memory segment.
+
+    Parameters
+    ----------
+    instance : Serializable
+        The object to write.
+    name : str, optional
+        Name of the segment to create.  If not passed, a unique name is
+        generated.
+    key : bytes or unicode, optional
+        If passed, store an HMAC token so readers with the same key can skip
+        revalidation.
+    skip : tuple[str], optional
+        Names of traits to omit.
+
+    Returns
+    -------
+    shm : multiprocessing.shared_memory.SharedMemory
+        The created segment.  The caller is responsible for calling
+        ``shm.close()`` and ``shm.unlink()``.
+    """
+    data = _encode(instance, key, skip)
+    shm = SharedMemory(name=name, create=True, size=len(data))
+    try:
+        shm.buf[:len(data)] = data
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    return shm
+
+
+def read_shared_memory(cls, name, key=None):
+    """
+    Read an instance of ``cls`` from the shared memory segment ``name``.
+
+    Parameters
+    ----------
+    cls : type
+        Serializable subclass to construct.
+    name : str
+        Name of the segment written by ``write_shared_memory``.
+    key : bytes or unicode, optional
+        Key passed to ``write_shared_memory``.  If the stored HMAC matches,
+        the instance is constructed without revalidation.
+    """
+    shm = SharedMemory(name=name, **_ATTACH_KWARGS)
+    try:
+        buf = shm.buf
+        try:
+            trusted, payload = _read_payload(cls, buf, key)
+            dict_ = json.loads(payload)
+        finally:
+            del buf
+    except ValueError as e:
+        raise ValueError(
+            "Shared memory segment %r does not contain a valid serialized "
+            "%s: %s" % (name, cls.__name__, e)
+        )
+    finally:
+        shm.close()
+
+    if trusted:
+        return cls._from_trusted_dict(dict_)
+    return cls.from_dict(dict_)
+
+
+def _read_payload(cls, buf, key):
+    """
+    Read the payload from a segment, checking its HMAC against ``key``.
+
+    Returns
+    -------
+    trusted : bool
+        Whether the payload was authenticated.
+    payload : bytes
+        The encoded payload.
+    """
+    if len(buf) < _HEADER.size:
+        raise ValueError('segment is too small')
+    magic, version, token_len, payload_len = _HEADER.unpack_from(buf)
+    if magic != _MAGIC or version != _FORMAT_VERSION:
+        raise ValueError('bad header')
+    start = _HEADER.size + token_len
+    end = start + payload_len
+    if end > len(buf):
+        raise ValueError('payload is truncated')
+
+    payload = buf[start:end]
+    try:
+        trusted = False
+        if token_len and key is not None:
+            # Authenticate the raw bytes in place, before parsing.
+            mac = _payload_mac(cls, key)
+            mac.update(payload)
+            trusted = hmac.compare_digest(
+                mac.digest(),
+                bytes(buf[_HEADER.size:start]),
+            )
+        return trusted, bytes(payload)
+    finally:
+        # Views of the segment must be released before it can be closed.
+        payload.release()
+
+
+def unlink_shared_memory(name):
+    """
+    Remove the shared memory segment ``name``.
+
+    Workers that have already read the segment are unaffected.
+    """
+    shm = SharedMemory(name=name)
+    shm.close()
+    shm.unlink()
+
+
+@contextmanager
+def shared_config(instance, name=None, key=None, skip=()):
+    """
+    Context manager that writes ``instance`` to shared memory and removes
+    the segment on exit.
+
+    Yields
+    ------
+    name : str
+        The name of the segment, to pass to workers.
+    """
+    shm = write_shared_memory(instance, name=name, key=key, skip=skip)
+    try:
+        yield shm.name
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+__all__ = [
+    'read_shared_memory',
+    'shared_config',
+    'unlink_shared_memory',
+    'write_shared_memory',
+]
@@ -31,8 +31,9 @@ def check_attributes(obj, attrs):
 
 def assert_serializables_equal(left, right, skip=()):
     assert type(left) == type(right)
-    assert set(left.trait_names()) == set(right.trait_names())
-    for name in left.trait_names():
+    table = left._trait_table
+    assert table.name_set == right._trait_table.name_set
+    for name in table.names:
         if name in skip:
             continue
         left_attr = getattr(left, name)
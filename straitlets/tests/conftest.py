@@ -1,6 +1,12 @@
 import os
+import sys
+
 from ..test_utils import multifixture
 
+# test_aio.py uses syntax and asyncio APIs that aren't available before
+# Python 3.7.
+collect_ignore = ['test_aio.py'] if sys.version_info < (3, 7) else []
+
 
 def _roundtrip_to_dict(traited, skip=()):
     return type(traited).from_dict(traited.to_dict(skip=skip))
@@ -0,0 +1,148 @@
+"""
+Tests for the asyncio helpers.
+
+This module uses Python 3.7 syntax and APIs, so conftest.py skips collecting
+it on older versions.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import pytest
+
+from straitlets import Serializable, Integer, Unicode
+from straitlets.test_utils import assert_serializables_equal
+
+
+class Point(Serializable):
+    x = Integer().example(1)
+    y = Integer().example(2)
+    label = Unicode().example('origin')
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_afrom_yaml_file(tmpdir):
+    expected = Point(x=3, y=4, label='p')
+    path = tmpdir.join('point.yml').strpath
+    expected.to_yaml_file(path)
+
+    async def main():
+        return await Point.afrom_yaml_file(path)
+
+    assert_serializables_equal(run(main()), expected)
+
+
+def test_afrom_json_file(tmpdir):
+    expected = Point(x=3, y=4, label='p')
+    path = tmpdir.join('point.json')
+    path.write(expected.to_json())
+
+    async def main():
+        return await Point.afrom_json_file(path.strpath)
+
+    assert_serializables_equal(run(main()), expected)
+
+
+def test_ato_yaml_file(tmpdir):
+    expected = Point(x=3, y=4, label='p')
+    path = tmpdir.join('point.yml').strpath
+
+    async def main():
+        await expected.ato_yaml_file(path, skip=('label',))
+
+    run(main())
+    with open(path) as f:
+        assert 'label' not in f.read()
+    result = Point.from_yaml_file(path)
+    assert_serializables_equal(result, expected, skip=('label',))
+
+
+def test_awrite_example_yaml(tmpdir):
+    path = tmpdir.join('example.yml').strpath
+
+    async def main():
+        await Point.awrite_example_yaml(path)
+
+    run(main())
+    assert_serializables_equal(
+        Point.from_yaml_file(path),
+        Point.example_instance(),
+    )
+
+
+def test_requires_running_loop(tmpdir):
+    path = tmpdir.join('point.yml').strpath
+    with pytest.raises(RuntimeError):
+        Point.afrom_yaml_file(path)
+
+
+def test_configurable_executor(tmpdir):
+    from straitlets import aio
+
+    path = tmpdir.join('point.yml').strpath
+    Point.example_instance().to_yaml_file(path)
+
+    thread_names = []
+
+    def record_thread(path):
+        thread_names.append(threading.current_thread().name)
+        return Point.from_yaml_file(path)
+
+    async def main(**kwargs):
+        return await aio.run_in_executor(record_thread, path, **kwargs)
+
+    with ThreadPoolExecutor(1, thread_name_prefix='explicit') as executor:
+        run(main(executor=executor))
+
+    with ThreadPoolExecutor(1, thread_name_prefix='default') as executor:
+        aio.set_default_executor(executor)
+        try:
+            assert aio.get_default_executor() is executor
+            run(main())
+        finally:
+            aio.set_default_executor(None)
+
+    assert thread_names[0].startswith('explicit')
+    assert thread_names[1].startswith('default')
+
+
+def test_load_many(tmpdir):
+    from straitlets.aio import load_many
+
+    expected = [Point(x=i, y=-i, label=str(i)) for i in range(10)]
+    paths = []
+    for i, point in enumerate(expected):
+        path = tmpdir.join('%d.yml' % i).strpath
+        point.to_yaml_file(path)
+        paths.append(path)
+
+    lock = threading.Lock()
+    in_flight = [0, 0]  # current, max
+
+    def loader(path):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        try:
+            return Point.from_yaml_file(path)
+        finally:
+            with lock:
+                in_flight[0] -= 1
+
+    with ThreadPoolExecutor(8) as executor:
+        results = run(load_many(loader, paths, limit=2, executor=executor))
+
+    assert in_flight[1] <= 2
+    assert len(results) == len(expected)
+    for result, point in zip(results, expected):
+        assert_serializables_equal(result, point)
+
+    with pytest.raises(ValueError):
+        run(load_many(loader, paths, limit=0))
@@ -1,9 +1,10 @@
 # encoding: utf-8
+import binascii
 import sys
 
 import pytest
 
-from ..compat import ensure_bytes, ensure_unicode
+from ..compat import b64decode_strict, ensure_bytes, ensure_unicode
 
 
 def test_ensure_bytes():
@@ -30,6 +31,15 @@ def test_ensure_unicode():
         ensure_unicode(1)
 
 
+def test_b64decode_strict():
+    assert b64decode_strict(u'YWJjZA==') == b'abcd'
+    assert b64decode_strict(b'') == b''
+
+    for bad in (u'user:pass', u'key=value', b'YWJj ZA==', u'YWJjZA'):
+        with pytest.raises(binascii.Error):
+            b64decode_strict(bad)
+
+
 @pytest.mark.skipif(
     sys.version_info.major > 2,
     reason='we can import straitlets.py3 in Python 3',
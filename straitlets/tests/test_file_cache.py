@@ -0,0 +1,229 @@
+"""
+Tests for straitlets.file_cache.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+from straitlets import (
+    Bytes,
+    Instance,
+    Integer,
+    List,
+    Serializable,
+    Set,
+    Unicode,
+)
+from straitlets.file_cache import schema_fingerprint
+from straitlets.test_utils import assert_serializables_equal
+
+
+class Inner(Serializable):
+    x = Integer()
+
+
+class Cached(Serializable):
+    name = Unicode()
+    inner = Instance(Inner)
+    values = List(trait=Integer())
+
+    loads = []
+
+    @classmethod
+    def from_dict(cls, dict_):
+        cls.loads.append(dict_)
+        return super(Cached, cls).from_dict(dict_)
+
+
+def _entries(cache_dir):
+    return sorted(
+        name for name in os.listdir(cache_dir) if not name.endswith('.tmp')
+    )
+
+
+def test_from_yaml_file_cache(tmpdir):
+    cache_dir = tmpdir.join('cache').strpath
+    path = tmpdir.join('config.yml').strpath
+    expected = Cached(name=u'a', inner=Inner(x=1), values=[1, 2])
+    expected.to_yaml_file(path)
+
+    del Cached.loads[:]
+    first = Cached.from_yaml_file(path, cache_dir=cache_dir)
+    assert len(Cached.loads) == 1
+    assert len(_entries(cache_dir)) == 1
+
+    second = Cached.from_yaml_file(path, cache_dir=cache_dir)
+    assert len(Cached.loads) == 1
+    assert second is not first
+    assert second.to_dict() == expected.to_dict()
+    assert isinstance(second.inner, Inner)
+
+    # Changing the file replaces its entry.
+    old_entries = _entries(cache_dir)
+    Cached(name=u'b', inner=Inner(x=2), values=[]).to_yaml_file(path)
+    assert Cached.from_yaml_file(path, cache_dir=cache_dir).name == u'b'
+    assert len(Cached.loads) == 2
+    assert len(_entries(cache_dir)) == 1
+    assert _entries(cache_dir) != old_entries
+
+    # Other files have their own entries.
+    other_path = tmpdir.join('other.yml').strpath
+    expected.to_yaml_file(other_path)
+    Cached.from_yaml_file(other_path, cache_dir=cache_dir)
+    assert len(_entries(cache_dir)) == 2
+    assert len(Cached.loads) == 3
+
+    # Without a cache directory, the file is always parsed.
+    Cached.from_yaml_file(path)
+    assert len(Cached.loads) == 4
+
+
+def test_from_json_file_cache(tmpdir):
+    cache_dir = tmpdir.join('cache').strpath
+    path = tmpdir.join('config.json')
+    expected = Inner(x=5)
+    path.write(expected.to_json())
+
+    for _ in range(2):
+        result = Inner.from_json_file(path.strpath, cache_dir=cache_dir)
+        assert_serializables_equal(result, expected)
+    assert len(_entries(cache_dir)) == 1
+
+
+def test_corrupt_cache_entry(tmpdir):
+    cache_dir = tmpdir.join('cache').strpath
+    path = tmpdir.join('config.yml').strpath
+    Inner(x=3).to_yaml_file(path)
+    Inner.from_yaml_file(path, cache_dir=cache_dir)
+
+    entry, = _entries(cache_dir)
+    with open(os.path.join(cache_dir, entry), 'wb') as f:
+        f.write(b'garbage')
+
+    assert Inner.from_yaml_file(path, cache_dir=cache_dir).x == 3
+    with open(os.path.join(cache_dir, entry), 'rb') as f:
+        assert f.read() != b'garbage'
+
+
+def test_cache_read_errors_propagate(tmpdir, monkeypatch):
+    from straitlets import file_cache
+
+    cache_dir = tmpdir.join('cache').strpath
+    path = tmpdir.join('config.yml').strpath
+    Inner(x=1).to_yaml_file(path)
+    Inner.from_yaml_file(path, cache_dir=cache_dir)
+
+    def broken_load(f):
+        raise RuntimeError('bug in unpickling')
+
+    # Bugs in unpickling aren't hidden as cache misses.
+    monkeypatch.setattr(file_cache.pickle, 'load', broken_load)
+    with pytest.raises(RuntimeError):
+        Inner.from_yaml_file(path, cache_dir=cache_dir)
+
+
+def test_version_change_replaces_entries(tmpdir, monkeypatch):
+    import straitlets
+
+    cache_dir = tmpdir.join('cache').strpath
+    path = tmpdir.join('config.yml').strpath
+    Cached(name=u'a', inner=Inner(x=1), values=[]).to_yaml_file(path)
+
+    del Cached.loads[:]
+    Cached.from_yaml_file(path, cache_dir=cache_dir)
+    old_entries = _entries(cache_dir)
+
+    monkeypatch.setattr(straitlets, '__version__', 'other')
+    assert Cached.from_yaml_file(path, cache_dir=cache_dir).name == u'a'
+    assert len(Cached.loads) == 2
+    assert len(_entries(cache_dir)) == 1
+    assert _entries(cache_dir) != old_entries
+
+
+def test_failed_write_leaves_no_entry(tmpdir, monkeypatch):
+    from straitlets import file_cache
+
+    cache_dir = tmpdir.join('cache').strpath
+    path = tmpdir.join('config.yml').strpath
+    Inner(x=1).to_yaml_file(path)
+
+    def broken_dump(value, f, protocol):
+        f.write(b'partial')
+        raise IOError('disk full')
+
+    monkeypatch.setattr(file_cache.pickle, 'dump', broken_dump)
+    with pytest.raises(IOError):
+        Inner.from_yaml_file(path, cache_dir=cache_dir)
+    assert os.listdir(cache_dir) == []
+
+
+def test_prune_ignores_removed_entries(tmpdir, monkeypatch):
+    from straitlets import file_cache
+
+    cache_dir = tmpdir.join('cache').strpath
+    path = tmpdir.join('config.yml').strpath
+    Inner(x=1).to_yaml_file(path)
+    Inner.from_yaml_file(path, cache_dir=cache_dir)
+    stale, = _entries(cache_dir)
+
+    def unlink(path):
+        # Simulate a concurrent writer removing the entry first.
+        raise OSError('already removed')
+
+    Inner(x=2).to_yaml_file(path)
+    monkeypatch.setattr(file_cache.os, 'unlink', unlink)
+    assert Inner.from_yaml_file(path, cache_dir=cache_dir).x == 2
+    assert stale in _entries(cache_dir)
+    assert len(_entries(cache_dir)) == 2
+
+
+def test_schema_fingerprint_describes_parameters():
+
+    def make_class(default):
+
+        class Params(Serializable):
+            raw = Bytes(default_value=default)
+            tags = Set(default_value={u'a', u'b'})
+            checked = Unicode().tag(check=len)
+            inner = Instance(Inner)
+            cached = Instance(Cached)
+
+        return Params
+
+    fingerprint = schema_fingerprint(make_class(b'x'))
+    assert schema_fingerprint(make_class(b'x')) == fingerprint
+    assert schema_fingerprint(make_class(b'y')) != fingerprint
+
+
+def test_schema_fingerprint():
+    fingerprint = schema_fingerprint(Cached)
+    assert schema_fingerprint(Cached) == fingerprint
+
+    class Changed(Serializable):
+        x = Integer(default_value=1)
+
+    before = schema_fingerprint(Changed)
+    Changed.y = Unicode()
+    assert schema_fingerprint(Changed) != before
+
+    # Changes to nested classes change the fingerprint.
+    Inner.y = Integer()
+    try:
+        assert schema_fingerprint(Cached) != fingerprint
+    finally:
+        del Inner.y
+
+
+def test_schema_fingerprint_is_stable_across_processes():
+    statement = (
+        'from straitlets.builtin_models import MongoConfig;'
+        'from straitlets.file_cache import schema_fingerprint;'
+        'print(schema_fingerprint(MongoConfig))'
+    )
+    outputs = {
+        subprocess.check_output([sys.executable, '-c', statement])
+        for _ in range(2)
+    }
+    assert len(outputs) == 1
@@ -0,0 +1,86 @@
+"""
+Import-time budget for ``import straitlets``.
+"""
+import subprocess
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (3, 7),
+    reason='-X importtime requires Python 3.7',
+)
+
+# Modules that should only be imported when first needed.
+DEFERRED_MODULES = frozenset([
+    'base64',
+    'click',
+    'pickle',
+    'json',
+    'straitlets._aio',
+    'straitlets.aio',
+    'straitlets.builtin_models',
+    'straitlets.file_cache',
+    'straitlets.instrumentation',
+    'straitlets.projection',
+    'straitlets.registry',
+    'straitlets.shared_memory',
+    'textwrap',
+    'yaml',
+])
+
+# Budget, in microseconds, for time spent in straitlets' own modules,
+# excluding their dependencies.  This is deliberately generous so that the
+# test only fails on gross regressions, e.g. doing real work at import time.
+SELF_TIME_BUDGET_US = 50000
+
+
+def _importtime(statement):  # pragma: no cover
+    """
+    Run ``statement`` in a fresh interpreter with ``-X importtime`` and return
+    a dict from module name to (self time, cumulative time) in microseconds.
+    """
+    proc = subprocess.Popen(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    _, stderr = proc.communicate()
+    assert proc.returncode == 0, stderr
+
+    out = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():
+            # Header line.
+            continue
+        out[name.strip()] = (int(self_us), int(cumulative_us))
+    return out
+
+
+def test_deferred_imports():  # pragma: no cover
+    imported = _importtime('import straitlets')
+    assert 'straitlets' in imported
+    assert not DEFERRED_MODULES & set(imported)
+
+
+def test_import_time_budget():  # pragma: no cover
+    imported = _importtime('import straitlets')
+    self_time = sum(
+        self_us for name, (self_us, _) in imported.items()
+        if name == 'straitlets' or name.startswith('straitlets.')
+    )
+    assert self_time < SELF_TIME_BUDGET_US
+
+
+def test_codecs_load_on_first_use():  # pragma: no cover
+    imported = _importtime(
+        'import straitlets\n'
+        'class C(straitlets.Serializable):\n'
+        '    x = straitlets.Integer()\n'
+        'C.from_yaml(C(x=1).to_yaml())\n'
+    )
+    assert 'yaml' in imported
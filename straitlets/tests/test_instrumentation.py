@@ -0,0 +1,207 @@
+"""
+Tests for straitlets.instrumentation.
+"""
+import pytest
+
+from traitlets import TraitError
+
+from straitlets import instrumentation
+from straitlets.builtin_models import PostgresConfig
+from straitlets.serializable import Serializable, StrictSerializable
+from straitlets.traits import Dict, Instance, Integer, Unicode
+
+
+class Inner(Serializable):
+    x = Integer()
+
+
+class Outer(Serializable):
+    name = Unicode()
+    inner = Instance(Inner)
+    extra = Dict()
+
+
+@pytest.fixture
+def outer():
+    return Outer(name=u'outer', inner=Inner(x=1), extra={u'a': 1})
+
+
+@pytest.fixture(autouse=True)
+def ensure_disabled():
+    yield
+    instrumentation.disable()
+    instrumentation.stats.reset()
+
+
+def test_disabled_by_default_and_restores_methods():
+    originals = {
+        name: Serializable.__dict__[name]
+        for name in instrumentation.INSTRUMENTED_METHODS
+        if name in Serializable.__dict__
+    }
+    assert not instrumentation.is_enabled()
+
+    instrumentation.enable()
+    assert instrumentation.is_enabled()
+    for name, original in originals.items():
+        assert Serializable.__dict__[name] is not original
+
+    # Enabling twice is a no-op.
+    instrumentation.enable()
+
+    instrumentation.disable()
+    assert not instrumentation.is_enabled()
+    for name, original in originals.items():
+        assert Serializable.__dict__[name] is original
+
+
+def test_nothing_recorded_when_disabled(outer):
+    Outer.from_json(outer.to_json())
+    assert instrumentation.stats.snapshot() == {}
+
+
+def test_records_per_class(outer):
+    with instrumentation.instrumented() as stats:
+        encoded = outer.to_json()
+        Outer.from_json(encoded)
+        outer.validate_all_attributes()
+
+    snapshot = stats.snapshot()
+    assert set(snapshot) == {Outer, Inner}
+
+    outer_stats = snapshot[Outer]
+    assert outer_stats['to_json'].calls == 1
+    assert outer_stats['to_json'].total_size == len(encoded)
+    assert outer_stats['from_json'].calls == 1
+    assert outer_stats['from_json'].total_size == len(encoded)
+    # to_json and from_json go through to_dict and from_dict.
+    assert outer_stats['to_dict'].calls == 1
+    assert outer_stats['to_dict'].total_size == 3
+    assert outer_stats['from_dict'].calls == 1
+    assert outer_stats['validate_all_attributes'].calls == 1
+    assert outer_stats['validate_all_attributes'].total_size == 0
+
+    for op_stats in outer_stats.values():
+        assert op_stats.total_time >= 0
+
+    assert snapshot[Inner]['to_dict'].calls == 1
+    assert snapshot[Inner]['from_dict'].calls == 1
+
+    # Snapshots are copies.
+    Outer.from_json(encoded)
+    assert stats.snapshot()[Outer]['from_json'].calls == 1
+
+
+def test_codecs(outer, tmpdir):
+    with instrumentation.instrumented() as stats:
+        Outer.from_base64(outer.to_base64())
+        Outer.from_yaml(outer.to_yaml())
+
+        path = tmpdir.join('outer.yml').strpath
+        outer.to_yaml_file(path)
+        Outer.from_yaml_file(path)
+
+    outer_stats = stats.snapshot()[Outer]
+    assert outer_stats['to_base64'].calls == 1
+    assert outer_stats['from_base64'].calls == 1
+    assert outer_stats['to_json'].calls == 1
+    assert outer_stats['from_json'].calls == 1
+    assert outer_stats['to_yaml'].calls == 2
+    assert outer_stats['from_yaml'].calls == 2
+    # Streams have no known size.
+    assert outer_stats['to_yaml'].total_size == len(outer.to_yaml())
+
+
+def test_hooks(outer):
+    calls = []
+
+    def hook(cls, operation, elapsed, size):
+        calls.append((cls, operation, size))
+
+    instrumentation.add_hook(hook)
+    try:
+        with instrumentation.instrumented():
+            outer.to_dict()
+    finally:
+        instrumentation.remove_hook(hook)
+
+    assert calls == [(Inner, 'to_dict', 1), (Outer, 'to_dict', 3)]
+
+    with instrumentation.instrumented():
+        outer.to_dict()
+    assert len(calls) == 2
+
+
+def test_instrumented_preserves_enabled_state(outer):
+    instrumentation.enable()
+    outer.to_dict()
+    with instrumentation.instrumented(reset=False) as stats:
+        outer.to_dict()
+    assert instrumentation.is_enabled()
+    assert stats.snapshot()[Outer]['to_dict'].calls == 2
+
+
+def test_keyword_arguments(outer):
+    dict_ = outer.to_dict()
+    with instrumentation.instrumented() as stats:
+        Outer.from_dict(dict_=dict_)
+        Outer.from_yaml(stream=outer.to_yaml())
+        outer.to_dict(skip=('extra',))
+
+    outer_stats = stats.snapshot()[Outer]
+    assert outer_stats['from_dict'].calls == 2
+    assert outer_stats['from_dict'].total_size == 6
+    assert outer_stats['from_yaml'].total_size == len(outer.to_yaml())
+    assert outer_stats['to_dict'].calls == 2
+
+
+def test_errors_are_recorded():
+    with instrumentation.instrumented() as stats:
+        with pytest.raises(TraitError):
+            Inner.from_dict({'x': u'not an int'})
+        with pytest.raises(TypeError):
+            Inner.from_json('{"y": 1}')
+        Inner.from_dict({'x': 1})
+
+    inner_stats = stats.snapshot()[Inner]
+    assert inner_stats['from_dict'] == instrumentation.OperationStats(
+        calls=3,
+        total_time=inner_stats['from_dict'].total_time,
+        total_size=3,
+        errors=2,
+    )
+    assert inner_stats['from_json'].errors == 1
+
+
+class StrictInner(StrictSerializable):
+    x = Integer()
+
+
+def test_subclass_overrides():
+    strict = StrictInner(x=1)
+    url = u'postgresql://user@localhost/db'
+
+    original = StrictSerializable.__dict__['update']
+    with instrumentation.instrumented() as stats:
+        assert StrictSerializable.__dict__['update'] is not original
+        strict.update(x=2)
+        PostgresConfig.from_url(url)
+
+    snapshot = stats.snapshot()
+    # The override and the base method it calls with super() are recorded
+    # once.
+    assert snapshot[StrictInner]['update'].calls == 1
+    assert snapshot[PostgresConfig]['from_url'].calls == 1
+    assert snapshot[PostgresConfig]['from_url'].total_size == len(url)
+    assert StrictSerializable.__dict__['update'] is original
+
+
+def test_recursive_calls_are_recorded():
+    class Tree(Serializable):
+        name = Unicode()
+        child = Instance(Serializable, allow_none=True)
+
+    tree = Tree(name=u'a', child=Tree(name=u'b', child=None))
+    with instrumentation.instrumented() as stats:
+        tree.to_dict()
+    assert stats.snapshot()[Tree]['to_dict'].calls == 2
@@ -0,0 +1,165 @@
+"""
+Tests for straitlets.masks and masked serialization.
+"""
+import json
+
+import yaml
+
+from straitlets import Serializable
+from straitlets.masks import compile_mask, descend, prune
+from straitlets.traits import Dict, Instance, Integer, List, Tuple, Unicode
+
+
+class Replica(Serializable):
+    host = Unicode()
+    port = Integer()
+    ssl_ca_certs = Unicode(allow_none=True)
+
+
+class DB(Serializable):
+    user = Unicode()
+    password = Unicode()
+
+
+class Cluster(Serializable):
+    name = Unicode()
+    db = Instance(DB, allow_none=True)
+    replicas = List(trait=Instance(Replica))
+    by_region = Dict()
+    pair = Tuple()
+
+
+def make_cluster():
+    return Cluster(
+        name='c',
+        db=DB(user='u', password='secret'),
+        replicas=[
+            Replica(host='a', port=1, ssl_ca_certs='/a.pem'),
+            Replica(host='b', port=2, ssl_ca_certs=None),
+        ],
+        by_region={'east': {'host': 'e', 'token': 't'}, 'west': {}},
+        pair=({'token': 'x', 'id': 1}, 2),
+    )
+
+
+def test_compile_mask_is_cached():
+    mask = compile_mask(('db.password', 'replicas.*.host'))
+    assert compile_mask(('db.password', 'replicas.*.host')) is mask
+    assert set(mask.children) == {'db', 'replicas'}
+    assert mask.children['db'].children['password'].terminal
+    assert not mask.children['db'].terminal
+
+
+def test_wildcards_merge_with_exact_keys():
+    mask = compile_mask(('*.a', 'x.b'))
+    node = mask.child('x')
+    assert set(node.children) == {'a', 'b'}
+    assert mask.child('x') is node
+    assert set(mask.child('y').children) == {'a'}
+    assert descend(None, mask, 'x') == (True, None, node)
+    assert descend(mask, None, 'z')[0]
+    assert not descend(compile_mask(('a',)), None, 'z')[0]
+
+
+def test_prune():
+    obj = {'a': [{'b': 1, 'c': 2}, {'b': 3}], 'd': 4}
+    assert prune(obj, None, compile_mask(('a.*.b',))) == {
+        'a': [{'c': 2}, {}],
+        'd': 4,
+    }
+    assert prune(obj, compile_mask(('a.1',)), None) == {'a': [{'b': 3}]}
+    assert prune(obj, None, None) is obj
+    # The input isn't modified.
+    assert obj == {'a': [{'b': 1, 'c': 2}, {'b': 3}], 'd': 4}
+
+
+def test_skip_nested_paths():
+    cluster = make_cluster()
+    result = cluster.to_dict(
+        skip=('db.password', 'replicas.*.ssl_ca_certs', 'by_region.*.token',
+              'pair.0.token'),
+    )
+    assert result == {
+        'name': 'c',
+        'db': {'user': 'u'},
+        'replicas': [{'host': 'a', 'port': 1}, {'host': 'b', 'port': 2}],
+        'by_region': {'east': {'host': 'e'}, 'west': {}},
+        'pair': [{'id': 1}, 2],
+    }
+
+    # Top-level names behave as before.
+    assert set(cluster.to_dict(skip=['db', 'pair'])) == {
+        'name', 'replicas', 'by_region',
+    }
+    assert cluster.to_dict(skip=('replicas.1',))['replicas'] == [
+        {'host': 'a', 'port': 1, 'ssl_ca_certs': '/a.pem'},
+    ]
+
+
+def test_include_nested_paths():
+    cluster = make_cluster()
+    assert cluster.to_dict(include=('name', 'replicas.*.host')) == {
+        'name': 'c',
+        'replicas': [{'host': 'a'}, {'host': 'b'}],
+    }
+    assert cluster.to_dict(include=('db',), skip=('db.password',)) == {
+        'db': {'user': 'u'},
+    }
+    assert cluster.to_dict(include=()) == {}
+
+    # Masks through None values keep the None.
+    cluster.db = None
+    assert cluster.to_dict(include=('db.user',)) == {'db': None}
+
+
+def test_masked_to_json_and_yaml():
+    cluster = make_cluster()
+    kwargs = {'include': ('db', 'replicas'), 'skip': ('db.password',)}
+    expected = cluster.to_dict(**kwargs)
+    assert 'password' not in json.dumps(expected)
+
+    assert json.loads(cluster.to_json(**kwargs)) == expected
+    assert json.loads(cluster.to_json(canonical=True, **kwargs)) == expected
+    assert yaml.safe_load(cluster.to_yaml(**kwargs)) == expected
+    assert yaml.safe_load(
+        cluster.to_yaml(anchors='identity', **kwargs)
+    ) == expected
+
+
+def test_overlapping_wildcard_and_exact_masks():
+    mask = compile_mask(('a.*.x.p', 'a.b.x.q'))
+    node = mask.child('a').child('b')
+    assert set(node.children) == {'x'}
+    assert set(node.children['x'].children) == {'p', 'q'}
+
+    cluster = make_cluster()
+    cluster.by_region = {
+        'east': {'a': {'x': 1, 'y': 2, 'z': 3}},
+        'west': {'a': {'x': 4, 'y': 5, 'z': 6}},
+    }
+    assert cluster.to_dict(
+        skip=('by_region.*.a.x', 'by_region.east.a.y'),
+    )['by_region'] == {
+        'east': {'a': {'z': 3}},
+        'west': {'a': {'y': 5, 'z': 6}},
+    }
+    assert cluster.to_dict(
+        include=('by_region.*.a.x', 'by_region.east.a.y'),
+    ) == {
+        'by_region': {
+            'east': {'a': {'x': 1, 'y': 2}},
+            'west': {'a': {'x': 4}},
+        },
+    }
+
+
+def test_masks_through_scalars():
+    cluster = make_cluster()
+    cluster.pair = (None, 2, {'token': 'x', 'id': 1})
+
+    # Masks continuing below scalars and None keep the value.
+    assert cluster.to_dict(skip=('pair.*.token',))['pair'] == [
+        None, 2, {'id': 1},
+    ]
+    assert cluster.to_dict(include=('name.first',)) == {'name': 'c'}
+    assert prune(1, compile_mask(('a',)), None) == 1
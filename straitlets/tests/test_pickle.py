@@ -0,0 +1,208 @@
+"""
+Tests for pickling Serializables.
+"""
+import copy
+import pickle
+import sys
+
+import pytest
+from traitlets import validate
+
+from straitlets.serializable import Serializable, StrictSerializable
+from straitlets.test_utils import assert_serializables_equal
+from straitlets.traits import Bytes, Dict, Instance, Integer, List, Unicode
+
+
+class Leaf(Serializable):
+    x = Integer()
+    validations = []
+
+    @validate('x')
+    def _record_validation(self, proposal):
+        self.validations.append(proposal['value'])
+        return proposal['value']
+
+
+class Tree(StrictSerializable):
+    name = Unicode()
+    leaf = Instance(Leaf)
+    leaves = List(trait=Instance(Leaf))
+    data = Bytes()
+    meta = Dict(default_value={u'a': 1})
+    lazy = Integer()
+
+    def _lazy_default(self):
+        return 42
+
+
+class Changing(Serializable):
+    x = Integer()
+
+
+@pytest.fixture
+def tree():
+    return Tree(
+        name=u'tree',
+        leaf=Leaf(x=1),
+        leaves=[Leaf(x=2), Leaf(x=3)],
+        data=b'\x00' * 1024,
+    )
+
+
+def _check_tree(result, tree):
+    assert type(result) is Tree
+    assert result is not tree
+    assert result.to_dict() == tree.to_dict()
+    assert isinstance(result.leaves[0], Leaf)
+
+
+def _assert_trees_equal(result, tree):
+    assert_serializables_equal(result, tree, skip=('leaves',))
+    assert len(result.leaves) == len(tree.leaves)
+    for left, right in zip(result.leaves, tree.leaves):
+        assert_serializables_equal(left, right)
+
+
+@pytest.mark.parametrize('protocol', range(pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle_roundtrip(tree, protocol):
+    del Leaf.validations[:]
+    result = pickle.loads(pickle.dumps(tree, protocol=protocol))
+    _check_tree(result, tree)
+    assert Leaf.validations == []
+
+
+def test_pickle_is_compact(tree):
+    pickled = pickle.dumps(tree, protocol=2)
+    for internal in (b'_trait_values', b'_trait_notifiers',
+                     b'_cross_validation_lock'):
+        assert internal not in pickled
+
+    # The baseline HasTraits pickle includes the full instance state.
+    state_pickled = pickle.dumps(
+        (type(tree), tree.__getstate__()),
+        protocol=2,
+    )
+    assert len(pickled) < len(state_pickled)
+
+
+def test_unset_dynamic_defaults_stay_lazy():
+    tree = Tree.__new__(Tree)
+    tree.name = u'partial'
+    result = pickle.loads(pickle.dumps(tree))
+    assert 'lazy' not in result._trait_values
+    assert result.lazy == 42
+    assert result.name == u'partial'
+    assert result.meta == {u'a': 1}
+
+
+def test_unset_placeholder():
+    from straitlets.serializable import _UNSET
+
+    assert repr(_UNSET) == '<unset>'
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        assert pickle.loads(pickle.dumps(_UNSET, protocol)) is _UNSET
+
+
+def test_memoryview_values():
+    view = memoryview(b'abcdef')
+    tree = Tree.__new__(Tree)
+    tree.data = view
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        result = pickle.loads(pickle.dumps(tree, protocol=protocol))
+        assert bytes(result.data) == b'abcdef'
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 8),
+    reason='out-of-band buffers require pickle protocol 5',
+)
+def test_out_of_band_buffers(tree):  # pragma: no cover
+    buffers = []
+    pickled = pickle.dumps(tree, protocol=5, buffer_callback=buffers.append)
+    assert len(buffers) == 1
+    assert len(pickled) < 1024
+
+    result = pickle.loads(pickled, buffers=buffers)
+    _check_tree(result, tree)
+    _assert_trees_equal(result, tree)
+    result = pickle.loads(pickled, buffers=[b.raw() for b in buffers])
+    _assert_trees_equal(result, tree)
+
+    # Values are rebuilt as their original types.
+    for data in (bytearray(tree.data), memoryview(tree.data)):
+        tree.data = data
+        buffers = []
+        pickled = pickle.dumps(
+            tree,
+            protocol=5,
+            buffer_callback=buffers.append,
+        )
+        result = pickle.loads(pickled, buffers=buffers)
+        assert type(result.data) is type(data)
+        assert bytes(result.data) == bytes(data)
+
+    # Without a buffer_callback, the buffer is pickled in-band.
+    tree.data = bytearray(b'\x01' * 1024)
+    result = pickle.loads(pickle.dumps(tree, protocol=5))
+    _assert_trees_equal(result, tree)
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 8),
+    reason='out-of-band buffers require pickle protocol 5',
+)
+def test_small_buffers_stay_in_band(tree):  # pragma: no cover
+    from straitlets.serializable import PICKLE_BUFFER_MIN_SIZE
+
+    for data in (b'key', bytearray(b'key'), memoryview(b'key'),
+                 b'\x00' * (PICKLE_BUFFER_MIN_SIZE - 1)):
+        tree.data = data
+        buffers = []
+        pickled = pickle.dumps(
+            tree,
+            protocol=5,
+            buffer_callback=buffers.append,
+        )
+        assert buffers == []
+        assert b'PickleBuffer' not in pickled
+        result = pickle.loads(pickled)
+        assert bytes(result.data) == bytes(data)
+        if not isinstance(data, memoryview):
+            _assert_trees_equal(result, tree)
+
+
+def test_copy(tree):
+    shallow = copy.copy(tree)
+    _check_tree(shallow, tree)
+    assert shallow.leaf is tree.leaf
+
+    deep = copy.deepcopy(tree)
+    _check_tree(deep, tree)
+    assert deep.leaf is not tree.leaf
+
+
+def test_schema_change():
+    pickled = pickle.dumps(Leaf(x=1))
+
+    Leaf.y = Integer()
+    try:
+        with pytest.raises(TypeError):
+            pickle.loads(pickled)
+    finally:
+        del Leaf.y
+
+    # Changing the type of a trait is detected as well.
+    pickled = pickle.dumps(Changing(x=1))
+    Changing.x = Unicode()
+    try:
+        with pytest.raises(TypeError) as e:
+            pickle.loads(pickled)
+        assert 'Changing' in str(e.value)
+        assert 'changed since it was pickled' in str(e.value)
+    finally:
+        Changing.x = Integer()
+    assert pickle.loads(pickled).x == 1
+
+
+def test_strict_serializable_pickles(tree):
+    _assert_trees_equal(pickle.loads(pickle.dumps(tree)), tree)
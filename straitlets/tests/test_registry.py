@@ -0,0 +1,140 @@
+"""
+Tests for straitlets.registry.
+"""
+import sqlite3
+import threading
+
+import pytest
+
+from straitlets.builtin_models import PostgresConfig
+from straitlets.registry import ResourceRegistry
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_config(database='db'):
+    return PostgresConfig(username='user', database=database)
+
+
+def sqlite_factory(created):
+    def factory(config):
+        conn = sqlite3.connect(':memory:', check_same_thread=False)
+        created.append(conn)
+        return conn
+    return factory
+
+
+def is_closed(conn):
+    try:
+        conn.execute('SELECT 1')
+    except sqlite3.ProgrammingError:
+        return True
+    return False
+
+
+def test_shared_resource():
+    created = []
+    registry = ResourceRegistry(sqlite_factory(created))
+
+    # Equal configs share a resource, even if they're different objects.
+    same = PostgresConfig.from_url('postgresql://user@/db')
+    with registry.resource(make_config()) as first:
+        with registry.resource(same) as second:
+            assert first is second
+            assert registry.refcount(make_config()) == 2
+        with registry.resource(make_config('other')) as third:
+            assert third is not first
+
+    assert len(created) == 2
+    assert registry.refcount(make_config()) == 0
+    # No idle timeout: resources are kept until cleared.
+    assert make_config() in registry
+    assert not any(map(is_closed, created))
+
+    registry.clear()
+    assert len(registry) == 0
+    assert all(map(is_closed, created))
+
+
+def test_idle_eviction():
+    created = []
+    closed = []
+    clock = FakeClock()
+
+    def close(conn):
+        closed.append(conn)
+        conn.close()
+
+    registry = ResourceRegistry(
+        sqlite_factory(created),
+        close=close,
+        idle_timeout=10,
+        clock=clock,
+    )
+    config = make_config()
+
+    conn = registry.acquire(config)
+    clock.now = 100
+    # Referenced resources are never evicted.
+    assert registry.evict_idle() == 0
+
+    registry.release(config)
+    clock.now = 105
+    assert registry.evict_idle() == 0
+    # Reacquiring resets the idle timer.
+    assert registry.acquire(config) is conn
+    registry.release(config)
+
+    clock.now = 120
+    assert registry.evict_idle() == 1
+    assert closed == [conn]
+    assert is_closed(conn)
+
+    assert registry.acquire(config) is not conn
+    assert len(created) == 2
+
+
+def test_close_immediately():
+    created = []
+    registry = ResourceRegistry(sqlite_factory(created), idle_timeout=0)
+    with registry.resource(make_config()) as conn:
+        assert not is_closed(conn)
+    assert is_closed(conn)
+    assert len(registry) == 0
+
+
+def test_release_errors():
+    registry = ResourceRegistry(sqlite_factory([]))
+    with pytest.raises(ValueError):
+        registry.release(make_config())
+
+    registry.acquire(make_config())
+    registry.release(make_config())
+    with pytest.raises(ValueError):
+        registry.release(make_config())
+
+
+def test_concurrent_acquire():
+    created = []
+    registry = ResourceRegistry(sqlite_factory(created))
+    config = make_config()
+    results = []
+
+    def worker():
+        results.append(registry.acquire(config))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(created) == 1
+    assert all(r is created[0] for r in results)
+    assert registry.refcount(config) == 8
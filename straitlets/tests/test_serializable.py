@@ -8,7 +8,12 @@ import re
 from textwrap import dedent
 
 import pytest
-from traitlets import TraitError, Unicode as base_Unicode
+from traitlets import (
+    TraitError,
+    Undefined,
+    Unicode as base_Unicode,
+    validate,
+)
 
 from straitlets.compat import unicode
 from straitlets.test_utils import (
@@ -23,6 +28,7 @@ from ..serializable import (
 )
 from ..traits import (
     Bool,
+    Bytes,
     Dict,
     Enum,
     Float,
@@ -503,3 +509,843 @@ def test_multiple_trait_errors():
         ),
         str(e.value)
     )
+
+
+def test_trait_table():
+
+    class Point(Serializable):
+        x = Integer().example(1)
+        y = Integer(default_value=2)
+
+    class Table(Serializable):
+        b = Unicode()
+        a = List(default_value=[1])
+        c = Instance(Point)
+        d = Dict()
+
+    table = Table._trait_table
+    assert table.names == ('a', 'b', 'c', 'd')
+    assert table.names == tuple(sorted(Table.class_trait_names()))
+    assert table.name_set == frozenset(table.names)
+    assert table.traits == Table.class_traits()
+    assert [name for name, _ in table.items] == list(table.names)
+    assert table.containers == {'a', 'd'}
+    assert table.instances == {'c'}
+    assert table.primitives == {'b'}
+    assert table.defaults['a'] == [1]
+    assert table.defaults['b'] is Undefined
+    assert table.defaults['d'] is Undefined
+    assert Point._trait_table.examples == {'x': 1, 'y': 2}
+
+    # Instance traits without a static example fall back to an example of
+    # their class when building example instances.
+    assert table.examples['c'] is Undefined
+    assert Table.example_instance().c.to_dict() == {'x': 1, 'y': 2}
+    point = Point(x=3)
+    assert Instance(Point).example(point).example_value is point
+
+    # Subclasses get their own tables.
+    class SubTable(Table):
+        e = Float()
+
+    assert SubTable._trait_table.names == ('a', 'b', 'c', 'd', 'e')
+    assert Table._trait_table is table
+
+
+def test_trait_table_dynamic_traits():
+
+    class Base(Serializable):
+        x = Integer()
+
+    class Child(Base):
+        pass
+
+    Base.y = Integer(default_value=3)
+    assert Base._trait_table.names == ('x', 'y')
+    assert Child._trait_table.names == ('x', 'y')
+    assert Child(x=1).to_dict() == {'x': 1, 'y': 3}
+
+    del Base.y
+    assert Base._trait_table.names == ('x',)
+    assert Child._trait_table.names == ('x',)
+    with pytest.raises(TypeError):
+        Child(x=1, y=3)
+
+    # Replacing a trait with a plain attribute removes it from the table.
+    Base.y = Integer()
+    assert Child._trait_table.names == ('x', 'y')
+    Base.y = 5
+    try:
+        assert Base._trait_table.names == ('x',)
+        assert Child._trait_table.names == ('x',)
+    finally:
+        del Base.y
+
+    with pytest.raises(TypeError):
+        Base.z = base_Unicode()
+
+    instance = Base(x=1)
+    instance.add_traits(z=Unicode(default_value=not_ascii))
+    assert type(instance)._trait_table.names == ('x', 'z')
+    assert instance.to_dict() == {'x': 1, 'z': not_ascii}
+    assert Base._trait_table.names == ('x',)
+
+
+class TrustedChild(Serializable):
+    x = Integer()
+    validations = []
+
+    @validate('x')
+    def _record_validation(self, proposal):
+        self.validations.append(proposal['value'])
+        return proposal['value']
+
+
+class Trusted(StrictSerializable):
+    child = Instance(TrustedChild)
+    children = List(trait=Instance(TrustedChild))
+    by_name = Dict(trait=Instance(TrustedChild))
+    set_ = Set()
+    tuple_ = Tuple()
+    maybe = Instance(TrustedChild, allow_none=True)
+    list_ = List()
+    maybe_children = List(trait=Instance(TrustedChild, allow_none=True))
+
+
+@pytest.fixture
+def trusted_instance():
+    return Trusted(
+        child=TrustedChild(x=1),
+        children=[TrustedChild(x=2), {'x': 3}],
+        by_name={'a': TrustedChild(x=4)},
+        set_={1, 2},
+        tuple_=(1, 2),
+        maybe=None,
+        list_=[1, 'a'],
+        maybe_children=[None, TrustedChild(x=6)],
+    )
+
+
+def test_from_trusted_dict(trusted_instance):
+    key = b'secret'
+    dict_ = trusted_instance.to_dict()
+    token = trusted_instance.trust_token(key)
+
+    del TrustedChild.validations[:]
+    result = Trusted.from_trusted_dict(dict_, token=token, key=key)
+    assert TrustedChild.validations == []
+
+    assert result.to_dict() == dict_
+    assert isinstance(result.child, TrustedChild)
+    assert isinstance(result.set_, set)
+    assert isinstance(result.tuple_, tuple)
+    assert isinstance(result.children[1], TrustedChild)
+    assert isinstance(result.by_name['a'], TrustedChild)
+    assert result.maybe is None
+    assert result.list_ == [1, 'a']
+    assert result.maybe_children[0] is None
+    assert isinstance(result.maybe_children[1], TrustedChild)
+
+    # Keys may be unicode, and tokens don't depend on the dict's key order.
+    reordered = dict(reversed(list(dict_.items())))
+    assert Trusted.from_trusted_dict(
+        reordered,
+        token=trusted_instance.trust_token(u'secret'),
+        key=u'secret',
+    ).to_dict() == dict_
+    assert TrustedChild.validations == []
+
+
+def test_from_trusted_dict_untrusted(trusted_instance):
+    dict_ = trusted_instance.to_dict()
+    token = trusted_instance.trust_token(b'secret')
+
+    for kwargs in ({},
+                   {'token': token},
+                   {'key': b'secret'},
+                   {'token': token, 'key': b'wrong'}):
+        del TrustedChild.validations[:]
+        result = Trusted.from_trusted_dict(dict_, **kwargs)
+        assert TrustedChild.validations
+        assert result.to_dict() == dict_
+
+    # Tampered payloads are validated.
+    dict_['child'] = {'x': 'not an int'}
+    with pytest.raises(TraitError):
+        Trusted.from_trusted_dict(dict_, token=token, key=b'secret')
+
+    # Tokens aren't valid across classes.
+    class Other(Serializable):
+        x = Integer()
+
+    child = TrustedChild(x=1)
+    del TrustedChild.validations[:]
+    TrustedChild.from_trusted_dict(
+        child.to_dict(),
+        token=Other(x=1).trust_token(b'secret'),
+        key=b'secret',
+    )
+    assert TrustedChild.validations == [1]
+
+
+def test_from_trusted_dict_unexpected_key():
+    child = TrustedChild(x=1)
+    dict_ = {'x': 1, 'y': 2}
+    token = TrustedChild._compute_trust_token(dict_, b'secret')
+    with pytest.raises(TypeError):
+        TrustedChild.from_trusted_dict(dict_, token=token, key=b'secret')
+    assert child.x == 1
+
+
+def test_validate_all_attributes_fail_fast():
+
+    with pytest.raises(MultipleTraitErrors):
+        MultipleErrorsStrict.__new__(
+            MultipleErrorsStrict,
+        ).validate_all_attributes()
+
+    m = MultipleErrorsStrict.__new__(MultipleErrorsStrict)
+    with pytest.raises(TraitError) as e:
+        m.validate_all_attributes(fail_fast=True)
+    assert not isinstance(e.value, MultipleTraitErrors)
+    assert str(e.value).startswith('No default value found for x trait')
+
+    with pytest.raises(TraitError) as e:
+        m.validate_all_attributes(names=['y', 'x'], fail_fast=True)
+    assert str(e.value).startswith('No default value found for y trait')
+
+
+def test_validate_all_attributes_names():
+
+    class MyClass(Serializable):
+        x = Integer()
+        y = Integer()
+        z = Integer()
+
+    m = MyClass(x=1)
+    m.validate_all_attributes(names=['x'])
+    m.validate_all_attributes(names=[])
+    m.validate_all_attributes(names=['x'], fail_fast=True)
+
+    with pytest.raises(MultipleTraitErrors) as e:
+        m.validate_all_attributes(names=('x', 'y', 'z'))
+    assert set(e.value.errors) == {'y', 'z'}
+
+    with pytest.raises(TraitError) as e:
+        m.validate_all_attributes(names=('x', 'y'))
+    assert not isinstance(e.value, MultipleTraitErrors)
+
+    with pytest.raises(TypeError) as e:
+        m.validate_all_attributes(names=('x', 'w'))
+    assert str(e.value) == "MyClass has no traits named ('w',)."
+
+
+def test_update():
+
+    class Pair(StrictSerializable):
+        low = Integer()
+        high = Integer()
+
+        @validate('low', 'high')
+        def _ordered(self, proposal):
+            if self.low > self.high:
+                raise TraitError("low > high")
+            return proposal['value']
+
+    pair = Pair(low=1, high=2)
+
+    # Setting these one at a time would fail cross-validation in between.
+    pair.update(low=10, high=20)
+    assert pair.to_dict() == {'low': 10, 'high': 20}
+
+    with pytest.raises(TraitError):
+        pair.update(low=30, high=25)
+    assert pair.to_dict() == {'low': 10, 'high': 20}
+
+    with pytest.raises(TraitError):
+        pair.update(low=15, high='not an int')
+    assert pair.to_dict() == {'low': 10, 'high': 20}
+
+    with pytest.raises(TypeError) as e:
+        pair.update(low=1, middle=2)
+    assert str(e.value) == (
+        "Pair.update() got unexpected keyword arguments ('middle',)."
+    )
+
+    lazy = MultipleErrorsStrict.__new__(MultipleErrorsStrict)
+    lazy.update(x=1)
+    assert lazy.x == 1
+
+
+def test_update_reruns_dependent_validators():
+
+    class Bounded(StrictSerializable):
+        limit = Integer()
+        value = Integer()
+
+        # Only registered for ``value``, but depends on ``limit``.
+        @validate('value')
+        def _within_limit(self, proposal):
+            if proposal['value'] > self.limit:
+                raise TraitError("value > limit")
+            return proposal['value']
+
+    bounded = Bounded(limit=10, value=5)
+    bounded.update(limit=7)
+    assert bounded.to_dict() == {'limit': 7, 'value': 5}
+
+    with pytest.raises(TraitError):
+        bounded.update(limit=4)
+    assert bounded.to_dict() == {'limit': 7, 'value': 5}
+
+    # Plain Serializable.update only runs the changed traits' validators.
+    Serializable.update(bounded, limit=4)
+    assert bounded.limit == 4
+
+    class Clamped(StrictSerializable):
+        limit = Integer()
+        value = Integer()
+
+        @validate('value')
+        def _clamp(self, proposal):
+            return min(proposal['value'], self.limit)
+
+    # Values coerced by rerun validators are stored.
+    clamped = Clamped(limit=10, value=5)
+    clamped.update(limit=3)
+    assert clamped.to_dict() == {'limit': 3, 'value': 3}
+
+
+def test_clone():
+    foo = Foo(
+        bool_=True,
+        float_=1.0,
+        int_=1,
+        unicode_='u',
+        enum=1,
+        dict_={'a': 1},
+        list_=[1, 2],
+        set_={1},
+        tuple_=(1,),
+    )
+    nested = Nested(foo1=foo, foo2=foo, unicode_='u', dict_={})
+
+    clone = nested.clone()
+    assert type(clone) is Nested
+    assert clone.to_dict() == nested.to_dict()
+    assert clone.foo1 is nested.foo1
+
+    foo_clone = foo.clone()
+    assert foo_clone.list_ == foo.list_
+    assert foo_clone.list_ is not foo.list_
+    assert foo_clone.dict_ is not foo.dict_
+    assert foo_clone.set_ is not foo.set_
+    foo_clone.list_.append(3)
+    assert foo.list_ == [1, 2]
+
+    lazy = Foo.__new__(Foo)
+    assert 'int_' not in lazy.clone()._trait_values
+
+
+def test_evolve():
+    calls = []
+
+    class Child(Serializable):
+        x = Integer()
+
+        @validate('x')
+        def _record(self, proposal):
+            calls.append(proposal['value'])
+            return proposal['value']
+
+    class Range(StrictSerializable):
+        low = Integer()
+        high = Integer()
+        child = Instance(Child)
+        name = Unicode()
+
+        @validate('high')
+        def _check_high(self, proposal):
+            if proposal['value'] < self.low:
+                raise TraitError("low > high")
+            return proposal['value']
+
+    base = Range(low=1, high=10, child=Child(x=1), name='base')
+    del calls[:]
+
+    evolved = base.evolve(name='shard-1', low=5)
+    assert evolved.to_dict() == {
+        'low': 5, 'high': 10, 'child': {'x': 1}, 'name': 'shard-1',
+    }
+    assert evolved.child is base.child
+    assert calls == []
+    assert base.to_dict()['name'] == 'base'
+
+    # high's cross-validator depends on low, so it's rerun.
+    with pytest.raises(TraitError):
+        base.evolve(low=20)
+
+    # Changed values are cross-validated when they're set.
+    assert base.evolve(low=5, high=6).to_dict()['high'] == 6
+    with pytest.raises(TraitError):
+        base.evolve(high=0)
+
+    with pytest.raises(TraitError):
+        base.evolve(name=3)
+
+    with pytest.raises(TypeError) as e:
+        base.evolve(middle=2)
+    assert str(e.value) == (
+        "Range.evolve() got unexpected keyword arguments ('middle',)."
+    )
+
+    assert base.evolve().to_dict() == base.to_dict()
+
+
+class LayerChild(Serializable):
+    host = Unicode()
+    port = Integer()
+    tags = List().tag(merge='extend')
+
+
+class Layered(Serializable):
+    name = Unicode()
+    child = Instance(LayerChild, allow_none=True)
+    hosts = List()
+    options = Dict().tag(merge='extend')
+    flags = Set().tag(merge='extend')
+
+
+def test_from_layers():
+    base = {
+        'name': 'base',
+        'child': {'host': 'localhost', 'port': 5432, 'tags': ['a']},
+        'hosts': ['a', 'b'],
+        'options': {'x': 1, 'y': 2},
+        'flags': ['f1'],
+    }
+    overlay = {
+        'child': {'port': 5433, 'tags': ['b']},
+        'hosts': ['c'],
+        'options': {'y': 3},
+        'flags': ['f2'],
+    }
+    result = Layered.from_layers(base, None, overlay, {'name': 'host'})
+    assert result.to_dict() == {
+        'name': 'host',
+        'child': {'host': 'localhost', 'port': 5433, 'tags': ['a', 'b']},
+        'hosts': ['c'],
+        'options': {'x': 1, 'y': 3},
+        'flags': result.to_dict()['flags'],
+    }
+    assert result.flags == {'f1', 'f2'}
+    assert base['child'] == {'host': 'localhost', 'port': 5432, 'tags': ['a']}
+
+    # Instances can be used as layers.
+    result = Layered.from_layers(result, {'child': {'host': 'remote'}})
+    assert result.child.host == 'remote'
+    assert result.child.port == 5433
+
+    # None discards earlier values.
+    result = Layered.from_layers(
+        base,
+        {'child': None, 'options': None},
+        {'options': {'z': 1}},
+    )
+    assert result.child is None
+    assert result.options == {'z': 1}
+
+    assert 'merge_plan' in Layered._trait_table.cache
+
+
+def test_from_layers_validates_once():
+    calls = []
+
+    class Recording(LayerChild):
+        @classmethod
+        def from_dict(cls, dict_):
+            calls.append(dict_)
+            return super(Recording, cls).from_dict(dict_)
+
+    Recording.from_layers({'host': 'a'}, {'port': 1}, {'port': 2})
+    assert calls == [{'host': 'a', 'port': 2}]
+
+
+def test_from_layers_errors():
+    with pytest.raises(ValueError):
+        Layered.from_layers()
+
+    with pytest.raises(TypeError):
+        Layered.from_layers({'name': 'a'}, ['not', 'a', 'dict'])
+
+    with pytest.raises(TypeError):
+        Layered.from_layers({'nope': 'a'})
+
+    with pytest.raises(TraitError):
+        Layered.from_layers({'child': {'port': 'not an int'}}).child
+
+    class BadStrategy(Serializable):
+        x = List().tag(merge='append')
+
+    with pytest.raises(ValueError):
+        BadStrategy.from_layers({})
+
+    class NotAContainer(Serializable):
+        x = Integer().tag(merge='extend')
+
+    with pytest.raises(ValueError):
+        NotAContainer.from_layers({})
+
+
+def test_from_environ_fields():
+    environ = {
+        'APP__NAME': 'from-env',
+        'app__child__Port': '5433',
+        'APP__CHILD__HOST': 'localhost',
+        'APP__CHILD__TAGS': 'x,y',
+        'APP__OPTIONS': '{"a": 1}',
+        'APP__FLAGS': 'f1,f2',
+        'APP__HOSTS': '',
+        'OTHER__NAME': 'ignored',
+        'PATH': '/usr/bin',
+    }
+    result = Layered.from_environ_fields(environ)
+    assert result.to_dict() == {
+        'name': 'from-env',
+        'child': {'host': 'localhost', 'port': 5433, 'tags': ['x', 'y']},
+        'hosts': [],
+        'options': {'a': 1},
+        'flags': result.to_dict()['flags'],
+    }
+    assert result.flags == {'f1', 'f2'}
+
+    base = {'child': {'host': 'h', 'port': 1}, 'hosts': ['a']}
+    result = Layered.from_environ_fields(
+        {'CFG__CHILD__PORT': '2'},
+        prefix='cfg',
+        base=base,
+    )
+    assert result.child.host == 'h'
+    assert result.child.port == 2
+    assert result.hosts == ['a']
+
+    # Whole nested objects can be set as JSON, with fields overridden.
+    result = Layered.from_environ_fields({
+        'APP__CHILD': '{"host": "h", "port": 1}',
+        'APP__CHILD__PORT': '2',
+    })
+    assert (result.child.host, result.child.port) == ('h', 2)
+
+
+def test_from_environ_fields_errors():
+    with pytest.raises(TypeError):
+        Layered.from_environ_fields({'APP__NOPE': '1'})
+
+    with pytest.raises(TypeError):
+        Layered.from_environ_fields({'APP__NAME__X': '1'})
+
+    with pytest.raises(TraitError) as e:
+        Layered.from_environ_fields({'APP__CHILD__PORT': 'x'})
+    assert 'APP__CHILD__PORT' in str(e.value)
+
+
+class Replica(Serializable):
+    host = Unicode()
+    port = Integer()
+
+
+class Manifest(Serializable):
+    primary = Instance(Replica)
+    backup = Instance(Replica)
+    replicas = List(trait=Instance(Replica))
+
+
+def test_to_yaml_anchors():
+    shared = Replica(host='a', port=1)
+    manifest = Manifest(
+        primary=shared,
+        backup=Replica(host='a', port=1),
+        replicas=[shared, Replica(host='b', port=2), shared],
+    )
+
+    plain = manifest.to_yaml()
+    assert '&' not in plain
+
+    by_identity = manifest.to_yaml(anchors='identity')
+    assert by_identity.count('&') == 1
+    assert by_identity.count('*') == 2
+
+    structural = manifest.to_yaml(anchors='structural')
+    assert structural.count('&') == 1
+    assert structural.count('*') == 3
+    assert len(structural) < len(by_identity) < len(plain)
+
+    for text in (plain, by_identity, structural):
+        assert Manifest.from_yaml(text).to_dict() == manifest.to_dict()
+
+    with pytest.raises(ValueError):
+        manifest.to_yaml(anchors='bogus')
+
+    # Memos don't leak out of to_yaml.
+    dict_ = manifest.to_dict()
+    assert dict_['primary'] is not dict_['replicas'][0]
+
+
+def test_structural_anchors_mixed_key_types():
+
+    class Tagged(Serializable):
+        tags = Dict()
+
+    class Pair(Serializable):
+        a = Instance(Tagged)
+        b = Instance(Tagged)
+        c = Instance(Tagged)
+
+    pair = Pair(
+        a=Tagged(tags={1: ['x'], 'y': {2: -0.0, 'z': 1}}),
+        b=Tagged(tags={'y': {'z': 1, 2: -0.0}, 1: ['x']}),
+        # Equal to a and b, but for the types of keys and values.
+        c=Tagged(tags={'1': ['x'], 'y': {2: 0.0, 'z': True}}),
+    )
+    text = pair.to_yaml(anchors='structural')
+    assert text.count('&') == 1
+    assert text.count('*') == 1
+    loaded = Pair.from_yaml(text)
+    assert loaded.a is loaded.b
+    assert loaded.to_dict() == pair.to_dict()
+    assert loaded.c.tags == {'1': ['x'], 'y': {2: 0.0, 'z': True}}
+
+
+def test_nested_memos_join_the_outer_memo():
+    from straitlets.serializable import (
+        _memos,
+        _shared_instances_memo,
+        _shared_subtrees_memo,
+    )
+
+    with _shared_subtrees_memo('identity'):
+        outer = _memos.primitives
+        with _shared_subtrees_memo('structural'):
+            assert _memos.primitives is outer
+        assert _memos.primitives is outer
+    assert _memos.primitives is None
+
+    with _shared_instances_memo():
+        outer = _memos.instances
+        with _shared_instances_memo():
+            assert _memos.instances is outer
+        assert _memos.instances is outer
+    assert _memos.instances is None
+
+
+def test_from_yaml_shares_aliased_subtrees():
+    loaded = Manifest.from_yaml(dedent(
+        """\
+        primary: &r
+          host: a
+          port: 1
+        backup:
+          host: a
+          port: 1
+        replicas:
+        - *r
+        - *r
+        """
+    ))
+    assert loaded.primary is loaded.replicas[0] is loaded.replicas[1]
+    assert loaded.backup is not loaded.primary
+
+    # Without aliases, every subtree is constructed separately.
+    unshared = Manifest.from_dict(loaded.to_dict())
+    assert unshared.replicas[0] is not unshared.replicas[1]
+
+
+def test_canonical_json():
+    foo = Foo(
+        bool_=True,
+        float_=-0.0,
+        int_=1,
+        unicode_='u',
+        enum=1,
+        dict_={'b': 1, 'a': {'d': 2, 'c': -0.0}},
+        list_=[3, 1, 2],
+        set_={'z', 'b', 'a', 'q', 'c'},
+        tuple_=(1,),
+    )
+    result = foo.to_json(canonical=True)
+    assert result == (
+        '{"bool_":true,"dict_":{"a":{"c":0.0,"d":2},"b":1},"enum":1,'
+        '"float_":0.0,"int_":1,"list_":[3,1,2],'
+        '"set_":["a","b","c","q","z"],"tuple_":[1],"unicode_":"u"}'
+    )
+    assert Foo.from_json(result).to_json(canonical=True) == result
+
+
+def test_canonical_json_sorts_encoded_set_elements():
+    class Blobs(Serializable):
+        blobs = Set(trait=Bytes())
+
+    # Elements are sorted by their encodings, not by their raw values.
+    blobs = Blobs(blobs={b'b', b'a', b'\xff'})
+    assert blobs.to_json(canonical=True) == (
+        '{"blobs":["/w==","YQ==","Yg=="]}'
+    )
+    assert Blobs(blobs={b'\xff', b'a', b'b'}).fingerprint() == (
+        blobs.fingerprint()
+    )
+
+
+def test_fingerprint():
+    child = LayerChild(host='h', port=1, tags=[])
+    kwargs = {'low': 1, 'high': 2, 'child': child}
+
+    class Config(Serializable):
+        low = Integer()
+        high = Integer()
+        child = Instance(LayerChild)
+        tags = Set(default_value={'x', 'y', 'z'})
+
+    config = Config(**kwargs)
+    fingerprint = config.fingerprint()
+    assert re.match('^[0-9a-f]{64}$', fingerprint)
+    assert Config(**kwargs).fingerprint() == fingerprint
+    assert Config.from_json(config.to_json()).fingerprint() == fingerprint
+
+    # Setting a trait invalidates the cached fingerprint.
+    config.low = 0
+    assert config.fingerprint() != fingerprint
+    config.low = 1
+    assert config.fingerprint() == fingerprint
+
+    assert config.evolve(high=3).fingerprint() != fingerprint
+
+    # Classes with the same fields have different fingerprints.
+    class Other(Config):
+        pass
+
+    assert Other(**kwargs).fingerprint() != fingerprint
+
+
+def test_fingerprint_cache():
+    class Flat(Serializable):
+        x = Integer()
+        s = Unicode()
+
+    flat = Flat(x=1, s='s')
+    fingerprint = flat.fingerprint()
+    assert flat.fingerprint() is fingerprint
+    flat.x = 2
+    assert flat.fingerprint() != fingerprint
+
+    class Parent(Serializable):
+        c = Instance(Flat)
+        tags = List()
+
+    parent = Parent(c=Flat(x=1, s='s'), tags=[])
+    fingerprint = parent.fingerprint()
+
+    # Changes to nested values are seen, though no trait of parent is set.
+    parent.c.x = 2
+    assert parent.fingerprint() != fingerprint
+    parent.c.x = 1
+    assert parent.fingerprint() == fingerprint
+    parent.tags.append('t')
+    assert parent.fingerprint() != fingerprint
+    assert parent.fingerprint() == Parent(
+        c=Flat(x=1, s='s'),
+        tags=['t'],
+    ).fingerprint()
+
+
+def test_fingerprint_mixed_key_types():
+    class Config(Serializable):
+        d = Dict()
+
+    config = Config(d={1: 'a', 'b': {2: 'c', 'd': 'e'}})
+    assert config.to_json(canonical=True) == (
+        '{"d":{"1":"a","b":{"2":"c","d":"e"}}}'
+    )
+    assert config.fingerprint() == Config(
+        d={'b': {'d': 'e', 2: 'c'}, 1: 'a'},
+    ).fingerprint()
+
+
+def test_from_dict_only():
+    partial = MultipleErrorsStrict.from_dict_only(
+        {'x': 1, 'y': 'not an int'},
+        only=['x'],
+    )
+    assert partial.x == 1
+    assert partial._trait_values == {'x': 1}
+
+    with pytest.raises(TraitError):
+        MultipleErrorsStrict.from_dict_only({'x': 'bad', 'y': 2}, ['x'])
+
+    # Requested names missing from the input are left unset.
+    assert MultipleErrorsStrict.from_dict_only({}, ['x'])._trait_values == {}
+
+    with pytest.raises(TypeError) as e:
+        MultipleErrorsStrict.from_dict_only({}, ['x', 'z'])
+    assert str(e.value) == "MultipleErrorsStrict has no traits named ('z',)."
+
+
+def test_from_json_only():
+    partial = MultipleErrorsStrict.from_json(
+        '{"x": 1, "y": "bad"}',
+        only=('x',),
+    )
+    assert partial._trait_values == {'x': 1}
+
+
+def test_from_yaml_only():
+    text = dedent(
+        """\
+        backup:
+          host: a
+          port: not a port
+          unused: !!python/name:os.system
+        replicas:
+        - {host: a, port: 1}
+        - [unbalanced, {nested: [1, 2]}]
+        primary:
+          host: b
+          port: 2
+        """
+    )
+    partial = Manifest.from_yaml(text, only=['primary'])
+    assert list(partial._trait_values) == ['primary']
+    assert partial.primary.to_dict() == {'host': 'b', 'port': 2}
+
+    # Aliases to anchors in skipped values, and merge keys, still resolve.
+    text = dedent(
+        """\
+        defaults: &r
+          host: a
+          port: 1
+        replicas:
+        - &s {host: b, port: 2}
+        primary: *s
+        <<: {backup: *r}
+        """
+    )
+    partial = Manifest.from_yaml(text, only=['primary', 'backup'])
+    assert partial.primary.to_dict() == {'host': 'b', 'port': 2}
+    assert partial.backup.to_dict() == {'host': 'a', 'port': 1}
+    assert set(partial._trait_values) == {'primary', 'backup'}
+
+    with pytest.raises(TypeError):
+        Manifest.from_yaml(text, only=['bogus'])
+
+    # Anchors on the root mapping are recorded as usual.
+    partial = Manifest.from_yaml(
+        '&root {primary: {host: c, port: 3}, replicas: [1, 2]}',
+        only=['primary'],
+    )
+    assert partial.primary.to_dict() == {'host': 'c', 'port': 3}
+    assert list(partial._trait_values) == ['primary']
+
+    # Documents that aren't mappings are rejected, as by from_dict.
+    for text in ('[primary, backup]', 'primary', ''):
+        with pytest.raises(TypeError) as e:
+            Manifest.from_yaml(text, only=['primary'])
+        assert 'Expected a dict to construct Manifest' in str(e.value)
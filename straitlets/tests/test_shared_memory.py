@@ -0,0 +1,261 @@
+"""
+Tests for straitlets.shared_memory.
+"""
+import multiprocessing
+import sys
+
+import pytest
+
+from straitlets.builtin_models import PostgresConfig
+from straitlets.test_utils import assert_serializables_equal
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (3, 8),
+    reason='straitlets.shared_memory requires Python 3.8',
+)
+
+
+@pytest.fixture
+def pg_config():
+    return PostgresConfig(
+        username=u'user',
+        password=u'password',
+        hostname=u'localhost',
+        port=5432,
+        database=u'db',
+        query_params={u'sslmode': u'require'},
+    )
+
+
+def test_roundtrip(pg_config):
+    shm = pg_config.to_shared_memory()
+    try:
+        assert_serializables_equal(
+            PostgresConfig.from_shared_memory(shm.name),
+            pg_config,
+        )
+        # Many readers can attach to the same segment.
+        assert_serializables_equal(
+            PostgresConfig.from_shared_memory(shm.name),
+            pg_config,
+        )
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_trusted(pg_config, monkeypatch):
+    from straitlets.shared_memory import shared_config
+
+    calls = []
+    from_dict = PostgresConfig.from_dict.__func__
+
+    def recording_from_dict(cls, dict_):
+        calls.append(dict_)
+        return from_dict(cls, dict_)
+
+    monkeypatch.setattr(
+        PostgresConfig,
+        'from_dict',
+        classmethod(recording_from_dict),
+    )
+
+    with shared_config(pg_config, key=b'secret') as name:
+        result = PostgresConfig.from_shared_memory(name, key=b'secret')
+        assert calls == []
+        assert_serializables_equal(result, pg_config)
+
+        # Without the key (or with the wrong one), we revalidate.
+        PostgresConfig.from_shared_memory(name)
+        assert len(calls) == 1
+        PostgresConfig.from_shared_memory(name, key=b'wrong')
+        assert len(calls) == 2
+
+
+def test_trusted_read_does_not_reencode(pg_config, monkeypatch):
+    from straitlets.shared_memory import shared_config
+
+    def fail(*args, **kwargs):  # pragma: no cover
+        raise AssertionError('payload was re-encoded')
+
+    with shared_config(pg_config, key=b'secret') as name:
+        monkeypatch.setattr(PostgresConfig, '_compute_trust_token', fail)
+        monkeypatch.setattr(PostgresConfig, 'from_dict', fail)
+        assert_serializables_equal(
+            PostgresConfig.from_shared_memory(name, key=b'secret'),
+            pg_config,
+        )
+
+
+def test_trusted_other_class(pg_config):
+    from straitlets.shared_memory import shared_config
+
+    class OtherConfig(PostgresConfig):
+        pass
+
+    calls = []
+    with shared_config(pg_config, key=b'secret') as name:
+        from_dict = OtherConfig.from_dict.__func__
+
+        def recording_from_dict(cls, dict_):
+            calls.append(dict_)
+            return from_dict(cls, dict_)
+
+        OtherConfig.from_dict = classmethod(recording_from_dict)
+        OtherConfig.from_shared_memory(name, key=b'secret')
+        assert len(calls) == 1
+
+
+def test_corrupted_segment(pg_config):
+    from multiprocessing.shared_memory import SharedMemory
+    from straitlets.shared_memory import _HEADER
+
+    shm = pg_config.to_shared_memory(key=b'secret')
+    try:
+        data = bytes(shm.buf)
+        # Corrupt the payload in a way that is still valid JSON.
+        index = data.index(b'"database":"db"') + len(b'"database":"d')
+        shm.buf[index:index + 1] = b'x'
+        result = PostgresConfig.from_shared_memory(shm.name, key=b'secret')
+        # The HMAC doesn't match, so the payload was revalidated.
+        assert result.database == u'dx'
+
+        # Invalid JSON.
+        shm.buf[index:index + 1] = b'"'
+        with pytest.raises(ValueError):
+            PostgresConfig.from_shared_memory(shm.name, key=b'secret')
+    finally:
+        shm.close()
+        shm.unlink()
+
+    # A header claiming more data than the segment holds.
+    magic, version, token_len, payload_len = _HEADER.unpack_from(data)
+    shm = SharedMemory(create=True, size=len(data))
+    try:
+        shm.buf[:len(data)] = data
+        _HEADER.pack_into(
+            shm.buf, 0, magic, version, token_len, payload_len + 1000,
+        )
+        with pytest.raises(ValueError) as e:
+            PostgresConfig.from_shared_memory(shm.name)
+        assert 'truncated' in str(e.value)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_tampered_segment_is_rejected(pg_config, monkeypatch):
+    from traitlets import TraitError
+    from straitlets.shared_memory import _HEADER
+
+    calls = []
+    from_dict = PostgresConfig.from_dict.__func__
+
+    def recording_from_dict(cls, dict_):
+        calls.append(dict_)
+        return from_dict(cls, dict_)
+
+    monkeypatch.setattr(
+        PostgresConfig,
+        'from_dict',
+        classmethod(recording_from_dict),
+    )
+
+    shm = pg_config.to_shared_memory(key=b'secret')
+    try:
+        data = bytes(shm.buf)
+
+        # A tampered token isn't trusted.
+        shm.buf[_HEADER.size] ^= 0xff
+        assert_serializables_equal(
+            PostgresConfig.from_shared_memory(shm.name, key=b'secret'),
+            pg_config,
+        )
+        assert len(calls) == 1
+
+        # A tampered payload with the original token is revalidated, and
+        # rejected if it's invalid.
+        shm.buf[:len(data)] = data
+        index = data.index(b'5432')
+        shm.buf[index:index + 4] = b'54.2'
+        with pytest.raises(TraitError):
+            PostgresConfig.from_shared_memory(shm.name, key=b'secret')
+        assert len(calls) == 2
+
+        # A tampered header is rejected before parsing.
+        shm.buf[:len(data)] = data
+        shm.buf[0:4] = b'XXXX'
+        with pytest.raises(ValueError) as e:
+            PostgresConfig.from_shared_memory(shm.name, key=b'secret')
+        assert 'bad header' in str(e.value)
+        assert len(calls) == 2
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_failed_write_removes_segment(pg_config, monkeypatch):
+    from multiprocessing.shared_memory import SharedMemory
+    from straitlets import shared_memory
+
+    # Not bytes-like, so copying it into the segment fails.
+    monkeypatch.setattr(shared_memory, '_encode', lambda *args: [0] * 16)
+    name = 'straitlets_test_failed_%d' % id(pg_config)
+    with pytest.raises(TypeError):
+        shared_memory.write_shared_memory(pg_config, name=name)
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
+
+
+def test_skip_and_name(pg_config):
+    from straitlets.shared_memory import (
+        unlink_shared_memory,
+        write_shared_memory,
+    )
+
+    name = 'straitlets_test_%d' % id(pg_config)
+    shm = write_shared_memory(pg_config, name=name, skip=('password',))
+    shm.close()
+    try:
+        result = PostgresConfig.from_shared_memory(name)
+        assert result.password is None
+        assert_serializables_equal(result, pg_config, skip=('password',))
+    finally:
+        unlink_shared_memory(name)
+
+    with pytest.raises(FileNotFoundError):
+        PostgresConfig.from_shared_memory(name)
+
+
+def test_bad_segment():
+    from multiprocessing.shared_memory import SharedMemory
+
+    for size in (64, 4):
+        shm = SharedMemory(create=True, size=size)
+        try:
+            with pytest.raises(ValueError):
+                PostgresConfig.from_shared_memory(shm.name)
+        finally:
+            shm.close()
+            shm.unlink()
+
+
+def _read_database(name):  # pragma: no cover (runs in a worker)
+    return PostgresConfig.from_shared_memory(name, key=b'secret').database
+
+
+@pytest.mark.skipif(
+    'fork' not in multiprocessing.get_all_start_methods(),
+    reason='requires the fork start method',
+)
+def test_worker_pool(pg_config):
+    from straitlets.shared_memory import shared_config
+
+    ctx = multiprocessing.get_context('fork')
+    with shared_config(pg_config, key=b'secret') as name:
+        pool = ctx.Pool(2)
+        try:
+            assert pool.map(_read_database, [name] * 4) == [u'db'] * 4
+        finally:
+            pool.close()
+            pool.join()
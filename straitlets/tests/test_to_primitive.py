@@ -12,3 +12,12 @@ def test_base_case():
     assert str(e.value) == (
         "Don't know how to convert instances of SomeRandomClass to primitives."
     )
+
+
+def test_sets_are_sorted():
+    assert to_primitive({3, 1, 2}) == [1, 2, 3]
+    assert to_primitive(frozenset(['b', 'a'])) == ['a', 'b']
+    # Unorderable mixtures are ordered by type name, then value.
+    assert to_primitive({1, u'a', 2.5, (2, 1), (1, 2)}) == (
+        [2.5, 1, [1, 2], [2, 1], u'a']
+    )
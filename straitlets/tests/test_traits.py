@@ -1,3 +1,4 @@
+import array
 import sys
 
 import pytest
@@ -5,7 +6,22 @@ import traitlets as tr
 
 from ..serializable import Serializable
 from ..test_utils import assert_serializables_equal
-from ..traits import Enum, LengthBoundedUnicode
+from ..traits import (
+    Bool,
+    Bytes,
+    Dict,
+    Enum,
+    Float,
+    FloatArray,
+    Instance,
+    IntArray,
+    Integer,
+    LengthBoundedUnicode,
+    List,
+    Set,
+    Tuple,
+    Unicode,
+)
 
 
 def test_reject_unknown_enum_value():
@@ -59,3 +75,321 @@ def test_path(roundtrip_func):  # pragma: no cover
     assert isinstance(s.p, pathlib.Path)
 
     assert_serializables_equal(s, roundtrip_func(s))
+
+
+class Arrays(Serializable):
+    ids = IntArray(minval=0)
+    small = IntArray(typecode='b', minlen=1, maxlen=3)
+    weights = FloatArray(minval=-1.0, maxval=1.0)
+
+
+def test_typed_arrays(roundtrip_func):
+    ids = array.array(IntArray().typecode, range(1000))
+    s = Arrays(ids=ids, small=[1, 2], weights=(0.5, -0.5))
+
+    # Arrays of the right typecode are stored without copying.
+    assert s.ids is ids
+    assert s.small == array.array('b', [1, 2])
+    assert s.weights == array.array('d', [0.5, -0.5])
+
+    assert s.to_dict() == {
+        'ids': list(range(1000)),
+        'small': [1, 2],
+        'weights': [0.5, -0.5],
+    }
+
+    rounded = roundtrip_func(s)
+    for name in ('ids', 'small', 'weights'):
+        assert isinstance(getattr(rounded, name), array.array)
+    assert_serializables_equal(s, rounded)
+
+    trusted = Arrays.from_trusted_dict(
+        s.to_dict(),
+        token=s.trust_token(b'key'),
+        key=b'key',
+    )
+    assert_serializables_equal(s, trusted)
+
+
+def test_typed_arrays_from_bytes():
+    weights = array.array('d', [0.25, 0.75])
+    s = Arrays(weights=weights.tobytes())
+    assert s.weights == weights
+
+    with pytest.raises(tr.TraitError):
+        # Not a multiple of the item size.
+        Arrays(weights=weights.tobytes()[:-1])
+
+
+def test_typed_array_validation():
+    for bad_ids in ([1.5], [u'1'], u'123', {1: 2}, [-1], [2 ** 64]):
+        with pytest.raises(tr.TraitError):
+            Arrays(ids=bad_ids)
+
+    for bad_small in ([], [1, 2, 3, 4], [1000]):
+        with pytest.raises(tr.TraitError):
+            Arrays(small=bad_small)
+
+    for bad_weights in ([1.5], [-1.5], [u'a']):
+        with pytest.raises(tr.TraitError):
+            Arrays(weights=bad_weights)
+
+    # Empty arrays skip bounds checks.
+    Arrays(ids=[], weights=[])
+
+    with pytest.raises(TypeError):
+        IntArray(typecode='d')
+
+    with pytest.raises(TypeError):
+        FloatArray(typecode='q')
+
+
+class Binary(Serializable):
+    cert = Bytes()
+    key = Bytes(minlen=2, maxlen=4, allow_none=True)
+    chain = List(trait=Bytes())
+    by_name = Dict(trait=Bytes())
+
+
+@pytest.mark.parametrize('type_', [bytes, bytearray, memoryview])
+def test_bytes(roundtrip_func, type_):
+    cert = type_(b'\x00\x01certificate\xff')
+    b = Binary(
+        cert=cert,
+        key=b'key',
+        chain=[b'a', b'\xfe'],
+        by_name={u'x': b'\x00'},
+    )
+
+    # Values are stored without copying.
+    assert b.cert is cert
+
+    assert b.to_dict() == {
+        'cert': u'AAFjZXJ0aWZpY2F0Zf8=',
+        'key': u'a2V5',
+        'chain': [u'YQ==', u'/g=='],
+        'by_name': {u'x': u'AA=='},
+    }
+
+    rounded = roundtrip_func(b)
+    assert rounded.cert == b'\x00\x01certificate\xff'
+    assert rounded.key == b'key'
+    assert rounded.chain == [b'a', b'\xfe']
+    assert rounded.by_name == {u'x': b'\x00'}
+
+    trusted = Binary.from_trusted_dict(
+        b.to_dict(),
+        token=b.trust_token(b'secret'),
+        key=b'secret',
+    )
+    assert trusted.to_dict() == b.to_dict()
+    assert trusted.cert == b'\x00\x01certificate\xff'
+
+
+def test_bytes_validation():
+    Binary(key=None)
+    Binary(key=memoryview(b'abcd'))
+
+    for bad_key in (b'a', b'abcde', bytearray(5), u'YWJjZGU='):
+        with pytest.raises(tr.TraitError):
+            Binary(key=bad_key)
+
+    bad_certs = (
+        1,
+        [1, 2],
+        u'not base64!',
+        # Valid base64 characters surrounded by invalid ones must not be
+        # silently decoded.
+        u'user:pass',
+        u'key=value',
+        u'YWJj\nZGVm',
+        u'YWJjZA',
+        u'YW=jZA==',
+    )
+    for bad_cert in bad_certs:
+        with pytest.raises(tr.TraitError):
+            Binary(cert=bad_cert)
+
+
+@pytest.mark.skipif(
+    sys.version_info.major < 3,
+    reason='memoryview.cast requires Python 3',
+)
+def test_bytes_memoryview_length():  # pragma: no cover
+    # Lengths are measured in bytes, not items.
+    view = memoryview(array.array('h', [1, 2]))
+    assert Binary(key=view).key is view
+    with pytest.raises(tr.TraitError):
+        Binary(key=memoryview(array.array('h', [1, 2, 3])))
+
+    # Non-contiguous views can't be encoded without copying.
+    with pytest.raises(tr.TraitError):
+        Binary(key=view.cast('B')[::2])
+
+
+@pytest.mark.skipif(
+    sys.version_info.major < 3,
+    reason='temporal traits require Python 3',
+)
+def test_temporal_traits(roundtrip_func):  # pragma: no cover
+    from datetime import date, datetime, timedelta, timezone
+    from ..py3 import Date, Datetime, Timedelta
+
+    class Schedule(Serializable):
+        start = Datetime(tz_aware=True)
+        created = Datetime()
+        day = Date()
+        interval = Timedelta()
+        entries = List(trait=Datetime())
+
+    start = datetime(2020, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc)
+    s = Schedule(
+        start=start,
+        created=u'2020-01-02T03:04:05',
+        day=u'2020-01-02',
+        interval=90.5,
+        entries=[u'2020-01-02T00:00:00Z', datetime(2020, 1, 3)],
+    )
+    assert s.start is start
+    assert s.created == datetime(2020, 1, 2, 3, 4, 5)
+    assert s.day == date(2020, 1, 2)
+    assert s.interval == timedelta(seconds=90.5)
+    assert s.entries == [
+        datetime(2020, 1, 2, tzinfo=timezone.utc),
+        datetime(2020, 1, 3),
+    ]
+
+    assert s.to_dict() == {
+        'start': u'2020-01-02T03:04:05.000006+00:00',
+        'created': u'2020-01-02T03:04:05',
+        'day': u'2020-01-02',
+        'interval': 90.5,
+        'entries': [u'2020-01-02T00:00:00+00:00', u'2020-01-03T00:00:00'],
+    }
+
+    assert_serializables_equal(s, roundtrip_func(s))
+    assert_serializables_equal(
+        s,
+        Schedule.from_trusted_dict(
+            s.to_dict(),
+            token=s.trust_token(b'key'),
+            key=b'key',
+        ),
+    )
+
+
+@pytest.mark.skipif(
+    sys.version_info.major < 3,
+    reason='temporal traits require Python 3',
+)
+def test_temporal_trait_validation():  # pragma: no cover
+    from datetime import date, datetime, timedelta
+    from ..py3 import Date, Datetime, Timedelta, parse_datetime
+
+    class Schedule(Serializable):
+        aware = Datetime(tz_aware=True)
+        naive = Datetime(tz_aware=False)
+        day = Date()
+        interval = Timedelta()
+
+    Schedule(aware=u'2020-01-01T00:00:00+01:00', naive=u'2020-01-01')
+
+    bad_values = {
+        'aware': [u'2020-01-01T00:00:00', u'not a date', 1, date.today()],
+        'naive': [u'2020-01-01T00:00:00Z'],
+        'day': [u'2020-01-01T00:00:00', datetime(2020, 1, 1), u'2020-13-01'],
+        'interval': [u'90', True, None],
+    }
+    for name, values in bad_values.items():
+        for value in values:
+            with pytest.raises(tr.TraitError):
+                Schedule(**{name: value})
+
+    assert Schedule(interval=timedelta(1)).interval == timedelta(1)
+
+    parse_datetime.cache_clear()
+    for _ in range(3):
+        Schedule(naive=u'2021-06-01T12:00:00')
+    info = parse_datetime.cache_info()
+    assert (info.hits, info.misses) == (2, 1)
+
+
+@pytest.mark.skipif(
+    sys.version_info.major < 3,
+    reason='temporal traits require Python 3',
+)
+def test_iso_parse_fallbacks():  # pragma: no cover
+    from datetime import date, datetime, timedelta, timezone
+    from ..py3 import _parse_date_fallback, _parse_datetime_fallback
+
+    assert _parse_date_fallback(u'2020-01-02') == date(2020, 1, 2)
+
+    cases = [
+        (u'2020-01-02', datetime(2020, 1, 2)),
+        (u'2020-01-02T03', datetime(2020, 1, 2, 3)),
+        (u'2020-01-02 03:04', datetime(2020, 1, 2, 3, 4)),
+        (u'2020-01-02T03:04:05.123', datetime(2020, 1, 2, 3, 4, 5, 123000)),
+        (
+            u'2020-01-02T03:04:05.000006+00:00',
+            datetime(2020, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc),
+        ),
+        (
+            u'2020-01-02T03:04:05-05:30',
+            datetime(
+                2020, 1, 2, 3, 4, 5,
+                tzinfo=timezone(-timedelta(hours=5, minutes=30)),
+            ),
+        ),
+    ]
+    for s, expected in cases:
+        result = _parse_datetime_fallback(s)
+        assert result == expected
+        assert result.utcoffset() == expected.utcoffset()
+        if hasattr(datetime, 'fromisoformat'):
+            assert datetime.fromisoformat(s) == result
+
+    for bad in (u'2020-1-2', u'2020-01-02T', u'2020-13-01', u'x',
+                u'2020-01-02\n', u'2020-01-02T03:04:05.1234'):
+        with pytest.raises(ValueError):
+            _parse_datetime_fallback(bad)
+    for bad in (u'2020-01-02T00:00', u'2020-02-30', u'20200102'):
+        with pytest.raises(ValueError):
+            _parse_date_fallback(bad)
+
+
+def test_from_string():
+    cases = [
+        (Integer(), u'3', 3),
+        (Float(), u'1.5', 1.5),
+        (Unicode(), u'x', u'x'),
+        (Bool(), u'Yes', True),
+        (Bool(), u'0', False),
+        (Enum(values=(1, u'a')), u'1', 1),
+        (Enum(values=(1, u'a')), u'a', u'a'),
+        (List(), u'', []),
+        (List(), u'a, b', [u'a', u'b']),
+        (List(trait=Integer()), u'1,2', [1, 2]),
+        (List(trait=Integer()), u'[1, 2]', [1, 2]),
+        (Set(trait=Integer()), u'1,2', [1, 2]),
+        (Tuple(), u'1,a', [u'1', u'a']),
+        (Dict(), u'{"a": 1}', {u'a': 1}),
+        (IntArray(), u'1,2', [1, 2]),
+        (FloatArray(), u'[1, 2.5]', [1.0, 2.5]),
+        (Instance(Serializable), u'{"a": 1}', {u'a': 1}),
+    ]
+    for trait, s, expected in cases:
+        assert trait.from_string(s) == expected
+
+    for trait, s in [(Integer(), u'x'), (Bool(), u'maybe'), (Dict(), u'[')]:
+        with pytest.raises(ValueError):
+            trait.from_string(s)
+
+    # Unknown Enum values are passed through, so that validation reports
+    # them along with the allowed values.
+    class Choice(Serializable):
+        choice = Enum(values=(1, u'a'))
+
+    value = Choice.class_traits()['choice'].from_string(u'b')
+    assert value == u'b'
+    with pytest.raises(tr.TraitError):
+        Choice(choice=value)
@@ -1,3 +1,5 @@
+import array
+
 from six import iterkeys, itervalues
 from six.moves import zip, map
 
@@ -34,14 +36,42 @@ def _atom_to_primitive(a):
     return a
 
 
-@to_primitive.register(set)
 @to_primitive.register(list)
 @to_primitive.register(tuple)
-@to_primitive.register(frozenset)
 def _sequence_to_primitive(s):
     return list(map(to_primitive, s))
 
 
+def sorted_primitives(values):
+    """
+    Sort a list of primitives in place and return it.
+
+    Values of types that can't be compared with each other (e.g. dicts, or a
+    mix of numbers and strings) are ordered by their type name and JSON
+    encoding.
+    """
+    try:
+        values.sort()
+    except TypeError:
+        import json
+        values.sort(
+            key=lambda v: (type(v).__name__, json.dumps(v, sort_keys=True)),
+        )
+    return values
+
+
+@to_primitive.register(set)
+@to_primitive.register(frozenset)
+def _set_to_primitive(s):
+    # Sorted so that the output doesn't depend on hash iteration order.
+    return sorted_primitives(list(map(to_primitive, s)))
+
+
+@to_primitive.register(array.array)
+def _array_to_primitive(a):
+    return a.tolist()
+
+
 @to_primitive.register(dict)
 def _dict_to_primitive(d):
     return dict(
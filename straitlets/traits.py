@@ -7,12 +7,19 @@ Adds the following additional behavior:
 - Serialization to/from dictionaries containing only primitives.
 - More strict handling of default values than traitlets' built-in behavior.
 """
+import array
 from contextlib import contextmanager
 
+from six import iteritems
 import traitlets as tr
 
 from . import compat
-from .to_primitive import to_primitive, can_convert_to_primitive
+from .compat import unicode
+from .to_primitive import (
+    can_convert_to_primitive,
+    sorted_primitives,
+    to_primitive,
+)
 
 
 @contextmanager
@@ -56,13 +63,77 @@ class SerializableTrait(tr.TraitType):
 
     example_value = property(_static_example_value)
 
+    def to_primitive(self, value):
+        """
+        Convert a value of this trait into primitives.
+
+        The default implementation dispatches on the type of ``value``.
+        Traits whose serialized form depends on the trait rather than just the
+        value's type (e.g. ``Bytes``) override this.
+        """
+        return to_primitive(value)
+
+    def from_trusted_primitive(self, value):
+        """
+        Convert a primitive produced by ``to_primitive`` back into a value for
+        this trait, without validation.
+
+        This is used when constructing from data that is already known to be
+        valid, e.g. ``Serializable.from_trusted_dict``.
+        """
+        return value
+
+    def from_string(self, s):
+        """
+        Convert a string (e.g. an environment variable) into a value that can
+        be assigned to this trait.
+
+        The result is validated when it is assigned.  Raise ValueError if
+        ``s`` can't be interpreted.
+        """
+        return s
+
+
+def _trusted_element(trait, value):
+    """
+    Apply ``trait.from_trusted_primitive`` to ``value`` if ``trait`` is a
+    SerializableTrait.
+    """
+    if isinstance(trait, SerializableTrait):
+        return trait.from_trusted_primitive(value)
+    return value
+
+
+def _element_from_string(trait, s):
+    """
+    Apply ``trait.from_string`` to ``s`` if ``trait`` is a SerializableTrait.
+    """
+    if isinstance(trait, SerializableTrait):
+        return trait.from_string(s)
+    return s
+
+
+def _split_or_load_json(s):
+    """
+    Interpret ``s`` as a JSON array or object if it looks like one, or else as
+    a comma-separated list.
+    """
+    if s.lstrip().startswith(('[', '{')):
+        import json
+        return json.loads(s)
+    return [item.strip() for item in s.split(',')] if s.strip() else []
+
 
 class Integer(SerializableTrait, tr.Integer):
-    pass
+
+    def from_string(self, s):
+        return int(s)
 
 
 class Float(SerializableTrait, tr.Float):
-    pass
+
+    def from_string(self, s):
+        return float(s)
 
 
 class Unicode(SerializableTrait, tr.Unicode):
@@ -86,8 +157,226 @@ class LengthBoundedUnicode(Unicode):
         return super_retval
 
 
+_TRUE_STRINGS = frozenset(['1', 'true', 'yes', 'on'])
+_FALSE_STRINGS = frozenset(['0', 'false', 'no', 'off'])
+
+
 class Bool(SerializableTrait, tr.Bool):
-    pass
+
+    def from_string(self, s):
+        lowered = s.strip().lower()
+        if lowered in _TRUE_STRINGS:
+            return True
+        elif lowered in _FALSE_STRINGS:
+            return False
+        raise ValueError("Can't interpret %r as a boolean." % s)
+
+
+def _nbytes(value):
+    if isinstance(value, memoryview):
+        # Python 2 memoryviews don't have nbytes.
+        return getattr(value, 'nbytes', None) or len(value.tobytes())
+    return len(value)
+
+
+class Bytes(SerializableTrait):
+    """
+    A trait holding binary data.
+
+    Accepts ``bytes``, ``bytearray``, and ``memoryview`` objects, which are
+    stored as-is without copying.  Values are serialized as base64-encoded
+    text by ``to_dict`` (and so in JSON, YAML, and base64 formats), and
+    unicode values are interpreted as base64 when assigned.
+
+    Parameters
+    ----------
+    minlen, maxlen : int, optional
+        Inclusive bounds on the length of the data, in bytes.
+    """
+    info_text = 'a bytes-like object'
+
+    def __init__(self, minlen=0, maxlen=None, **kwargs):
+        self.minlen = minlen
+        self.maxlen = maxlen
+        super(Bytes, self).__init__(**kwargs)
+
+    def validate(self, obj, value):
+        if isinstance(value, unicode):
+            value = self._decode(value)
+        elif isinstance(value, memoryview):
+            if not getattr(value, 'c_contiguous', True):
+                raise tr.TraitError(
+                    "%s trait %r requires a contiguous buffer." % (
+                        type(self).__name__,
+                        self.name,
+                    )
+                )
+        elif not isinstance(value, (bytes, bytearray)):
+            self.error(obj, value)
+
+        length = _nbytes(value)
+        if length < self.minlen:
+            raise tr.TraitError(
+                "len(%s) = %d < minlen=%d" % (self.name, length, self.minlen)
+            )
+        elif self.maxlen is not None and length > self.maxlen:
+            raise tr.TraitError(
+                "len(%s) = %d > maxlen=%d" % (self.name, length, self.maxlen)
+            )
+        return value
+
+    def _decode(self, value):
+        import binascii
+        try:
+            return compat.b64decode_strict(value)
+        except (binascii.Error, TypeError, ValueError) as e:
+            raise tr.TraitError(
+                "Invalid base64 for %s trait %r: %s" % (
+                    type(self).__name__,
+                    self.name,
+                    e,
+                )
+            )
+
+    def to_primitive(self, value):
+        import base64
+        return compat.ensure_unicode(base64.b64encode(value))
+
+    def from_trusted_primitive(self, value):
+        return self._decode(value)
+
+
+# 'q' (signed 64-bit) isn't available on Python 2.
+_INT64_TYPECODE = 'q' if 'q' in getattr(array, 'typecodes', '') else 'l'
+
+
+class _TypedArray(SerializableTrait):
+    """
+    Base class for traits holding a homogeneous ``array.array``.
+
+    Values are stored in a single compact buffer rather than as a list of
+    boxed Python objects.  Element types are checked by the ``array.array``
+    constructor and bounds are checked with a single ``min``/``max`` pass.
+
+    Values may be given as an ``array.array``, any iterable of elements, or
+    the raw bytes of a buffer (as produced by ``array.tobytes()``).
+    """
+    typecodes = ()
+    default_typecode = None
+    element_type = None
+
+    def __init__(self,
+                 minval=None,
+                 maxval=None,
+                 minlen=0,
+                 maxlen=None,
+                 typecode=None,
+                 **kwargs):
+        if typecode is None:
+            typecode = self.default_typecode
+        if typecode not in self.typecodes:
+            raise TypeError(
+                "Invalid typecode for %s: %r.  Expected one of %s." % (
+                    type(self).__name__,
+                    typecode,
+                    ''.join(self.typecodes),
+                )
+            )
+        self.typecode = typecode
+        self.minval = minval
+        self.maxval = maxval
+        self.minlen = minlen
+        self.maxlen = maxlen
+        super(_TypedArray, self).__init__(**kwargs)
+
+    def validate(self, obj, value):
+        if not (isinstance(value, array.array) and
+                value.typecode == self.typecode):
+            if isinstance(value, (unicode, dict)):
+                self.error(obj, value)
+            try:
+                value = array.array(self.typecode, value)
+            except (TypeError, ValueError, OverflowError) as e:
+                raise tr.TraitError(
+                    "Invalid value for %s trait %r: %s" % (
+                        type(self).__name__,
+                        self.name,
+                        e,
+                    )
+                )
+
+        length = len(value)
+        if length < self.minlen:
+            raise tr.TraitError(
+                "len(%s) < minlen=%d" % (self.name, self.minlen)
+            )
+        elif self.maxlen is not None and length > self.maxlen:
+            raise tr.TraitError(
+                "len(%s) > maxlen=%d" % (self.name, self.maxlen)
+            )
+
+        if length:
+            if self.minval is not None:
+                low = min(value)
+                if low < self.minval:
+                    raise tr.TraitError(
+                        "min(%s) = %r < minval=%r" % (
+                            self.name, low, self.minval,
+                        )
+                    )
+            if self.maxval is not None:
+                high = max(value)
+                if high > self.maxval:
+                    raise tr.TraitError(
+                        "max(%s) = %r > maxval=%r" % (
+                            self.name, high, self.maxval,
+                        )
+                    )
+        return value
+
+    def from_trusted_primitive(self, value):
+        return array.array(self.typecode, value)
+
+    def from_string(self, s):
+        return [self.element_type(v) for v in _split_or_load_json(s)]
+
+
+class IntArray(_TypedArray):
+    """
+    A compact list of integers, stored as an ``array.array``.
+
+    Parameters
+    ----------
+    minval, maxval : int, optional
+        Inclusive bounds on elements.
+    minlen, maxlen : int, optional
+        Inclusive bounds on length.
+    typecode : str, optional
+        The ``array`` typecode to use.  Defaults to signed 64-bit integers.
+    """
+    info_text = 'an array of integers'
+    typecodes = ('b', 'B', 'h', 'H', 'i', 'I', 'l', 'L', _INT64_TYPECODE)
+    default_typecode = _INT64_TYPECODE
+    element_type = int
+
+
+class FloatArray(_TypedArray):
+    """
+    A compact list of floats, stored as an ``array.array``.
+
+    Parameters
+    ----------
+    minval, maxval : float, optional
+        Inclusive bounds on elements.
+    minlen, maxlen : int, optional
+        Inclusive bounds on length.
+    typecode : str, optional
+        The ``array`` typecode to use.  Defaults to double precision.
+    """
+    info_text = 'an array of floats'
+    typecodes = ('f', 'd')
+    default_typecode = 'd'
+    element_type = float
 
 
 # Different traitlets container types use different values for `default_value`.
@@ -109,9 +398,19 @@ def _get_default_value_sentinel(t):
 
 _NOTPASSED = object()
 _TRAITLETS_CONTAINER_TYPES = frozenset([tr.List, tr.Set, tr.Dict, tr.Tuple])
-_DEFAULT_VALUE_SENTINELS = {
-    t: _get_default_value_sentinel(t) for t in _TRAITLETS_CONTAINER_TYPES
-}
+# Populated lazily by _default_value_sentinel.  Signature introspection is
+# comparatively slow, so we only pay for it for container types that are
+# actually used, and only once per type.
+_DEFAULT_VALUE_SENTINELS = {}
+
+
+def _default_value_sentinel(t):
+    try:
+        return _DEFAULT_VALUE_SENTINELS[t]
+    except KeyError:
+        sentinel = _get_default_value_sentinel(t)
+        _DEFAULT_VALUE_SENTINELS[t] = sentinel
+        return sentinel
 
 
 class _ContainerMixin(object):
@@ -136,7 +435,7 @@ class _ContainerMixin(object):
             # forward by inspecting our method resolution order.
             for type_ in type(self).mro():
                 if type_ in _TRAITLETS_CONTAINER_TYPES:
-                    default_value = _DEFAULT_VALUE_SENTINELS[type_]
+                    default_value = _default_value_sentinel(type_)
                     break
             else:  # pragma: nocover
                 raise tr.TraitError(
@@ -159,20 +458,135 @@ class _ContainerMixin(object):
         return super(_ContainerMixin, self).make_dynamic_default()
 
 
+def _has_custom_to_primitive(trait):
+    """
+    Check whether ``trait`` serializes its values differently from the
+    type-based ``to_primitive``.
+    """
+    if not isinstance(trait, SerializableTrait):
+        return False
+    method = type(trait).to_primitive
+    # Unbound methods on Python 2 are created on every attribute access.
+    return (
+        getattr(method, '__func__', method) is not
+        _SERIALIZABLE_TRAIT_TO_PRIMITIVE
+    )
+
+
+_SERIALIZABLE_TRAIT_TO_PRIMITIVE = getattr(
+    SerializableTrait.to_primitive,
+    '__func__',
+    SerializableTrait.to_primitive,
+)
+
+
+def _element_to_primitive(trait, value):
+    """
+    Apply ``trait.to_primitive`` to ``value`` if ``trait`` is a
+    SerializableTrait.
+    """
+    if isinstance(trait, SerializableTrait):
+        return trait.to_primitive(value)
+    return to_primitive(value)
+
+
+def _sequence_from_string(trait, s):
+    # Elements of comma-separated lists are converted by the element trait.
+    # JSON is assumed to be correctly typed already.
+    if s.lstrip().startswith(('[', '{')):
+        return _split_or_load_json(s)
+    return [_element_from_string(trait, v) for v in _split_or_load_json(s)]
+
+
 class Set(SerializableTrait, _ContainerMixin, tr.Set):
-    pass
+
+    def to_primitive(self, value):
+        trait = getattr(self, '_trait', None)
+        if not _has_custom_to_primitive(trait):
+            return to_primitive(value)
+        return sorted_primitives(
+            [_element_to_primitive(trait, v) for v in value]
+        )
+
+    def from_trusted_primitive(self, value):
+        trait = getattr(self, '_trait', None)
+        return {_trusted_element(trait, v) for v in value}
+
+    def from_string(self, s):
+        return _sequence_from_string(getattr(self, '_trait', None), s)
 
 
 class List(SerializableTrait, _ContainerMixin, tr.List):
-    pass
+
+    def to_primitive(self, value):
+        trait = getattr(self, '_trait', None)
+        if not _has_custom_to_primitive(trait):
+            return to_primitive(value)
+        return [_element_to_primitive(trait, v) for v in value]
+
+    def from_trusted_primitive(self, value):
+        trait = getattr(self, '_trait', None)
+        if trait is None and isinstance(value, list):
+            return value
+        return [_trusted_element(trait, v) for v in value]
+
+    def from_string(self, s):
+        return _sequence_from_string(getattr(self, '_trait', None), s)
 
 
 class Dict(SerializableTrait, _ContainerMixin, tr.Dict):
-    pass
+
+    def _value_traits(self):
+        # traitlets 4 calls these _trait and _traits, traitlets 5 calls them
+        # _value_trait and _per_key_traits.
+        value_trait = getattr(
+            self,
+            '_value_trait',
+            getattr(self, '_trait', None),
+        )
+        per_key_traits = getattr(
+            self,
+            '_per_key_traits',
+            getattr(self, '_traits', None),
+        ) or {}
+        return value_trait, per_key_traits
+
+    def to_primitive(self, value):
+        value_trait, per_key_traits = self._value_traits()
+        if not (_has_custom_to_primitive(value_trait) or
+                any(map(_has_custom_to_primitive, per_key_traits.values()))):
+            return to_primitive(value)
+        return {
+            to_primitive(k): _element_to_primitive(
+                per_key_traits.get(k, value_trait),
+                v,
+            )
+            for k, v in iteritems(value)
+        }
+
+    def from_trusted_primitive(self, value):
+        value_trait, per_key_traits = self._value_traits()
+        if value_trait is None and not per_key_traits:
+            return value
+        return {
+            k: _trusted_element(per_key_traits.get(k, value_trait), v)
+            for k, v in iteritems(value)
+        }
+
+    def from_string(self, s):
+        import json
+        return json.loads(s)
 
 
 class Tuple(SerializableTrait, _ContainerMixin, tr.Tuple):
-    pass
+
+    def from_trusted_primitive(self, value):
+        # _ContainerMixin doesn't accept per-element traits, so elements are
+        # stored as they are.
+        return tuple(value)
+
+    def from_string(self, s):
+        return _split_or_load_json(s)
 
 
 class Enum(SerializableTrait, tr.Enum):
@@ -185,6 +599,12 @@ class Enum(SerializableTrait, tr.Enum):
                     "Can't convert Enum value %s to a primitive." % value
                 )
 
+    def from_string(self, s):
+        for value in self.values:
+            if unicode(value) == s:
+                return value
+        return s
+
 
 class Instance(SerializableTrait, tr.Instance):
 
@@ -199,9 +619,9 @@ class Instance(SerializableTrait, tr.Instance):
             )
 
     def validate(self, obj, value):
-        from .serializable import Serializable
+        from .serializable import Serializable, _memoized_from_dict
         if issubclass(self.klass, Serializable) and isinstance(value, dict):
-            value = self.klass.from_dict(value)
+            value = _memoized_from_dict(self.klass, value)
         return super(Instance, self).validate(obj, value)
 
     @property
@@ -216,5 +636,15 @@ class Instance(SerializableTrait, tr.Instance):
             return self.klass.example_instance()
         return inst
 
+    def from_trusted_primitive(self, value):
+        from .serializable import Serializable
+        if issubclass(self.klass, Serializable) and isinstance(value, dict):
+            return self.klass._from_trusted_dict(value)
+        return value
+
+    def from_string(self, s):
+        import json
+        return json.loads(s)
+
     # Override the base class.
     make_dynamic_default = None